@@ -10,8 +10,16 @@ from alembic import context
 from app.core.config import settings
 from app.db.base import Base
 from app.models.agreement import Agreement  # noqa: F401 - import for metadata
+from app.models.calculation import CalcBatchCheckpoint, CalcJob, CalcResult, CalcRun  # noqa: F401 - import for metadata
+from app.models.reference import (  # noqa: F401 - import for metadata
+    RefAgreementType,
+    RefScale,
+    RefScaleTier,
+    RefSupplier,
+)
+from app.models.table_version import TableVersion  # noqa: F401 - import for metadata
+from app.models.turnover import TurnoverDaily, TurnoverFact, TurnoverMonthly  # noqa: F401 - import for metadata
 from app.models.user import User  # noqa: F401 - import for metadata
-from app.models.reference import RefSupplier, RefAgreementType  # noqa: F401 - import for metadata
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,30 @@
+"""add calc_batch_checkpoints table for resumable batch runs
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "calc_batch_checkpoints",
+        sa.Column("run_key", sa.String(64), primary_key=True),
+        sa.Column("last_agreement_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("processed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("calc_batch_checkpoints")
@@ -0,0 +1,62 @@
+"""add turnover facts with daily and monthly rollups
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    turnover_kind_enum = postgresql.ENUM("SALES", "PURCHASES", name="turnover_kind_enum")
+    turnover_kind_enum.create(op.get_bind(), checkfirst=True)
+    kind = postgresql.ENUM(name="turnover_kind_enum", create_type=False)
+
+    # Raw lines; supplier_code is validated on ingest, no FK to keep bulk loads cheap
+    op.create_table(
+        "turnover_facts",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), primary_key=True),
+        sa.Column("supplier_code", sa.String(20), nullable=False),
+        sa.Column("doc_date", sa.Date(), nullable=False),
+        sa.Column("kind", kind, nullable=False),
+        sa.Column("amount", sa.Numeric(18, 2), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")),
+    )
+    op.create_index(
+        "ix_turnover_facts_supplier_kind_date", "turnover_facts", ["supplier_code", "kind", "doc_date"]
+    )
+
+    # Rollups maintained incrementally on ingest
+    op.create_table(
+        "turnover_daily",
+        sa.Column("supplier_code", sa.String(20), primary_key=True),
+        sa.Column("kind", kind, primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("amount", sa.Numeric(18, 2), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")),
+    )
+    op.create_table(
+        "turnover_monthly",
+        sa.Column("supplier_code", sa.String(20), primary_key=True),
+        sa.Column("kind", kind, primary_key=True),
+        sa.Column("month", sa.Date(), primary_key=True),
+        sa.Column("amount", sa.Numeric(18, 2), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("turnover_monthly")
+    op.drop_table("turnover_daily")
+    op.drop_index("ix_turnover_facts_supplier_kind_date", table_name="turnover_facts")
+    op.drop_table("turnover_facts")
+    sa.Enum(name="turnover_kind_enum").drop(op.get_bind(), checkfirst=True)
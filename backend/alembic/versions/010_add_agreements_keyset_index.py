@@ -0,0 +1,28 @@
+"""extend created_at index with id for keyset pagination
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (created_at, id) row comparison needs both columns in the index to be an index condition
+    op.create_index(
+        "ix_agreements_created_at_id", "agreements", [sa.text("created_at DESC"), sa.text("id DESC")]
+    )
+    op.drop_index("ix_agreements_created_at", table_name="agreements")
+
+
+def downgrade() -> None:
+    op.create_index("ix_agreements_created_at", "agreements", [sa.text("created_at DESC")])
+    op.drop_index("ix_agreements_created_at_id", table_name="agreements")
@@ -0,0 +1,56 @@
+"""add table_versions counters maintained by trigger on reference tables
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ("ref_suppliers", "ref_agreement_types", "ref_scales")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "table_versions",
+        sa.Column("table_name", sa.String(63), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")),
+    )
+
+    # One bump per statement, however many rows it touches
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_table_version()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO table_versions (table_name, version, updated_at)
+            VALUES (TG_TABLE_NAME, 1, CURRENT_TIMESTAMP)
+            ON CONFLICT (table_name) DO UPDATE
+            SET version = table_versions.version + 1, updated_at = CURRENT_TIMESTAMP;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    for table in VERSIONED_TABLES:
+        op.execute(f"INSERT INTO table_versions (table_name, version) VALUES ('{table}', 1)")
+        op.execute(f"""
+            CREATE TRIGGER trigger_{table}_version
+                AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+                FOR EACH STATEMENT
+                EXECUTE FUNCTION bump_table_version();
+        """)
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trigger_{table}_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_table_version()")
+    op.drop_table("table_versions")
@@ -0,0 +1,76 @@
+"""add calc_runs and calc_results for persisted, incremental runs
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    calc_run_status_enum = postgresql.ENUM(
+        "PENDING", "RUNNING", "COMPLETED", "FAILED", name="calc_run_status_enum"
+    )
+    calc_run_status_enum.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        "calc_runs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("run_key", sa.String(64), nullable=False),
+        sa.Column("period_from", sa.Date(), nullable=False),
+        sa.Column("period_to", sa.Date(), nullable=False),
+        sa.Column("filter", postgresql.JSONB(), nullable=False),
+        sa.Column("incremental", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("base_run_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("calc_runs.id"), nullable=True),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="calc_run_status_enum", create_type=False),
+            nullable=False,
+            server_default="PENDING",
+        ),
+        sa.Column("calculated", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("copied", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("skipped", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")),
+    )
+    op.create_index("ix_calc_runs_run_key_status", "calc_runs", ["run_key", "status", "completed_at"])
+
+    op.create_table(
+        "calc_results",
+        sa.Column(
+            "calc_run_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("calc_runs.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("agreement_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("agreements.id"), primary_key=True),
+        sa.Column("base_amount", sa.Numeric(18, 2), nullable=True),
+        sa.Column("bonus_amount", sa.Numeric(18, 2), nullable=False),
+        sa.Column("agreement_updated_at", sa.DateTime(), nullable=False),
+        sa.Column("scale_code", sa.String(10), nullable=False),
+        sa.Column("condition_value", sa.Numeric(15, 2), nullable=False),
+        sa.Column("input_version", sa.String(64), nullable=False),
+        sa.Column("fingerprint", sa.String(64), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")),
+    )
+    op.create_index("ix_calc_results_agreement_id", "calc_results", ["agreement_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_calc_results_agreement_id", table_name="calc_results")
+    op.drop_table("calc_results")
+    op.drop_index("ix_calc_runs_run_key_status", table_name="calc_runs")
+    op.drop_table("calc_runs")
+    sa.Enum(name="calc_run_status_enum").drop(op.get_bind(), checkfirst=True)
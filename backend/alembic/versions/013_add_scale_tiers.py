@@ -0,0 +1,69 @@
+"""add bracketed (tiered) percentage scales
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE TYPE tier_mode_enum AS ENUM ('MARGINAL', 'WHOLE')")
+    op.execute("ALTER TABLE ref_scales ADD COLUMN tier_mode tier_mode_enum")
+
+    op.execute("""
+        CREATE TABLE ref_scale_tiers (
+            scale_code VARCHAR(10) NOT NULL REFERENCES ref_scales(code) ON DELETE CASCADE,
+            threshold NUMERIC(18, 2) NOT NULL CHECK (threshold >= 0),
+            rate NUMERIC(9, 4) NOT NULL CHECK (rate >= 0),
+            PRIMARY KEY (scale_code, threshold)
+        )
+    """)
+
+    # Compiled bracket arrays are cached per process and invalidated through this counter
+    op.execute("INSERT INTO table_versions (table_name, version) VALUES ('ref_scale_tiers', 1)")
+    op.execute("""
+        CREATE TRIGGER trigger_ref_scale_tiers_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON ref_scale_tiers
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION bump_table_version();
+    """)
+
+    # Retro-bonus scales: the rate of the bracket reached applies to the whole turnover.
+    # Seeded with the standard brackets; contract-specific ones are maintained in ref_scale_tiers.
+    op.execute("""
+        INSERT INTO ref_scales (code, name, grid, tier_mode) VALUES
+        ('04', '% от продаж, ступенчатая', 'PERCENT', 'WHOLE'),
+        ('05', '% от закупок, ступенчатая', 'PERCENT', 'WHOLE')
+    """)
+    op.execute("""
+        INSERT INTO ref_scale_tiers (scale_code, threshold, rate) VALUES
+        ('04', 0, 1), ('04', 1000000, 2), ('04', 5000000, 3),
+        ('05', 0, 1), ('05', 1000000, 2), ('05', 5000000, 3)
+    """)
+
+
+def downgrade() -> None:
+    # agreements.scale_code references ref_scales without cascade; never drop agreements' scales
+    in_use = op.get_bind().execute(
+        sa.text("SELECT count(*) FROM agreements WHERE scale_code IN ('04', '05')")
+    ).scalar_one()
+    if in_use:
+        raise RuntimeError(
+            f"Cannot downgrade: {in_use} agreements use bracketed scales 04/05. "
+            "Move them to another scale (UPDATE agreements SET scale_code = ...) first."
+        )
+    op.execute("DELETE FROM ref_scales WHERE code IN ('04', '05')")
+    op.execute("DROP TRIGGER IF EXISTS trigger_ref_scale_tiers_version ON ref_scale_tiers")
+    op.execute("DELETE FROM table_versions WHERE table_name = 'ref_scale_tiers'")
+    op.drop_table("ref_scale_tiers")
+    op.drop_column("ref_scales", "tier_mode")
+    sa.Enum(name="tier_mode_enum").drop(op.get_bind(), checkfirst=True)
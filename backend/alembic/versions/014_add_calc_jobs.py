@@ -0,0 +1,65 @@
+"""add calc_jobs queue for chunked calculation runs
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "014"
+down_revision: Union[str, None] = "013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("calc_runs", sa.Column("total", sa.Integer(), nullable=False, server_default="0"))
+
+    calc_job_status_enum = postgresql.ENUM("PENDING", "RUNNING", "DONE", "FAILED", name="calc_job_status_enum")
+    calc_job_status_enum.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        "calc_jobs",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), primary_key=True),
+        sa.Column(
+            "calc_run_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("calc_runs.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("after_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("until_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("agreements", sa.Integer(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="calc_job_status_enum", create_type=False),
+            nullable=False,
+            server_default="PENDING",
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("locked_by", sa.String(255), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_calc_jobs_run_status", "calc_jobs", ["calc_run_id", "status"])
+    # Claim scans only touch unfinished jobs
+    op.create_index(
+        "ix_calc_jobs_claimable",
+        "calc_jobs",
+        ["id"],
+        postgresql_where=sa.text("status IN ('PENDING', 'RUNNING')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_calc_jobs_claimable", table_name="calc_jobs")
+    op.drop_index("ix_calc_jobs_run_status", table_name="calc_jobs")
+    op.drop_table("calc_jobs")
+    sa.Enum(name="calc_job_status_enum").drop(op.get_bind(), checkfirst=True)
+    op.drop_column("calc_runs", "total")
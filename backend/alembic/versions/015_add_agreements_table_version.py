@@ -0,0 +1,49 @@
+"""sharded version counter on agreements for ETag validators
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Concurrent writers bump different rows, so they rarely wait on each other's counter lock
+AGREEMENTS_VERSION_SHARDS = 16
+
+
+def upgrade() -> None:
+    # One bump per statement on the shard picked by the backend pid; readers sum the shards
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_sharded_table_version()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO table_versions (table_name, version, updated_at)
+            VALUES (TG_TABLE_NAME || '#' || (pg_backend_pid() % TG_ARGV[0]::int), 1, CURRENT_TIMESTAMP)
+            ON CONFLICT (table_name) DO UPDATE
+            SET version = table_versions.version + 1, updated_at = CURRENT_TIMESTAMP;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute(f"""
+        INSERT INTO table_versions (table_name, version)
+        SELECT 'agreements#' || n, 1 FROM generate_series(0, {AGREEMENTS_VERSION_SHARDS - 1}) AS n
+    """)
+    op.execute(f"""
+        CREATE TRIGGER trigger_agreements_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON agreements
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION bump_sharded_table_version('{AGREEMENTS_VERSION_SHARDS}');
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trigger_agreements_version ON agreements")
+    op.execute("DROP FUNCTION IF EXISTS bump_sharded_table_version()")
+    op.execute("DELETE FROM table_versions WHERE table_name LIKE 'agreements#%'")
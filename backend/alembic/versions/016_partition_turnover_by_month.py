@@ -0,0 +1,169 @@
+"""partition turnover_facts and turnover_daily by month
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "016"
+down_revision: Union[str, None] = "015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months created ahead of the current one; `python -m app.db.partitions` keeps extending this
+AHEAD_MONTHS = 3
+
+
+def upgrade() -> None:
+    # Creates the missing monthly partitions of both tables for the given dates' months.
+    # Partitions are created standalone and attached, which locks the parent only in SHARE UPDATE
+    # EXCLUSIVE mode: reads and inserts on other months continue. The advisory lock is taken
+    # only when something is missing, so the usual call (all present) is a catalog lookup.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION ensure_turnover_partitions(dates date[])
+        RETURNS integer AS $$
+        DECLARE
+            months date[];
+            m date;
+            parent text;
+            part text;
+            created integer := 0;
+        BEGIN
+            SELECT array_agg(DISTINCT mm ORDER BY mm) INTO months
+            FROM (SELECT CAST(date_trunc('month', d) AS date) AS mm FROM unnest(dates) AS d WHERE d IS NOT NULL) s
+            WHERE to_regclass(format('%I', 'turnover_facts_' || to_char(mm, 'YYYY_MM'))) IS NULL
+               OR to_regclass(format('%I', 'turnover_daily_' || to_char(mm, 'YYYY_MM'))) IS NULL;
+            IF months IS NULL THEN
+                RETURN 0;
+            END IF;
+
+            PERFORM pg_advisory_xact_lock(hashtext('ensure_turnover_partitions'));
+            FOREACH m IN ARRAY months LOOP
+                FOREACH parent IN ARRAY ARRAY['turnover_facts', 'turnover_daily'] LOOP
+                    part := parent || '_' || to_char(m, 'YYYY_MM');
+                    -- Re-checked under the lock: a concurrent caller may have created it meanwhile
+                    IF to_regclass(format('%I', part)) IS NULL THEN
+                        EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS)', part, parent);
+                        EXECUTE format(
+                            'ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                            parent, part, m, CAST(m + interval '1 month' AS date)
+                        );
+                        created := created + 1;
+                    END IF;
+                END LOOP;
+            END LOOP;
+            RETURN created;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("ALTER TABLE turnover_facts RENAME TO turnover_facts_unpartitioned")
+    op.execute("ALTER INDEX turnover_facts_pkey RENAME TO turnover_facts_unpartitioned_pkey")
+    op.execute("ALTER SEQUENCE turnover_facts_id_seq RENAME TO turnover_facts_unpartitioned_id_seq")
+    op.execute("DROP INDEX ix_turnover_facts_supplier_kind_date")
+    op.execute("ALTER TABLE turnover_daily RENAME TO turnover_daily_unpartitioned")
+    op.execute("ALTER INDEX turnover_daily_pkey RENAME TO turnover_daily_unpartitioned_pkey")
+
+    # The partition key must be part of the primary key
+    op.execute("""
+        CREATE TABLE turnover_facts (
+            id BIGINT GENERATED BY DEFAULT AS IDENTITY,
+            supplier_code VARCHAR(20) NOT NULL,
+            doc_date DATE NOT NULL,
+            kind turnover_kind_enum NOT NULL,
+            amount NUMERIC(18, 2) NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (id, doc_date)
+        ) PARTITION BY RANGE (doc_date)
+    """)
+    op.execute("""
+        CREATE TABLE turnover_daily (
+            supplier_code VARCHAR(20) NOT NULL,
+            kind turnover_kind_enum NOT NULL,
+            day DATE NOT NULL,
+            amount NUMERIC(18, 2) NOT NULL,
+            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (supplier_code, kind, day)
+        ) PARTITION BY RANGE (day)
+    """)
+
+    op.execute(f"""
+        SELECT ensure_turnover_partitions(ARRAY(
+            SELECT doc_date FROM turnover_facts_unpartitioned
+            UNION SELECT day FROM turnover_daily_unpartitioned
+            UNION SELECT CAST(generate_series(
+                date_trunc('month', CURRENT_DATE),
+                date_trunc('month', CURRENT_DATE) + interval '{AHEAD_MONTHS} months',
+                interval '1 month'
+            ) AS date)
+        ))
+    """)
+
+    op.execute("""
+        INSERT INTO turnover_facts (id, supplier_code, doc_date, kind, amount, created_at)
+        SELECT id, supplier_code, doc_date, kind, amount, created_at FROM turnover_facts_unpartitioned
+    """)
+    op.execute("""
+        SELECT setval(pg_get_serial_sequence('turnover_facts', 'id'), COALESCE(MAX(id), 0) + 1, false)
+        FROM turnover_facts
+    """)
+    op.execute("""
+        INSERT INTO turnover_daily (supplier_code, kind, day, amount, updated_at)
+        SELECT supplier_code, kind, day, amount, updated_at FROM turnover_daily_unpartitioned
+    """)
+    op.execute("DROP TABLE turnover_facts_unpartitioned")
+    op.execute("DROP TABLE turnover_daily_unpartitioned")
+
+    # Facts are loaded roughly in document order and only ever scanned by date range
+    op.execute("CREATE INDEX ix_turnover_facts_doc_date_brin ON turnover_facts USING brin (doc_date)")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE turnover_facts RENAME TO turnover_facts_partitioned")
+    op.execute("ALTER INDEX turnover_facts_pkey RENAME TO turnover_facts_partitioned_pkey")
+    op.execute("ALTER SEQUENCE turnover_facts_id_seq RENAME TO turnover_facts_partitioned_id_seq")
+    op.execute("ALTER TABLE turnover_daily RENAME TO turnover_daily_partitioned")
+    op.execute("ALTER INDEX turnover_daily_pkey RENAME TO turnover_daily_partitioned_pkey")
+
+    op.execute("""
+        CREATE TABLE turnover_facts (
+            id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            supplier_code VARCHAR(20) NOT NULL,
+            doc_date DATE NOT NULL,
+            kind turnover_kind_enum NOT NULL,
+            amount NUMERIC(18, 2) NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    op.execute("""
+        INSERT INTO turnover_facts (id, supplier_code, doc_date, kind, amount, created_at)
+        SELECT id, supplier_code, doc_date, kind, amount, created_at FROM turnover_facts_partitioned
+    """)
+    op.execute("""
+        SELECT setval(pg_get_serial_sequence('turnover_facts', 'id'), COALESCE(MAX(id), 0) + 1, false)
+        FROM turnover_facts
+    """)
+    op.create_index("ix_turnover_facts_supplier_kind_date", "turnover_facts", ["supplier_code", "kind", "doc_date"])
+
+    op.execute("""
+        CREATE TABLE turnover_daily (
+            supplier_code VARCHAR(20) NOT NULL,
+            kind turnover_kind_enum NOT NULL,
+            day DATE NOT NULL,
+            amount NUMERIC(18, 2) NOT NULL,
+            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (supplier_code, kind, day)
+        )
+    """)
+    op.execute("""
+        INSERT INTO turnover_daily (supplier_code, kind, day, amount, updated_at)
+        SELECT supplier_code, kind, day, amount, updated_at FROM turnover_daily_partitioned
+    """)
+
+    # Dropping the parents drops their attached partitions; detached archives are left alone
+    op.execute("DROP TABLE turnover_facts_partitioned")
+    op.execute("DROP TABLE turnover_daily_partitioned")
+    op.execute("DROP FUNCTION IF EXISTS ensure_turnover_partitions(date[])")
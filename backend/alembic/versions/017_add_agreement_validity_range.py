@@ -0,0 +1,31 @@
+"""generated validity daterange on agreements with a GiST index
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "017"
+down_revision: Union[str, None] = "016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # GiST operator classes for plain scalars, so supplier_code can lead the range index
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    # Adding a stored generated column rewrites the table once
+    op.execute("""
+        ALTER TABLE agreements
+        ADD COLUMN validity daterange
+        GENERATED ALWAYS AS (daterange(valid_from, valid_to, '[]')) STORED
+    """)
+    op.execute("CREATE INDEX ix_agreements_supplier_validity ON agreements USING gist (supplier_code, validity)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_agreements_supplier_validity")
+    op.execute("ALTER TABLE agreements DROP COLUMN validity")
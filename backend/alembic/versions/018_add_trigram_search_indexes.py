@@ -0,0 +1,28 @@
+"""trigram indexes for agreement search
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "018"
+down_revision: Union[str, None] = "017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Serve LIKE/ILIKE '%fragment%' and the <% word-similarity operator
+    op.execute("CREATE INDEX ix_agreements_code_trgm ON agreements USING gin (code gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_ref_suppliers_name_trgm ON ref_suppliers USING gin (name gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_ref_agreement_types_name_trgm ON ref_agreement_types USING gin (name gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_ref_agreement_types_name_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_ref_suppliers_name_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_agreements_code_trgm")
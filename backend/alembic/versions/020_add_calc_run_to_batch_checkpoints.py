@@ -0,0 +1,34 @@
+"""point calc_batch_checkpoints at the queued run they drive
+
+Revision ID: 020
+Revises: 019
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "020"
+down_revision: Union[str, None] = "019"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Resume points now name a calc_runs row; keyset positions of the old in-process loop are void
+    op.execute("DELETE FROM calc_batch_checkpoints")
+    op.add_column(
+        "calc_batch_checkpoints",
+        sa.Column(
+            "calc_run_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("calc_runs.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("calc_batch_checkpoints", "calc_run_id")
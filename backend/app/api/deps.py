@@ -1,26 +1,67 @@
-from typing import AsyncGenerator
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+import app.calculation.strategies  # noqa: F401 - registers the built-in strategies
+from app.calculation.engine import CalculationEngine
 from app.core.config import settings
+from app.core.principal_cache import principal_cache
+from app.db.replicas import is_unavailable_error, replica_router
 from app.db.session import AsyncSessionLocal
 from app.models.user import User
 from app.repositories.agreement_repo import AgreementRepository
+from app.repositories.calc_job_repo import CalcJobRepository
+from app.repositories.calculation_repo import CalculationRepository
 from app.repositories.reference_repo import ReferenceRepository
+from app.repositories.turnover_repo import TurnoverRepository
 from app.repositories.user_repo import UserRepository
 from app.services.agreement_service import AgreementService
 from app.services.auth_service import AuthService
+from app.services.calculation_service import CalculationService
 from app.services.reference_service import ReferenceService
+from app.services.turnover_service import TurnoverService
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _client_key(request: Request) -> str:
+    """Identifies a client for read-your-writes pinning: its bearer token, else its address."""
+    return request.headers.get("authorization") or (request.client.host if request.client else "")
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Primary session for writes; read-only methods get a replica session when replicas are configured."""
+    client_key = _client_key(request)
+    if request.method in READ_ONLY_METHODS:
+        replica = replica_router.pick(client_key)
+        if replica is not None:
+            async with replica.sessionmaker() as session:
+                try:
+                    yield session
+                except Exception as e:
+                    if is_unavailable_error(e):
+                        replica_router.eject(replica, e)
+                    raise
+            return
+
     async with AsyncSessionLocal() as session:
         yield session
+    if request.method not in READ_ONLY_METHODS:
+        replica_router.pin(client_key)
+
+
+def read_session_factory(request: Request) -> async_sessionmaker[AsyncSession]:
+    """Session factory for read-only work outside request dependencies (streamed bodies)."""
+    replica = replica_router.pick(_client_key(request))
+    return replica.sessionmaker if replica is not None else AsyncSessionLocal
 
 
 async def get_current_user(
@@ -35,17 +76,26 @@ async def get_current_user(
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         username: str | None = payload.get("sub")
-        if username is None:
+        expires: int | None = payload.get("exp")
+        if username is None or expires is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
 
+    cached = principal_cache.get(username, expires)
+    if cached is not None:
+        return cached
+
+    started = time.perf_counter()
     user_repo = UserRepository(db)
     user = await user_repo.get_by_username(username)
 
     if user is None or not user.is_active:
         raise credentials_exception
 
+    # Detached so the instance can be shared by later requests
+    db.expunge(user)
+    principal_cache.put(username, expires, user, time.perf_counter() - started)
     return user
 
 
@@ -56,9 +106,36 @@ def get_agreement_service(db: AsyncSession = Depends(get_db)) -> AgreementServic
     )
 
 
+@asynccontextmanager
+async def standalone_agreement_service(
+    session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+) -> AsyncIterator[AgreementService]:
+    """Service with its own session, for response bodies streamed after request dependencies have exited."""
+    async with session_factory() as session:
+        yield AgreementService(
+            agreement_repo=AgreementRepository(session),
+            reference_repo=ReferenceRepository(session),
+        )
+
+
 def get_auth_service(db: AsyncSession = Depends(get_db)) -> AuthService:
     return AuthService(user_repo=UserRepository(db))
 
 
 def get_reference_service(db: AsyncSession = Depends(get_db)) -> ReferenceService:
     return ReferenceService(reference_repo=ReferenceRepository(db))
+
+
+def get_turnover_service(db: AsyncSession = Depends(get_db)) -> TurnoverService:
+    return TurnoverService(
+        turnover_repo=TurnoverRepository(db),
+        reference_repo=ReferenceRepository(db),
+    )
+
+
+def get_calculation_service(db: AsyncSession = Depends(get_db)) -> CalculationService:
+    return CalculationService(
+        engine=CalculationEngine(db),
+        calculation_repo=CalculationRepository(db),
+        calc_job_repo=CalcJobRepository(db),
+    )
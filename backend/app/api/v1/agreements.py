@@ -1,37 +1,156 @@
 import uuid
+from datetime import date
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
-from app.api.deps import get_current_user, get_agreement_service
+from app.api.deps import get_current_user, get_agreement_service, read_session_factory, standalone_agreement_service
+from app.core.config import settings
+from app.core.etag import etag_headers, etag_matches
+from app.core.streams import aiter_lines
+from app.domain.enums import AgreementStatus, FileFormat
+from app.domain.exceptions import ValidationError
 from app.models.user import User
 from app.schemas.agreement import (
+    AgreementBulkResult,
+    AgreementBulkStatusResult,
+    AgreementBulkStatusUpdate,
     AgreementCreate,
+    AgreementFilter,
     AgreementUpdate,
     AgreementStatusUpdate,
     AgreementResponse,
+    agreement_rows_adapter,
 )
 from app.services.agreement_service import AgreementService
 
 router = APIRouter()
 
 
+def agreement_filter(
+    status: list[AgreementStatus] | None = Query(None),
+    supplier_code: list[str] | None = Query(None),
+    agreement_type_code: list[str] | None = Query(None),
+    scale_code: list[str] | None = Query(None),
+    valid_from: date | None = Query(None, description="Only agreements starting on or after this date"),
+    valid_to: date | None = Query(None, description="Only agreements ending on or before this date"),
+    active_from: date | None = Query(None, description="Only agreements valid on some day from this date"),
+    active_to: date | None = Query(None, description="Only agreements valid on some day up to this date"),
+) -> AgreementFilter:
+    if active_from is not None and active_to is not None and active_to < active_from:
+        raise ValidationError("active_to must be >= active_from")
+    return AgreementFilter(
+        status=status,
+        supplier_code=supplier_code,
+        agreement_type_code=agreement_type_code,
+        scale_code=scale_code,
+        valid_from=valid_from,
+        valid_to=valid_to,
+        active_from=active_from,
+        active_to=active_to,
+    )
+
+
 @router.post("/agreements", response_model=AgreementResponse, status_code=201)
 async def create_agreement(
     data: AgreementCreate,
+    check_overlap: bool = Query(False, description="Reject (409) when a live agreement with the same "
+                                "supplier, type and scale overlaps the validity period"),
     service: AgreementService = Depends(get_agreement_service),
     current_user: User = Depends(get_current_user),
 ) -> AgreementResponse:
-    agreement = await service.create(data)
+    agreement = await service.create(data, check_overlap)
     return AgreementResponse.model_validate(agreement)
 
 
+@router.post("/agreements/bulk", response_model=AgreementBulkResult)
+async def bulk_create_agreements(
+    rows: list[dict] = Body(...),
+    atomic: bool = False,
+    service: AgreementService = Depends(get_agreement_service),
+    current_user: User = Depends(get_current_user),
+) -> AgreementBulkResult:
+    """Create many agreements from a JSON array; errors are reported per array position (1-based)."""
+    return await service.bulk_create(list(enumerate(rows, start=1)), atomic)
+
+
+@router.post("/agreements/bulk/csv", response_model=AgreementBulkResult)
+async def bulk_create_agreements_csv(
+    request: Request,
+    atomic: bool = False,
+    service: AgreementService = Depends(get_agreement_service),
+    current_user: User = Depends(get_current_user),
+) -> AgreementBulkResult:
+    """Create many agreements from a CSV body with a header row; errors are reported per line."""
+    return await service.bulk_create_csv(aiter_lines(request.stream()), atomic)
+
+
+@router.post("/agreements/bulk/status", response_model=AgreementBulkStatusResult)
+async def bulk_update_agreement_status(
+    data: AgreementBulkStatusUpdate,
+    service: AgreementService = Depends(get_agreement_service),
+    current_user: User = Depends(get_current_user),
+) -> AgreementBulkStatusResult:
+    """Move the agreements in `ids` or matching `filter` to `status` where the transition is allowed."""
+    return await service.bulk_update_status(data)
+
+
 @router.get("/agreements", response_model=list[AgreementResponse])
 async def get_agreements(
+    request: Request,
+    filters: AgreementFilter = Depends(agreement_filter),
+    cursor: str | None = None,
+    limit: int = Query(settings.AGREEMENTS_PAGE_SIZE_DEFAULT, ge=1, le=settings.AGREEMENTS_PAGE_SIZE_MAX),
+    include_total: bool = False,
+    service: AgreementService = Depends(get_agreement_service),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """One keyset page, newest first. Pass `X-Next-Cursor` back as `cursor` for the next page."""
+    etag = await service.get_page_etag(request.query_params.multi_items())
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=etag_headers(etag))
+    page = await service.get_page(filters, cursor, limit, include_total)
+    headers = etag_headers(etag)
+    if page.next_cursor is not None:
+        headers["X-Next-Cursor"] = page.next_cursor
+    if page.total is not None:
+        headers["X-Total-Count"] = str(page.total)
+    return Response(agreement_rows_adapter.dump_json(page.items), media_type="application/json", headers=headers)
+
+
+@router.get("/agreements/export")
+async def export_agreements(
+    request: Request,
+    format: FileFormat = FileFormat.CSV,
+    filters: AgreementFilter = Depends(agreement_filter),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream all agreements matching the list filters as CSV or NDJSON."""
+    session_factory = read_session_factory(request)
+
+    async def body():
+        async with standalone_agreement_service(session_factory) as service:
+            async for chunk in service.iter_export(filters, format):
+                yield chunk
+
+    media_type = "text/csv; charset=utf-8" if format == FileFormat.CSV else "application/x-ndjson"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="agreements.{format.value}"'},
+    )
+
+
+@router.get("/agreements/search", response_model=list[AgreementResponse])
+async def search_agreements(
+    q: str = Query(..., min_length=3, max_length=100, description="Fragment of the code, supplier name or type name"),
+    limit: int = Query(settings.AGREEMENTS_SEARCH_LIMIT_DEFAULT, ge=1, le=settings.AGREEMENTS_SEARCH_LIMIT_MAX),
     service: AgreementService = Depends(get_agreement_service),
     current_user: User = Depends(get_current_user),
-) -> list[AgreementResponse]:
-    agreements = await service.get_all()
-    return [AgreementResponse.model_validate(a) for a in agreements]
+) -> Response:
+    """Best matches first, by trigram similarity; typos in names are tolerated."""
+    rows = await service.search(q, limit)
+    return Response(agreement_rows_adapter.dump_json(rows), media_type="application/json")
 
 
 @router.get("/agreements/{agreement_id}", response_model=AgreementResponse)
@@ -48,11 +167,12 @@ async def get_agreement(
 async def update_agreement(
     agreement_id: uuid.UUID,
     data: AgreementUpdate,
+    check_overlap: bool = False,
     service: AgreementService = Depends(get_agreement_service),
     current_user: User = Depends(get_current_user),
 ) -> AgreementResponse:
-    agreement = await service.update(agreement_id, data)
-    return AgreementResponse.model_validate(agreement)
+    row = await service.update(agreement_id, data, check_overlap)
+    return AgreementResponse.model_validate(row)
 
 
 @router.patch("/agreements/{agreement_id}/status", response_model=AgreementResponse)
@@ -62,5 +182,5 @@ async def update_agreement_status(
     service: AgreementService = Depends(get_agreement_service),
     current_user: User = Depends(get_current_user),
 ) -> AgreementResponse:
-    agreement = await service.update_status(agreement_id, data.status)
-    return AgreementResponse.model_validate(agreement)
+    row = await service.update_status(agreement_id, data.status, data.version)
+    return AgreementResponse.model_validate(row)
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 
 from app.api.deps import get_current_user, get_auth_service
 from app.models.user import User
-from app.schemas.user import LoginRequest, Token, UserResponse
+from app.schemas.user import LoginRequest, Token, UserActiveUpdate, UserResponse
 from app.services.auth_service import AuthService
 
 router = APIRouter()
@@ -21,3 +21,13 @@ async def get_me(
     current_user: User = Depends(get_current_user),
 ) -> User:
     return current_user
+
+
+@router.patch("/auth/users/{username}/active", response_model=UserResponse)
+async def set_user_active(
+    username: str,
+    data: UserActiveUpdate,
+    service: AuthService = Depends(get_auth_service),
+    current_user: User = Depends(get_current_user),
+) -> User:
+    return await service.set_user_active(current_user, username, data.is_active)
@@ -0,0 +1,38 @@
+import uuid
+
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_calculation_service, get_current_user
+from app.models.user import User
+from app.schemas.calculation import CalcRunCreate, CalcRunProgress, CalcRunResponse
+from app.services.calculation_service import CalculationService
+
+router = APIRouter()
+
+
+@router.post("/calculation/runs", response_model=CalcRunResponse, status_code=202)
+async def start_calculation_run(
+    data: CalcRunCreate,
+    service: CalculationService = Depends(get_calculation_service),
+    current_user: User = Depends(get_current_user),
+) -> CalcRunResponse:
+    """Enqueue a run; workers (`python -m app.calculation.worker`) calculate it chunk by chunk."""
+    return await service.start_run(data)
+
+
+@router.get("/calculation/runs/{run_id}", response_model=CalcRunResponse)
+async def get_calculation_run(
+    run_id: uuid.UUID,
+    service: CalculationService = Depends(get_calculation_service),
+    current_user: User = Depends(get_current_user),
+) -> CalcRunResponse:
+    return await service.get_run(run_id)
+
+
+@router.get("/calculation/runs/{run_id}/progress", response_model=CalcRunProgress)
+async def get_calculation_run_progress(
+    run_id: uuid.UUID,
+    service: CalculationService = Depends(get_calculation_service),
+    current_user: User = Depends(get_current_user),
+) -> CalcRunProgress:
+    return await service.get_progress(run_id)
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 
 from app.api.deps import get_current_user, get_reference_service
+from app.core.config import settings
+from app.core.etag import not_modified
 from app.models.user import User
 from app.schemas.reference import RefSupplierResponse, RefAgreementTypeResponse, RefScaleResponse
 from app.services.reference_service import ReferenceService
@@ -10,23 +12,46 @@ router = APIRouter()
 
 @router.get("/ref/suppliers", response_model=list[RefSupplierResponse])
 async def get_suppliers(
+    request: Request,
+    response: Response,
     service: ReferenceService = Depends(get_reference_service),
     current_user: User = Depends(get_current_user),
-) -> list:
+) -> list | Response:
+    if (unchanged := not_modified(request, response, await service.get_suppliers_etag())) is not None:
+        return unchanged
     return await service.get_all_suppliers()
 
 
+@router.get("/ref/suppliers/search", response_model=list[RefSupplierResponse])
+async def search_suppliers(
+    q: str = Query(..., min_length=1, max_length=100, description="Prefix of the code or of any word of the name"),
+    limit: int = Query(settings.SUPPLIER_SEARCH_LIMIT_DEFAULT, ge=1, le=settings.SUPPLIER_SEARCH_LIMIT_MAX),
+    service: ReferenceService = Depends(get_reference_service),
+    current_user: User = Depends(get_current_user),
+) -> list:
+    """Typeahead served from the per-process reference cache; no query per keystroke."""
+    return await service.search_suppliers(q, limit)
+
+
 @router.get("/ref/agreement-types", response_model=list[RefAgreementTypeResponse])
 async def get_agreement_types(
+    request: Request,
+    response: Response,
     service: ReferenceService = Depends(get_reference_service),
     current_user: User = Depends(get_current_user),
-) -> list:
+) -> list | Response:
+    if (unchanged := not_modified(request, response, await service.get_agreement_types_etag())) is not None:
+        return unchanged
     return await service.get_all_agreement_types()
 
 
 @router.get("/ref/scales", response_model=list[RefScaleResponse])
 async def get_scales(
+    request: Request,
+    response: Response,
     service: ReferenceService = Depends(get_reference_service),
     current_user: User = Depends(get_current_user),
-) -> list:
+) -> list | Response:
+    if (unchanged := not_modified(request, response, await service.get_scales_etag())) is not None:
+        return unchanged
     return await service.get_all_scales()
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, Request
+
+from app.api.deps import get_current_user, get_turnover_service
+from app.core.streams import aiter_lines
+from app.domain.enums import FileFormat
+from app.models.user import User
+from app.schemas.turnover import TurnoverUploadResult
+from app.services.turnover_service import TurnoverService
+
+router = APIRouter()
+
+
+@router.post("/turnover/upload", response_model=TurnoverUploadResult)
+async def upload_turnover(
+    request: Request,
+    format: FileFormat = FileFormat.CSV,
+    service: TurnoverService = Depends(get_turnover_service),
+    current_user: User = Depends(get_current_user),
+) -> TurnoverUploadResult:
+    """Stream CSV (with header) or NDJSON rows: supplier_code, doc_date, kind, amount."""
+    return await service.ingest(aiter_lines(request.stream()), format)
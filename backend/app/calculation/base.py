@@ -1,12 +1,58 @@
 import uuid
 from abc import ABC, abstractmethod
-from datetime import date
-from decimal import Decimal
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import ROUND_HALF_UP, Context, Decimal, localcontext
+from typing import Any, NamedTuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@dataclass(frozen=True, slots=True)
+class AgreementInput:
+    """Calculation-relevant columns of an agreement, loaded without ORM hydration."""
+
+    id: uuid.UUID
+    supplier_code: str
+    agreement_type_code: str
+    scale_code: str
+    condition_value: Decimal
+    valid_from: date
+    valid_to: date
+    updated_at: datetime
+
+
+class BonusAmount(NamedTuple):
+    # Turnover or other base the bonus was derived from, when the strategy has one
+    base_amount: Decimal | None
+    bonus_amount: Decimal
+
+
+# Compact per-agreement input of a compute step: (agreement_id, supplier_code, *values)
+ComputeRow = tuple[Any, ...]
+ComputeResult = tuple[uuid.UUID, Decimal | None, Decimal]
+ComputeFn = Callable[[Sequence[ComputeRow]], list[ComputeResult]]
+
+# Fixed so results do not depend on the calling thread's or process's decimal context
+DECIMAL_CONTEXT = Context(prec=40, rounding=ROUND_HALF_UP)
+
+
+def run_compute(compute: ComputeFn, rows: Sequence[ComputeRow]) -> list[ComputeResult]:
+    """Entry point for compute steps, in process or in a pool worker."""
+    with localcontext(DECIMAL_CONTEXT):
+        return compute(rows)
 
 
 class CalculationStrategy(ABC):
     """Base class for bonus calculation strategies."""
 
+    # Part of every result fingerprint; bump when the formula changes so stored results are recomputed
+    version = "1"
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
     @abstractmethod
     async def calculate(
         self,
@@ -16,3 +62,50 @@ class CalculationStrategy(ABC):
     ) -> Decimal:
         """Calculate bonus amount for the given agreement and period."""
         ...
+
+    async def calculate_batch(
+        self,
+        agreements: Sequence[AgreementInput],
+        period_from: date,
+        period_to: date,
+    ) -> dict[uuid.UUID, BonusAmount]:
+        """Calculate bonus amounts for a group of agreements sharing type and scale.
+
+        Runs `prepare` and `compute` when the strategy has them, otherwise falls back to
+        one `calculate` call per agreement.
+        """
+        rows = await self.prepare(agreements, period_from, period_to)
+        if rows is None:
+            return {a.id: BonusAmount(None, await self.calculate(a.id, period_from, period_to)) for a in agreements}
+        return {i: BonusAmount(base, bonus) for i, base, bonus in run_compute(type(self).compute, rows)}
+
+    async def prepare(
+        self,
+        agreements: Sequence[AgreementInput],
+        period_from: date,
+        period_to: date,
+    ) -> list[ComputeRow] | None:
+        """Load everything `compute` needs for a group as plain tuples.
+
+        Strategies that split loading from arithmetic return one `ComputeRow` per agreement;
+        `None` means the strategy has no separate compute step.
+        """
+        return None
+
+    @staticmethod
+    def compute(rows: Sequence[ComputeRow]) -> list[ComputeResult]:
+        """Pure, picklable arithmetic over `prepare` rows; may run in another process."""
+        raise NotImplementedError
+
+    async def input_versions(
+        self,
+        agreements: Sequence[AgreementInput],
+        period_from: date,
+        period_to: date,
+    ) -> dict[uuid.UUID, str]:
+        """Opaque version of the external data each agreement's result depends on.
+
+        Incremental runs reuse a stored result only while this value is unchanged. The default
+        is for strategies that read nothing beyond the agreement itself.
+        """
+        return {}
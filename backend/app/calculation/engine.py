@@ -1,8 +1,49 @@
+import hashlib
+import logging
 import uuid
-from datetime import date
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
 from decimal import Decimal
+from typing import NamedTuple
 
-from app.calculation.base import CalculationStrategy
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.calculation.base import AgreementInput, BonusAmount, CalculationStrategy
+from app.calculation.executor import ShardedExecutor
+from app.domain.enums import AgreementStatus
+from app.domain.exceptions import NotFoundError, UnsupportedAgreementError, ValidationError
+from app.repositories.calculation_repo import CalculationRepository
+
+logger = logging.getLogger(__name__)
+
+
+class InputFingerprint(NamedTuple):
+    """Inputs a result depends on, and their digest."""
+
+    agreement_updated_at: datetime
+    scale_code: str
+    condition_value: Decimal
+    input_version: str
+    digest: str
+
+
+@dataclass
+class ChunkResult:
+    results: dict[uuid.UUID, BonusAmount]
+    fingerprints: dict[uuid.UUID, InputFingerprint]
+    # Agreements whose fingerprint matches the base run; their stored results stay valid
+    unchanged: list[uuid.UUID] = field(default_factory=list)
+    skipped: int = 0
+
+
+@dataclass(frozen=True)
+class BatchFilter:
+    """Selects the agreements of a batch run; `None` means no restriction."""
+
+    statuses: tuple[AgreementStatus, ...] = (AgreementStatus.READY_FOR_CALCULATION,)
+    supplier_codes: tuple[str, ...] | None = None
+    agreement_type_codes: tuple[str, ...] | None = None
 
 
 class CalculationEngine:
@@ -10,18 +51,140 @@ class CalculationEngine:
 
     _strategies: dict[str, type[CalculationStrategy]] = {}
 
+    def __init__(self, db: AsyncSession, executor: ShardedExecutor | None = None) -> None:
+        self.db = db
+        self.executor = executor
+        self.calculation_repo = CalculationRepository(db)
+        self._instances: dict[str, CalculationStrategy] = {}
+
     @classmethod
     def register(cls, agreement_type_code: str, strategy: type[CalculationStrategy]) -> None:
         cls._strategies[agreement_type_code] = strategy
 
+    def _get_strategy(self, agreement_type_code: str) -> CalculationStrategy | None:
+        strategy_cls = self._strategies.get(agreement_type_code)
+        if strategy_cls is None:
+            return None
+        if agreement_type_code not in self._instances:
+            self._instances[agreement_type_code] = strategy_cls(self.db)
+        return self._instances[agreement_type_code]
+
     async def run(
         self,
         agreement_id: uuid.UUID,
         period_from: date,
         period_to: date,
     ) -> Decimal:
-        # Future implementation:
-        # 1. Load agreement from DB
-        # 2. Look up strategy by agreement_type_code
-        # 3. Delegate to strategy.calculate()
-        raise NotImplementedError("Engine not yet implemented")
+        inputs = await self.calculation_repo.get_inputs_by_ids([agreement_id])
+        if not inputs:
+            raise NotFoundError("Agreement not found")
+
+        strategy = self._get_strategy(inputs[0].agreement_type_code)
+        if strategy is None:
+            raise ValidationError(f"No calculation strategy for agreement type {inputs[0].agreement_type_code}")
+        return await strategy.calculate(agreement_id, period_from, period_to)
+
+    async def calculate_chunk(
+        self,
+        chunk: list[AgreementInput],
+        period_from: date,
+        period_to: date,
+        base_run_id: uuid.UUID | None = None,
+    ) -> ChunkResult:
+        """Calculate one chunk of agreements group by group, reusing `base_run_id` results where unchanged."""
+        groups: dict[tuple[str, str], list[AgreementInput]] = defaultdict(list)
+        for agreement in chunk:
+            groups[(agreement.agreement_type_code, agreement.scale_code)].append(agreement)
+
+        previous: dict[uuid.UUID, str] = {}
+        if base_run_id is not None:
+            previous = await self.calculation_repo.get_result_fingerprints(base_run_id, [a.id for a in chunk])
+
+        outcome = ChunkResult(results={}, fingerprints={})
+        for (agreement_type_code, scale_code), agreements in groups.items():
+            strategy = self._get_strategy(agreement_type_code)
+            if strategy is None:
+                logger.warning(
+                    "No strategy for agreement type %s, skipping %d agreements", agreement_type_code, len(agreements)
+                )
+                continue
+
+            versions = await strategy.input_versions(agreements, period_from, period_to)
+            changed = []
+            for a in agreements:
+                fingerprint = self._fingerprint(strategy, a, period_from, period_to, versions.get(a.id, ""))
+                outcome.fingerprints[a.id] = fingerprint
+                if previous.get(a.id) == fingerprint.digest:
+                    outcome.unchanged.append(a.id)
+                else:
+                    changed.append(a)
+            if not changed:
+                continue
+
+            try:
+                outcome.results.update(await self._calculate_group(strategy, changed, period_from, period_to))
+            except UnsupportedAgreementError as e:
+                logger.warning(
+                    "Strategy %s cannot calculate scale %s (%s), skipping %d agreements",
+                    type(strategy).__name__, scale_code, e.message, len(changed),
+                )
+        outcome.skipped = len(chunk) - len(outcome.results) - len(outcome.unchanged)
+        return outcome
+
+    async def _calculate_group(
+        self,
+        strategy: CalculationStrategy,
+        agreements: list[AgreementInput],
+        period_from: date,
+        period_to: date,
+    ) -> dict[uuid.UUID, BonusAmount]:
+        if self.executor is None:
+            return await strategy.calculate_batch(agreements, period_from, period_to)
+        rows = await strategy.prepare(agreements, period_from, period_to)
+        if rows is None:
+            return await strategy.calculate_batch(agreements, period_from, period_to)
+        computed = await self.executor.compute(type(strategy).compute, rows)
+        return {i: BonusAmount(base, bonus) for i, base, bonus in computed}
+
+    @staticmethod
+    def _fingerprint(
+        strategy: CalculationStrategy,
+        agreement: AgreementInput,
+        period_from: date,
+        period_to: date,
+        input_version: str,
+    ) -> InputFingerprint:
+        parts = [
+            type(strategy).__name__,
+            strategy.version,
+            period_from.isoformat(),
+            period_to.isoformat(),
+            agreement.supplier_code,
+            agreement.scale_code,
+            str(agreement.condition_value),
+            agreement.valid_from.isoformat(),
+            agreement.valid_to.isoformat(),
+            agreement.updated_at.isoformat(),
+            input_version,
+        ]
+        return InputFingerprint(
+            agreement_updated_at=agreement.updated_at,
+            scale_code=agreement.scale_code,
+            condition_value=agreement.condition_value,
+            input_version=input_version,
+            digest=hashlib.sha256("|".join(parts).encode()).hexdigest(),
+        )
+
+    @staticmethod
+    def make_run_key(period_from: date, period_to: date, batch_filter: BatchFilter) -> str:
+        def codes(values: tuple[str, ...] | None) -> str:
+            return ",".join(sorted(values)) if values is not None else "*"
+
+        parts = [
+            period_from.isoformat(),
+            period_to.isoformat(),
+            ",".join(sorted(s.value for s in batch_filter.statuses)),
+            codes(batch_filter.supplier_codes),
+            codes(batch_filter.agreement_type_codes),
+        ]
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()
@@ -0,0 +1,74 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import zlib
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+from app.calculation.base import ComputeFn, ComputeResult, ComputeRow, run_compute
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SHARDS_PER_WORKER = 4
+
+
+def shard_rows(rows: Sequence[ComputeRow], shards: int) -> list[list[ComputeRow]]:
+    """Partition rows by supplier (second tuple item) so a supplier never spans two shards."""
+    parts: list[list[ComputeRow]] = [[] for _ in range(shards)]
+    for row in rows:
+        # crc32 rather than hash(): stable across processes and runs
+        parts[zlib.crc32(row[1].encode()) % shards].append(row)
+    return [p for p in parts if p]
+
+
+class ShardedExecutor:
+    """Runs strategy compute steps over a process pool, one shard of suppliers per task.
+
+    Rows are cut into several shards per worker so that uneven suppliers still keep every
+    worker busy. Groups smaller than `min_rows` are computed in the calling process, where
+    pickling and IPC would cost more than the arithmetic. Workers use the same `run_compute`
+    entry point and decimal context as the serial path, so results are identical.
+    """
+
+    def __init__(self, workers: int | None = None, min_rows: int = 0) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.min_rows = min_rows
+        # spawn: forking a process that runs an event loop and thread pools is not safe
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    async def compute(self, compute: ComputeFn, rows: Sequence[ComputeRow]) -> list[ComputeResult]:
+        if len(rows) < self.min_rows or self.workers == 1:
+            return run_compute(compute, rows)
+
+        loop = asyncio.get_running_loop()
+        parts = await asyncio.gather(*(
+            loop.run_in_executor(self._pool, run_compute, compute, shard)
+            for shard in shard_rows(rows, self.workers * SHARDS_PER_WORKER)
+        ))
+        return [result for part in parts for result in part]
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+_executor: ShardedExecutor | None = None
+
+
+def get_executor() -> ShardedExecutor | None:
+    """Process-wide executor when `CALC_EXECUTOR` is "process", created on first use."""
+    global _executor
+    if settings.CALC_EXECUTOR != "process":
+        return None
+    if _executor is None:
+        _executor = ShardedExecutor(settings.CALC_EXECUTOR_WORKERS, settings.CALC_EXECUTOR_MIN_ROWS)
+        logger.info("Calculation executor started with %d worker processes", _executor.workers)
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+
+@dataclass(frozen=True, slots=True)
+class PeriodSplit:
+    """A date range split into leading days, whole months and trailing days.
+
+    `months` holds the first days of the first and last whole months; any part may be
+    `None`. Whole months are answered from the monthly rollup, the rest from daily rows.
+    """
+
+    head: tuple[date, date] | None
+    months: tuple[date, date] | None
+    tail: tuple[date, date] | None
+
+
+def month_start(d: date) -> date:
+    return d.replace(day=1)
+
+
+def next_month_start(d: date) -> date:
+    return (d.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def split_period(date_from: date, date_to: date) -> PeriodSplit:
+    first_whole = date_from if date_from.day == 1 else next_month_start(date_from)
+    after_last_whole = month_start(date_to + timedelta(days=1))
+
+    if first_whole >= after_last_whole:
+        return PeriodSplit(head=(date_from, date_to), months=None, tail=None)
+
+    head = (date_from, first_whole - timedelta(days=1)) if date_from < first_whole else None
+    tail = (after_last_whole, date_to) if after_last_whole <= date_to else None
+    months = (first_whole, month_start(after_last_whole - timedelta(days=1)))
+    return PeriodSplit(head=head, months=months, tail=tail)
@@ -0,0 +1,5 @@
+from app.calculation.engine import CalculationEngine
+from app.calculation.strategies.percent_turnover import PercentTurnoverStrategy
+
+# Importing this package registers the built-in strategies
+CalculationEngine.register("T001", PercentTurnoverStrategy)
@@ -1,12 +1,43 @@
 import uuid
+from collections.abc import Sequence
 from datetime import date
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
 
-from app.calculation.base import CalculationStrategy
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.calculation.base import AgreementInput, CalculationStrategy, ComputeResult, ComputeRow
+from app.calculation.tiers import CompiledTiers, tier_cache
+from app.domain.constants import SCALE_TURNOVER_KINDS
+from app.domain.exceptions import NotFoundError, UnsupportedAgreementError
+from app.repositories.calculation_repo import CalculationRepository
+from app.repositories.reference_repo import ReferenceRepository
+from app.repositories.turnover_repo import TurnoverRepository, TurnoverRequest
+
+CENT = Decimal("0.01")
 
 
 class PercentTurnoverStrategy(CalculationStrategy):
-    """Calculates bonus as percentage of purchase/sales turnover."""
+    """Calculates bonus as percentage of purchase/sales turnover.
+
+    Flat scales apply `condition_value` percent; bracketed scales (`RefScale.tier_mode`) take
+    the rate from the scale's compiled brackets.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        super().__init__(db)
+        self.turnover_repo = TurnoverRepository(db)
+        self.reference_repo = ReferenceRepository(db)
+
+    async def _get_tiers(self, scale_codes: set[str]) -> dict[str, CompiledTiers | None]:
+        tiers: dict[str, CompiledTiers | None] = {}
+        for code in scale_codes:
+            scale = await self.reference_repo.get_scale_by_code(code)
+            if scale is None:
+                raise UnsupportedAgreementError(f"Unknown scale {code}")
+            tiers[code] = await tier_cache.get(self.reference_repo, scale)
+            if scale.tier_mode is not None and tiers[code] is None:
+                raise UnsupportedAgreementError(f"Scale {code} is bracketed but has no brackets")
+        return tiers
 
     async def calculate(
         self,
@@ -14,4 +45,65 @@ class PercentTurnoverStrategy(CalculationStrategy):
         period_from: date,
         period_to: date,
     ) -> Decimal:
-        raise NotImplementedError("Calculation not yet implemented")
+        inputs = await CalculationRepository(self.db).get_inputs_by_ids([agreement_id])
+        if not inputs:
+            raise NotFoundError("Agreement not found")
+        results = await self.calculate_batch(inputs, period_from, period_to)
+        return results[agreement_id].bonus_amount
+
+    async def prepare(
+        self,
+        agreements: Sequence[AgreementInput],
+        period_from: date,
+        period_to: date,
+    ) -> list[ComputeRow]:
+        requests = []
+        for a in agreements:
+            kind = SCALE_TURNOVER_KINDS.get(a.scale_code)
+            if kind is None:
+                raise UnsupportedAgreementError(f"Scale {a.scale_code} is not turnover-based")
+            # Only the part of the period during which the agreement is valid counts
+            requests.append(TurnoverRequest(
+                a.id, a.supplier_code, kind, max(a.valid_from, period_from), min(a.valid_to, period_to),
+            ))
+
+        tiers = await self._get_tiers({a.scale_code for a in agreements})
+        turnover = await self.turnover_repo.sum_for_requests(requests)
+        return [(a.id, a.supplier_code, turnover[a.id], a.condition_value, tiers[a.scale_code]) for a in agreements]
+
+    @staticmethod
+    def compute(rows: Sequence[ComputeRow]) -> list[ComputeResult]:
+        results = []
+        for agreement_id, _, turnover, condition_value, tiers in rows:
+            bonus = tiers.evaluate(turnover) if tiers is not None else turnover * condition_value / 100
+            results.append((agreement_id, turnover, bonus.quantize(CENT, rounding=ROUND_HALF_UP)))
+        return results
+
+    async def input_versions(
+        self,
+        agreements: Sequence[AgreementInput],
+        period_from: date,
+        period_to: date,
+    ) -> dict[uuid.UUID, str]:
+        keys = {
+            a.id: (a.supplier_code, SCALE_TURNOVER_KINDS[a.scale_code])
+            for a in agreements
+            if a.scale_code in SCALE_TURNOVER_KINDS
+        }
+        watermarks = await self.turnover_repo.get_watermarks(list(set(keys.values())), period_from, period_to)
+        try:
+            tiers = await self._get_tiers({a.scale_code for a in agreements if a.id in keys})
+        except UnsupportedAgreementError:
+            tiers = {}
+
+        versions = {}
+        for a in agreements:
+            if a.id not in keys:
+                continue
+            key = keys[a.id]
+            version = watermarks[key].isoformat() if key in watermarks else "none"
+            scale_tiers = tiers.get(a.scale_code)
+            if scale_tiers is not None:
+                version += f"/tiers:{scale_tiers.version}"
+            versions[a.id] = version
+        return versions
@@ -0,0 +1,93 @@
+import asyncio
+import bisect
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from decimal import Decimal
+
+from app.core.config import settings
+from app.domain.enums import TierMode
+from app.models.reference import RefScale
+from app.repositories.reference_repo import ReferenceRepository
+
+ZERO = Decimal("0")
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledTiers:
+    """Brackets of one scale as sorted arrays, ready for bisect lookups.
+
+    `base[i]` is the marginal bonus accumulated below `thresholds[i]`, so a marginal
+    evaluation costs one bisect plus one multiplication regardless of the bracket count.
+    Plain tuples of Decimals: instances are shipped to calculation worker processes.
+    """
+
+    mode: TierMode
+    thresholds: tuple[Decimal, ...]
+    rates: tuple[Decimal, ...]
+    base: tuple[Decimal, ...]
+    version: int
+
+    def evaluate(self, amount: Decimal) -> Decimal:
+        """Unrounded bonus for a turnover amount; zero below the first threshold."""
+        i = bisect.bisect_right(self.thresholds, amount) - 1
+        if i < 0:
+            return ZERO
+        if self.mode == TierMode.WHOLE:
+            return amount * self.rates[i] / 100
+        return self.base[i] + (amount - self.thresholds[i]) * self.rates[i] / 100
+
+
+def compile_tiers(mode: TierMode, brackets: Sequence[tuple[Decimal, Decimal]], version: int) -> CompiledTiers:
+    """Compile (threshold, rate) pairs, in any order, into a `CompiledTiers`."""
+    ordered = sorted(brackets)
+    thresholds = tuple(t for t, _ in ordered)
+    rates = tuple(r for _, r in ordered)
+    base = [ZERO]
+    for i in range(1, len(ordered)):
+        base.append(base[-1] + (thresholds[i] - thresholds[i - 1]) * rates[i - 1] / 100)
+    return CompiledTiers(mode=mode, thresholds=thresholds, rates=rates, base=tuple(base), version=version)
+
+
+class TierCache:
+    """Per-process compiled brackets, keyed by scale and mode, dropped when `ref_scale_tiers` changes.
+
+    Like the reference cache, the `table_versions` counter is checked at most once per TTL.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._version: int | None = None
+        self._checked_at = 0.0
+        self._compiled: dict[tuple[str, TierMode], CompiledTiers] = {}
+        self._lock = asyncio.Lock()
+
+    async def get(self, repo: ReferenceRepository, scale: RefScale) -> CompiledTiers | None:
+        """Compiled brackets of a tiered scale; `None` for flat scales or a tiered scale without brackets."""
+        if scale.tier_mode is None:
+            return None
+        key = (scale.code, scale.tier_mode)
+
+        async with self._lock:
+            now = time.monotonic()
+            if self._version is None or now - self._checked_at >= self.ttl_seconds:
+                version = await repo.get_table_version("ref_scale_tiers")
+                if version != self._version:
+                    self._compiled.clear()
+                    self._version = version
+                self._checked_at = now
+
+            compiled = self._compiled.get(key)
+            if compiled is None:
+                brackets = await repo.get_scale_tiers(scale.code)
+                if not brackets:
+                    return None
+                compiled = self._compiled[key] = compile_tiers(scale.tier_mode, brackets, self._version)
+            return compiled
+
+    def invalidate(self) -> None:
+        self._compiled.clear()
+        self._version = None
+
+
+tier_cache = TierCache(ttl_seconds=settings.REF_CACHE_TTL_SECONDS)
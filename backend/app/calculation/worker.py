@@ -0,0 +1,201 @@
+"""Calculation worker: drains `calc_jobs` enqueued through `POST /api/calculation/runs`.
+
+    python -m app.calculation.worker [--concurrency N] [--once] [--metrics-port PORT]
+    python -m app.calculation.worker --batch PERIOD_FROM PERIOD_TO
+
+Any number of worker processes, on any number of hosts, can run against the same database.
+`--batch` enqueues one run (or resumes the one an interrupted batch left) and drains it here.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date
+
+import app.calculation.strategies  # noqa: F401 - registers the built-in strategies
+from app.calculation.engine import CalculationEngine
+from app.calculation.executor import get_executor, shutdown_executor
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.core.metrics import REGISTRY
+from app.db.session import AsyncSessionLocal
+from app.domain.enums import CalcRunStatus
+from app.models.calculation import CalcJob
+from app.repositories.calc_job_repo import CalcJobRepository
+from app.repositories.calculation_repo import CalculationRepository
+from app.schemas.calculation import CalcRunCreate
+from app.services.calculation_service import CalculationService
+
+logger = logging.getLogger("app.calculation.worker")
+
+
+@dataclass
+class BatchReport:
+    run_key: str
+    run_id: uuid.UUID
+    status: CalcRunStatus
+    processed: int = 0
+    calculated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    resumed_from: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def agreements_per_second(self) -> float:
+        done = self.processed - self.resumed_from
+        return done / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+def _service(session) -> CalculationService:
+    return CalculationService(
+        engine=CalculationEngine(session, executor=get_executor()),
+        calculation_repo=CalculationRepository(session),
+        calc_job_repo=CalcJobRepository(session),
+    )
+
+
+async def _keep_lease(job_id: int, worker_id: str) -> None:
+    """Renew the job's lease at a third of its length until cancelled."""
+    interval = settings.CALC_JOB_LEASE_SECONDS / 3
+    while True:
+        await asyncio.sleep(interval)
+        async with AsyncSessionLocal() as session:
+            renewed = await CalcJobRepository(session).renew_lease(job_id, worker_id, settings.CALC_JOB_LEASE_SECONDS)
+            await session.commit()
+        if not renewed:
+            logger.warning("Job %d was reclaimed from %s", job_id, worker_id)
+            return
+
+
+async def _run_job(job: CalcJob, worker_id: str) -> None:
+    job_id = job.id
+    lease = asyncio.create_task(_keep_lease(job_id, worker_id))
+    try:
+        async with AsyncSessionLocal() as session:
+            service = _service(session)
+            if job.attempts > settings.CALC_JOB_MAX_ATTEMPTS:
+                # Earlier holders died without releasing it, e.g. killed mid-chunk
+                await service.fail_job(job, worker_id, "Lease expired on every attempt")
+                return
+            try:
+                if await service.process_job(job, worker_id):
+                    logger.info("%s finished job %d (%d agreements)", worker_id, job_id, job.agreements)
+            except Exception as e:
+                logger.exception("%s failed job %d", worker_id, job_id)
+                await service.fail_job(job, worker_id, str(e) or type(e).__name__)
+    finally:
+        lease.cancel()
+
+
+async def work(worker_id: str, once: bool = False) -> None:
+    """Claim and process jobs until stopped; with `once`, return when the queue is empty."""
+    while True:
+        async with AsyncSessionLocal() as session:
+            job = await _service(session).claim_job(worker_id)
+        if job is None:
+            if once:
+                return
+            await asyncio.sleep(settings.CALC_WORKER_POLL_SECONDS)
+            continue
+        await _run_job(job, worker_id)
+
+
+async def run_batch(data: CalcRunCreate, worker_id: str | None = None) -> BatchReport:
+    """Calculate every agreement of one period and filter, chunk by chunk, through the job queue.
+
+    The run is enqueued like `POST /api/calculation/runs` and its jobs are claimed here with
+    `SKIP LOCKED`, so workers started elsewhere can drain the same run in parallel. After every
+    chunk this process commits, the checkpoint under the run key records the run and the
+    agreements done; starting the same batch again after a crash resumes that run.
+    Counts in the report cover the whole run, including chunks other workers processed.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:batch"
+    async with AsyncSessionLocal() as session:
+        run, resumed_from = await _service(session).open_batch(data)
+    report = BatchReport(
+        run_key=run.run_key, run_id=run.id, status=run.status, processed=resumed_from, resumed_from=resumed_from
+    )
+
+    started = time.perf_counter()
+    while report.status not in (CalcRunStatus.COMPLETED, CalcRunStatus.FAILED):
+        async with AsyncSessionLocal() as session:
+            job = await _service(session).claim_job(worker_id, report.run_id)
+        if job is None:
+            # The remaining chunks are leased to other workers; poll until they finish or expire
+            await asyncio.sleep(settings.CALC_WORKER_POLL_SECONDS)
+        else:
+            await _run_job(job, worker_id)
+        async with AsyncSessionLocal() as session:
+            run = await _service(session).checkpoint_batch(report.run_id, job)
+
+        report.status = run.status
+        report.processed = run.calculated + run.copied + run.skipped
+        report.calculated, report.unchanged, report.skipped = run.calculated, run.copied, run.skipped
+        report.elapsed_seconds = time.perf_counter() - started
+        if job is not None:
+            logger.info(
+                "Batch %s: %d/%d agreements processed, %.1f agreements/s",
+                report.run_key, report.processed, run.total, report.agreements_per_second,
+            )
+
+    logger.info(
+        "Batch %s %s: %d calculated, %d unchanged, %d skipped in %.1fs (%.1f agreements/s)",
+        report.run_key, report.status.value.lower(), report.calculated, report.unchanged, report.skipped,
+        report.elapsed_seconds, report.agreements_per_second,
+    )
+    return report
+
+
+async def _serve_metrics(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer any request with the registry; workers have no web app to mount `/metrics` on."""
+    try:
+        await reader.readuntil(b"\r\n\r\n")
+        body = REGISTRY.render().encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+            b"Content-Length: %d\r\nConnection: close\r\n\r\n" % len(body) + body
+        )
+        await writer.drain()
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def main(concurrency: int, once: bool, metrics_port: int | None = None) -> None:
+    base_id = f"{socket.gethostname()}:{os.getpid()}"
+    server = await asyncio.start_server(_serve_metrics, port=metrics_port) if metrics_port else None
+    try:
+        await asyncio.gather(*(work(f"{base_id}:{i}", once) for i in range(concurrency)))
+    finally:
+        if server is not None:
+            server.close()
+        shutdown_executor()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process queued calculation jobs.")
+    parser.add_argument("--concurrency", type=int, default=1, help="jobs processed at once by this process")
+    parser.add_argument("--once", action="store_true", help="exit when no job is left to claim")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port")
+    parser.add_argument(
+        "--batch", nargs=2, type=date.fromisoformat, metavar=("PERIOD_FROM", "PERIOD_TO"),
+        help="calculate agreements ready for calculation in this period (YYYY-MM-DD) as one resumable run",
+    )
+    args = parser.parse_args()
+
+    setup_logging()
+    if args.batch:
+        batch = CalcRunCreate(period_from=args.batch[0], period_to=args.batch[1])
+        try:
+            report = asyncio.run(run_batch(batch))
+        finally:
+            shutdown_executor()
+        print(f"Run {report.run_id} {report.status.value}: {report.processed} agreements")
+    else:
+        asyncio.run(main(args.concurrency, args.once, args.metrics_port))
@@ -0,0 +1,46 @@
+"""Weak ETags built from `table_versions` counters, and `If-None-Match` handling.
+
+A validator is a hash of the versions of every table a response reads plus anything else that
+shapes the body (query string, defaults). It is computed before the body, so a matching
+`If-None-Match` is answered with an empty 304 without loading or serializing rows.
+"""
+import hashlib
+
+from fastapi import Request, Response
+
+# Bump when the JSON shape of a validated response changes, so clients drop old bodies
+RESPONSE_FORMAT = "2"
+
+# Clients may keep the body but must revalidate it on every use; shared caches must not store it
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.sha256("|".join(map(str, (RESPONSE_FORMAT, *parts))).encode()).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison against every tag of an `If-None-Match` header."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in if_none_match.split(",")}
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Response | None:
+    """Put the validator on `response`; return a 304 instead when the client already has `etag`."""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=etag_headers(etag))
+    response.headers.update(etag_headers(etag))
+    return None
@@ -0,0 +1,51 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import Gauge, Histogram
+
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the last body byte, by route template",
+    ("method", "route", "status"),
+)
+http_requests_in_flight = Gauge("http_requests_in_flight", "HTTP requests being handled", ("method",))
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: per-route latency and in-flight requests, without buffering bodies.
+
+    The route label is the matched path template (`/api/agreements/{agreement_id}`), which
+    FastAPI stores in the scope during routing, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc(method=method)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec(method=method)
+            route = scope.get("route")
+            http_request_duration_seconds.observe(
+                time.perf_counter() - started,
+                method=method,
+                route=getattr(route, "path", "unmatched"),
+                status=str(status),
+            )
@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge
+
+T = TypeVar("T")
+
+principal_cache_requests = Counter(
+    "principal_cache_requests", "Principal lookups by outcome (hit skips the users query)", ("result",)
+)
+principal_cache_saved_seconds = Counter(
+    "principal_cache_saved_seconds", "Estimated users-query time avoided by cache hits"
+)
+principal_cache_size = Gauge("principal_cache_size", "Principals currently cached")
+
+
+class PrincipalCache(Generic[T]):
+    """Bounded LRU of resolved principals keyed by (token subject, token expiry).
+
+    An entry lives for at most `ttl_seconds` and never past the token's own expiry. Entries are
+    dropped explicitly when a user is deactivated; the TTL bounds staleness for changes made
+    by other processes.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple[str, int], tuple[float, T]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._miss_seconds = 0.0
+
+    def get(self, subject: str, expires: int) -> T | None:
+        key = (subject, expires)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                principal_cache_requests.inc(result="hit")
+                principal_cache_saved_seconds.inc(self._miss_seconds)
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+        principal_cache_requests.inc(result="miss")
+        return None
+
+    def put(self, subject: str, expires: int, principal: T, lookup_seconds: float) -> None:
+        now = time.monotonic()
+        lifetime = min(self.ttl_seconds, expires - time.time())
+        with self._lock:
+            # Moving average of the lookup cost a hit avoids
+            if self._miss_seconds:
+                self._miss_seconds = 0.9 * self._miss_seconds + 0.1 * lookup_seconds
+            else:
+                self._miss_seconds = lookup_seconds
+            if lifetime <= 0:
+                return
+            self._entries[(subject, expires)] = (now + lifetime, principal)
+            self._entries.move_to_end((subject, expires))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            principal_cache_size.set(len(self._entries))
+
+    def invalidate(self, subject: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == subject]:
+                del self._entries[key]
+            principal_cache_size.set(len(self._entries))
+
+
+principal_cache: PrincipalCache = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+)
@@ -0,0 +1,144 @@
+"""Per-request SQL accounting through SQLAlchemy engine events.
+
+Every statement executed while a `QueryStats` is active in the current context is counted and
+timed. The middleware activates one per HTTP request; `count_queries` / `assert_max_queries`
+do the same around any block of code.
+"""
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+slow_query_logger = logging.getLogger("app.slow_query")
+request_logger = logging.getLogger("app.request")
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    # The enclosing block's stats, which also receive this block's statements
+    parent: "QueryStats | None" = field(default=None, repr=False)
+
+    @property
+    def milliseconds(self) -> float:
+        return self.seconds * 1000
+
+
+# The stats object is mutated in place, so copies of the context (greenlets, threadpool
+# dependencies) all add to the request's counters
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def _redact(parameters: object, executemany: bool) -> str:
+    """Parameter shapes without values: types for one row, row count for executemany."""
+    if executemany and isinstance(parameters, (list, tuple)):
+        return f"<{len(parameters)} rows>"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return "<none>"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = _current.get()
+    while stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        stats = stats.parent
+    if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        slow_query_logger.warning(
+            "Slow query (%.1f ms): %s params=%s",
+            elapsed * 1000,
+            " ".join(statement.split()),
+            _redact(parameters, executemany),
+            extra={"db_ms": round(elapsed * 1000, 1)},
+        )
+
+
+def install(engine: Engine) -> None:
+    """Attach the counters to an engine (the `sync_engine` of an async one)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """Count statements issued inside the block, e.g. around a service call or an ASGI request.
+
+    Blocks nest: statements also count towards every enclosing block, so a test can wrap a
+    request that the middleware counts on its own.
+    """
+    stats = QueryStats(parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fail with AssertionError when the block issues more than `limit` statements.
+
+    Meant for regression checks of endpoint query counts:
+
+        with assert_max_queries(3):
+            await client.get("/api/agreements/...")
+    """
+    with count_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        raise AssertionError(f"Expected at most {limit} queries, got {stats.count} ({stats.milliseconds:.1f} ms)")
+
+
+class QueryStatsMiddleware:
+    """Adds `Server-Timing: db;dur=…;desc="N queries"` and logs one line per request.
+
+    The header counts statements issued before the response starts; the log line also
+    includes those run while a streaming body is sent.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        with count_queries() as stats:
+            async def send_with_timing(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    timing = f'db;dur={stats.milliseconds:.1f};desc="{stats.count} queries"'
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                request_logger.info(
+                    "%s %s %d %.1fms db_queries=%d db_ms=%.1f",
+                    scope["method"], scope["path"], status, elapsed_ms, stats.count, stats.milliseconds,
+                    extra={"db_queries": stats.count, "db_ms": round(stats.milliseconds, 1)},
+                )
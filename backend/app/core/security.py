@@ -1,12 +1,34 @@
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import TypeVar
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.metrics import Gauge, Histogram
+from app.domain.exceptions import ServiceUnavailableError
+
+T = TypeVar("T")
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_pending = 0
+
+_HASH_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.5, 5.0)
+password_hash_queue_seconds = Histogram(
+    "password_hash_queue_seconds", "Time a hash/verify job waited for a worker", buckets=_HASH_BUCKETS
+)
+password_hash_seconds = Histogram(
+    "password_hash_seconds", "bcrypt hash/verify time", ("operation",), buckets=_HASH_BUCKETS
+)
+password_hash_pending = Gauge("password_hash_pending", "Hash/verify jobs queued or running")
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -16,6 +38,39 @@ def hash_password(plain_password: str) -> str:
     return pwd_context.hash(plain_password)
 
 
+async def _run_in_hash_pool(operation: str, fn: Callable[..., T], *args: str) -> T:
+    global _hash_pending
+    if _hash_pending >= settings.PASSWORD_HASH_MAX_QUEUE:
+        raise ServiceUnavailableError("Слишком много одновременных входов, повторите попытку")
+
+    enqueued = time.perf_counter()
+
+    def job() -> T:
+        started = time.perf_counter()
+        password_hash_queue_seconds.observe(started - enqueued)
+        try:
+            return fn(*args)
+        finally:
+            password_hash_seconds.observe(time.perf_counter() - started, operation=operation)
+
+    # Only touched from the event loop thread, so no lock is needed
+    _hash_pending += 1
+    password_hash_pending.set(_hash_pending)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, job)
+    finally:
+        _hash_pending -= 1
+        password_hash_pending.set(_hash_pending)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool("verify", verify_password, plain_password, hashed_password)
+
+
+async def hash_password_async(plain_password: str) -> str:
+    return await _run_in_hash_pool("hash", hash_password, plain_password)
+
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
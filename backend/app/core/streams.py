@@ -0,0 +1,19 @@
+from collections.abc import AsyncIterable, AsyncIterator
+
+from app.domain.exceptions import ValidationError
+
+MAX_LINE_BYTES = 64 * 1024
+
+
+async def aiter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Split a chunked byte stream into decoded lines without buffering the whole body."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r").decode("utf-8-sig", errors="replace")
+        if len(buffer) > MAX_LINE_BYTES:
+            raise ValidationError(f"Line exceeds {MAX_LINE_BYTES} bytes")
+    if buffer:
+        yield buffer.rstrip(b"\r").decode("utf-8-sig", errors="replace")
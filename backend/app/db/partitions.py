@@ -0,0 +1,74 @@
+"""Monthly partition maintenance for `turnover_facts` and `turnover_daily`.
+
+    python -m app.db.partitions [--ahead N] [--detach-before YYYY-MM] [--dry-run]
+
+Creates the partitions of the current month and the next `--ahead` months (the API also does
+this on startup and the loader creates any month it receives), and optionally detaches every
+month before `--detach-before` into `TURNOVER_ARCHIVE_SCHEMA`, where it can be dumped and dropped.
+"""
+import argparse
+import asyncio
+import logging
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.calculation.periods import month_start, next_month_start
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.db.session import AsyncSessionLocal
+from app.repositories.turnover_repo import TurnoverPartition, TurnoverRepository
+
+logger = logging.getLogger(__name__)
+
+
+def upcoming_months(today: date, ahead: int) -> list[date]:
+    months = [month_start(today)]
+    for _ in range(ahead):
+        months.append(next_month_start(months[-1]))
+    return months
+
+
+async def ensure_upcoming(session: AsyncSession, ahead: int = settings.TURNOVER_PARTITIONS_AHEAD_MONTHS) -> int:
+    created = await TurnoverRepository(session).ensure_partitions(upcoming_months(date.today(), ahead))
+    await session.commit()
+    if created:
+        logger.info("Created %d turnover partitions", created)
+    return created
+
+
+async def detach_before(session: AsyncSession, before: date, dry_run: bool = False) -> list[TurnoverPartition]:
+    """Detach the partitions of months before `before`, each in its own short transaction."""
+    repo = TurnoverRepository(session)
+    old = [p for p in await repo.list_partitions() if p.month < month_start(before)]
+    for partition in old:
+        if dry_run:
+            continue
+        await repo.detach_partition(partition, settings.TURNOVER_ARCHIVE_SCHEMA)
+        await session.commit()
+        logger.info("Detached %s into %s", partition.name, settings.TURNOVER_ARCHIVE_SCHEMA)
+    return old
+
+
+async def main(ahead: int, before: date | None, dry_run: bool) -> None:
+    async with AsyncSessionLocal() as session:
+        if not dry_run:
+            await ensure_upcoming(session, ahead)
+        if before is not None:
+            partitions = await detach_before(session, before, dry_run)
+            verb = "Would detach" if dry_run else "Detached"
+            print(f"{verb} {len(partitions)} partitions: {', '.join(p.name for p in partitions) or '-'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain monthly turnover partitions.")
+    parser.add_argument("--ahead", type=int, default=settings.TURNOVER_PARTITIONS_AHEAD_MONTHS)
+    parser.add_argument(
+        "--detach-before", type=lambda v: date.fromisoformat(f"{v}-01"),
+        help="archive months before this one (YYYY-MM)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="only list what would be detached")
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(main(args.ahead, args.detach_before, args.dry_run))
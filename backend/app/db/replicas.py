@@ -0,0 +1,115 @@
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core import query_stats
+from app.core.config import settings
+from app.core.metrics import Counter
+from app.db.session import InstrumentedPool
+
+logger = logging.getLogger(__name__)
+
+db_read_routing = Counter(
+    "db_read_routing",
+    "Read-only request sessions by target: primary, pinned (read-your-writes) or replica",
+    ("target",),
+)
+db_replica_ejections = Counter("db_replica_ejections", "Replicas taken out of rotation after errors", ("replica",))
+
+# Bound on remembered read-your-writes pins before expired ones are swept
+_MAX_PINS = 100_000
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: AsyncEngine
+    sessionmaker: async_sessionmaker[AsyncSession]
+    ejected_until: float = field(default=0.0)
+
+
+def is_unavailable_error(error: BaseException) -> bool:
+    """Errors that mean the server is unreachable, as opposed to a failing statement."""
+    if isinstance(error, (OSError, asyncio.TimeoutError, OperationalError, InterfaceError)):
+        return True
+    return isinstance(error, DBAPIError) and (error.connection_invalidated or isinstance(error.orig, OSError))
+
+
+class ReplicaRouter:
+    """Chooses a replica session factory for read-only requests.
+
+    Replicas are used round-robin. One that fails with a connection error is ejected for
+    `eject_seconds` and then tried again by the next request. After a client writes, its reads
+    go to the primary for `pin_seconds` so it sees its own changes despite replication lag;
+    pins live in this process only.
+    """
+
+    def __init__(self, urls: list[str], eject_seconds: float, pin_seconds: float) -> None:
+        self.eject_seconds = eject_seconds
+        self.pin_seconds = pin_seconds
+        self.replicas: list[Replica] = []
+        for i, url in enumerate(urls):
+            engine = create_async_engine(
+                url,
+                poolclass=InstrumentedPool,
+                connect_args={"timeout": settings.REPLICA_CONNECT_TIMEOUT_SECONDS},
+                # Transactions start READ ONLY, so a misrouted write fails instead of diverging
+                execution_options={"postgresql_readonly": True},
+            )
+            query_stats.install(engine.sync_engine)
+            self.replicas.append(Replica(
+                name=f"replica-{i}",
+                engine=engine,
+                sessionmaker=async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+            ))
+        self._cycle = itertools.count()
+        self._pins: dict[str, float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def pick(self, client_key: str) -> Replica | None:
+        """Next healthy replica, or None when the client is pinned or no replica is available."""
+        if not self.replicas:
+            return None
+        now = time.monotonic()
+        if self._pins.get(client_key, 0.0) > now:
+            db_read_routing.inc(target="pinned")
+            return None
+
+        start = next(self._cycle)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if replica.ejected_until <= now:
+                db_read_routing.inc(target="replica")
+                return replica
+        db_read_routing.inc(target="primary")
+        return None
+
+    def eject(self, replica: Replica, error: BaseException) -> None:
+        replica.ejected_until = time.monotonic() + self.eject_seconds
+        db_replica_ejections.inc(replica=replica.name)
+        logger.warning("%s ejected for %.0fs: %s", replica.name, self.eject_seconds, error)
+
+    def pin(self, client_key: str) -> None:
+        now = time.monotonic()
+        if len(self._pins) >= _MAX_PINS:
+            self._pins = {k: until for k, until in self._pins.items() if until > now}
+        self._pins[client_key] = now + self.pin_seconds
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+replica_router = ReplicaRouter(
+    urls=[u.strip() for u in settings.DATABASE_REPLICA_URLS.split(",") if u.strip()],
+    eject_seconds=settings.REPLICA_EJECT_SECONDS,
+    pin_seconds=settings.READ_YOUR_WRITES_SECONDS,
+)
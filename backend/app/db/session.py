@@ -1,6 +1,37 @@
+import time
+
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from app.core import query_stats
 from app.core.config import settings
+from app.core.metrics import Gauge, Histogram
+
+db_pool_wait_seconds = Histogram(
+    "db_pool_wait_seconds",
+    "Time to obtain a pooled connection, including opening a new one",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited."""
 
-engine = create_async_engine(settings.DATABASE_URL)
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait_seconds.observe(time.perf_counter() - started)
+
+
+engine = create_async_engine(settings.DATABASE_URL, poolclass=InstrumentedPool)
+query_stats.install(engine.sync_engine)
 AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+Gauge("db_pool_size", "Configured pool size").set_function(engine.pool.size)
+Gauge("db_pool_checked_out", "Connections currently checked out").set_function(engine.pool.checkedout)
+Gauge("db_pool_checked_in", "Idle connections in the pool").set_function(engine.pool.checkedin)
+Gauge("db_pool_overflow", "Connections open beyond pool_size (negative while below)").set_function(
+    engine.pool.overflow
+)
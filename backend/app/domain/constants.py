@@ -1,3 +1,22 @@
+from app.domain.enums import AgreementStatus, TurnoverKind
+
 DEFAULT_ADMIN_USERNAME = "admin"
 DEFAULT_ADMIN_EMAIL = "admin@example.com"
 DEFAULT_ADMIN_PASSWORD = "admin"
+
+# Turnover base of percentage scales: "01"/"04" — % от продаж, "02"/"05" — % от закупок
+# ("04"/"05" are bracketed, see ref_scale_tiers)
+SCALE_TURNOVER_KINDS: dict[str, TurnoverKind] = {
+    "01": TurnoverKind.SALES,
+    "02": TurnoverKind.PURCHASES,
+    "04": TurnoverKind.SALES,
+    "05": TurnoverKind.PURCHASES,
+}
+
+# Statuses an agreement may move to from each status, for single and bulk status changes. A deleted
+# agreement can only be restored; moving to the status it already has is not a transition.
+AGREEMENT_STATUS_TRANSITIONS: dict[AgreementStatus, frozenset[AgreementStatus]] = {
+    AgreementStatus.READY_FOR_CALCULATION: frozenset({AgreementStatus.CALCULATED, AgreementStatus.DELETED}),
+    AgreementStatus.CALCULATED: frozenset({AgreementStatus.READY_FOR_CALCULATION, AgreementStatus.DELETED}),
+    AgreementStatus.DELETED: frozenset({AgreementStatus.READY_FOR_CALCULATION}),
+}
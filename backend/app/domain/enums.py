@@ -10,3 +10,34 @@ class AgreementStatus(str, enum.Enum):
 class GridType(str, enum.Enum):
     PERCENT = "PERCENT"
     FIX = "FIX"
+
+
+class TierMode(str, enum.Enum):
+    # Each bracket's rate applies to the part of the turnover inside the bracket
+    MARGINAL = "MARGINAL"
+    # The rate of the highest bracket reached applies to the whole turnover
+    WHOLE = "WHOLE"
+
+
+class TurnoverKind(str, enum.Enum):
+    SALES = "SALES"
+    PURCHASES = "PURCHASES"
+
+
+class FileFormat(str, enum.Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class CalcRunStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+class CalcJobStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
@@ -18,3 +18,20 @@ class ValidationError(AppError):
 class ForbiddenError(AppError):
     def __init__(self, message: str = "Forbidden") -> None:
         super().__init__(message, status_code=403)
+
+
+class ConflictError(AppError):
+    def __init__(self, message: str = "Conflict") -> None:
+        super().__init__(message, status_code=409)
+
+
+class UnsupportedAgreementError(AppError):
+    """The agreement's scale cannot be calculated by its strategy (unknown scale, missing brackets)."""
+
+    def __init__(self, message: str = "Agreement cannot be calculated") -> None:
+        super().__init__(message, status_code=422)
+
+
+class ServiceUnavailableError(AppError):
+    def __init__(self, message: str = "Service temporarily unavailable") -> None:
+        super().__init__(message, status_code=503)
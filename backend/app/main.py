@@ -6,9 +6,16 @@ from fastapi.responses import JSONResponse
 
 from app.api.v1.agreements import router as agreements_router
 from app.api.v1.auth import router as auth_router
+from app.api.v1.calculation import router as calculation_router
+from app.api.v1.metrics import router as metrics_router
 from app.api.v1.reference import router as reference_router
+from app.api.v1.turnover import router as turnover_router
 from app.core.config import settings
+from app.core.http_metrics import MetricsMiddleware
 from app.core.logging import setup_logging
+from app.core.query_stats import QueryStatsMiddleware
+from app.db.partitions import ensure_upcoming
+from app.db.replicas import replica_router
 from app.db.session import AsyncSessionLocal
 from app.domain.exceptions import AppError
 from app.repositories.user_repo import UserRepository
@@ -21,7 +28,9 @@ async def lifespan(app: FastAPI):
     async with AsyncSessionLocal() as session:
         auth_service = AuthService(user_repo=UserRepository(session))
         await auth_service.ensure_admin_exists()
+        await ensure_upcoming(session)
     yield
+    await replica_router.dispose()
 
 
 app = FastAPI(title="Bonus Agreements API", lifespan=lifespan)
@@ -38,8 +47,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "Server-Timing", "ETag"],
 )
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(agreements_router, prefix="/api")
 app.include_router(auth_router, prefix="/api")
+app.include_router(calculation_router, prefix="/api")
 app.include_router(reference_router, prefix="/api")
+app.include_router(turnover_router, prefix="/api")
+app.include_router(metrics_router)
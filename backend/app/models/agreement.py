@@ -2,7 +2,8 @@ import uuid
 from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy import String, Enum, Numeric, CheckConstraint, ForeignKey, text
+from sqlalchemy import String, Enum, Numeric, CheckConstraint, Computed, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import DATERANGE, Range
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -22,6 +23,10 @@ class Agreement(Base):
     )
     valid_from: Mapped[date] = mapped_column(nullable=False)
     valid_to: Mapped[date] = mapped_column(nullable=False)
+    # Inclusive [valid_from, valid_to]; period overlap queries use `&&` on it (GiST index)
+    validity: Mapped[Range[date]] = mapped_column(
+        DATERANGE, Computed("daterange(valid_from, valid_to, '[]')", persisted=True)
+    )
     supplier_code: Mapped[str] = mapped_column(
         String(20), ForeignKey("ref_suppliers.code"), nullable=False
     )
@@ -38,6 +43,8 @@ class Agreement(Base):
         default=AgreementStatus.READY_FOR_CALCULATION,
         server_default="READY_FOR_CALCULATION",
     )
+    # Incremented by every update; writers pass the version they read and get 409 if it moved
+    version: Mapped[int] = mapped_column(nullable=False, default=1, server_default="1")
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
@@ -50,4 +57,8 @@ class Agreement(Base):
     __table_args__ = (
         CheckConstraint("valid_to >= valid_from", name="check_valid_dates"),
         CheckConstraint("condition_value > 0", name="check_condition_value_positive"),
+        Index("ix_agreements_supplier_validity", "supplier_code", "validity", postgresql_using="gist"),
+        Index(
+            "ix_agreements_code_trgm", "code", postgresql_using="gin", postgresql_ops={"code": "gin_trgm_ops"}
+        ),
     )
@@ -0,0 +1,107 @@
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import BigInteger, Enum, ForeignKey, Identity, Index, Numeric, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.domain.enums import CalcJobStatus, CalcRunStatus
+
+
+class CalcBatchCheckpoint(Base):
+    """Resume point of a `run_batch` driver: the queued run it drains and how far it got."""
+
+    __tablename__ = "calc_batch_checkpoints"
+
+    run_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    calc_run_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("calc_runs.id", ondelete="CASCADE"), nullable=False)
+    # Upper bound of the last chunk this driver committed (None for the open-ended last chunk)
+    last_agreement_id: Mapped[uuid.UUID | None] = mapped_column(nullable=True)
+    processed: Mapped[int] = mapped_column(nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+
+class CalcRun(Base):
+    __tablename__ = "calc_runs"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    # Hash of period and filter; runs with the same key are comparable for incremental reuse
+    run_key: Mapped[str] = mapped_column(String(64), nullable=False)
+    period_from: Mapped[date] = mapped_column(nullable=False)
+    period_to: Mapped[date] = mapped_column(nullable=False)
+    filter: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    incremental: Mapped[bool] = mapped_column(nullable=False, default=False)
+    base_run_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("calc_runs.id"), nullable=True)
+    status: Mapped[CalcRunStatus] = mapped_column(
+        Enum(CalcRunStatus, name="calc_run_status_enum"),
+        nullable=False,
+        default=CalcRunStatus.PENDING,
+    )
+    # Agreements selected when the run was planned; calculated + copied + skipped approaches it
+    total: Mapped[int] = mapped_column(nullable=False, default=0)
+    calculated: Mapped[int] = mapped_column(nullable=False, default=0)
+    copied: Mapped[int] = mapped_column(nullable=False, default=0)
+    skipped: Mapped[int] = mapped_column(nullable=False, default=0)
+    started_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_calc_runs_run_key_status", "run_key", "status", "completed_at"),
+    )
+
+
+class CalcResult(Base):
+    __tablename__ = "calc_results"
+
+    calc_run_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("calc_runs.id", ondelete="CASCADE"), primary_key=True
+    )
+    agreement_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("agreements.id"), primary_key=True)
+    base_amount: Mapped[Decimal | None] = mapped_column(Numeric(18, 2), nullable=True)
+    bonus_amount: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False)
+    # Inputs the result was computed from; `fingerprint` is their digest
+    agreement_updated_at: Mapped[datetime] = mapped_column(nullable=False)
+    scale_code: Mapped[str] = mapped_column(String(10), nullable=False)
+    condition_value: Mapped[Decimal] = mapped_column(Numeric(15, 2), nullable=False)
+    input_version: Mapped[str] = mapped_column(String(64), nullable=False)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow, nullable=False)
+
+
+class CalcJob(Base):
+    """One chunk of a calculation run: agreements with `after_id < id <= until_id`."""
+
+    __tablename__ = "calc_jobs"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    calc_run_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("calc_runs.id", ondelete="CASCADE"), nullable=False)
+    after_id: Mapped[uuid.UUID | None] = mapped_column(nullable=True)
+    # None for the last chunk, which also takes agreements created after planning
+    until_id: Mapped[uuid.UUID | None] = mapped_column(nullable=True)
+    agreements: Mapped[int] = mapped_column(nullable=False)
+    status: Mapped[CalcJobStatus] = mapped_column(
+        Enum(CalcJobStatus, name="calc_job_status_enum"),
+        nullable=False,
+        default=CalcJobStatus.PENDING,
+    )
+    attempts: Mapped[int] = mapped_column(nullable=False, default=0)
+    locked_by: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    started_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_calc_jobs_run_status", "calc_run_id", "status"),
+        Index(
+            "ix_calc_jobs_claimable",
+            "id",
+            postgresql_where=text("status IN ('PENDING', 'RUNNING')"),
+        ),
+    )
@@ -1,8 +1,10 @@
-from sqlalchemy import String, Enum
+from decimal import Decimal
+
+from sqlalchemy import String, Enum, ForeignKey, Index, Numeric
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
-from app.domain.enums import GridType
+from app.domain.enums import GridType, TierMode
 
 
 class RefSupplier(Base):
@@ -11,6 +13,10 @@ class RefSupplier(Base):
     code: Mapped[str] = mapped_column(String(20), primary_key=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
 
+    __table_args__ = (
+        Index("ix_ref_suppliers_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
+
 
 class RefAgreementType(Base):
     __tablename__ = "ref_agreement_types"
@@ -18,6 +24,12 @@ class RefAgreementType(Base):
     code: Mapped[str] = mapped_column(String(20), primary_key=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
 
+    __table_args__ = (
+        Index(
+            "ix_ref_agreement_types_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}
+        ),
+    )
+
 
 class RefScale(Base):
     __tablename__ = "ref_scales"
@@ -27,3 +39,18 @@ class RefScale(Base):
     grid: Mapped[GridType] = mapped_column(
         Enum(GridType, name="grid_type_enum"), nullable=False
     )
+    # Set for bracketed scales; the rate then comes from ref_scale_tiers instead of condition_value
+    tier_mode: Mapped[TierMode | None] = mapped_column(
+        Enum(TierMode, name="tier_mode_enum"), nullable=True
+    )
+
+
+class RefScaleTier(Base):
+    __tablename__ = "ref_scale_tiers"
+
+    scale_code: Mapped[str] = mapped_column(
+        String(10), ForeignKey("ref_scales.code", ondelete="CASCADE"), primary_key=True
+    )
+    # Lower bound of the bracket (inclusive) and the percentage applied from it
+    threshold: Mapped[Decimal] = mapped_column(Numeric(18, 2), primary_key=True)
+    rate: Mapped[Decimal] = mapped_column(Numeric(9, 4), nullable=False)
@@ -0,0 +1,51 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import BigInteger, Enum, Identity, Index, Numeric, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.domain.enums import TurnoverKind
+
+turnover_kind_enum = Enum(TurnoverKind, name="turnover_kind_enum")
+
+
+class TurnoverFact(Base):
+    __tablename__ = "turnover_facts"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    supplier_code: Mapped[str] = mapped_column(String(20), nullable=False)
+    # Partition key, hence part of the primary key
+    doc_date: Mapped[date] = mapped_column(primary_key=True)
+    kind: Mapped[TurnoverKind] = mapped_column(turnover_kind_enum, nullable=False)
+    amount: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
+
+    # Monthly partitions turnover_facts_YYYY_MM, see ensure_turnover_partitions()
+    __table_args__ = (
+        Index("ix_turnover_facts_doc_date_brin", "doc_date", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (doc_date)"},
+    )
+
+
+class TurnoverDaily(Base):
+    __tablename__ = "turnover_daily"
+
+    supplier_code: Mapped[str] = mapped_column(String(20), primary_key=True)
+    kind: Mapped[TurnoverKind] = mapped_column(turnover_kind_enum, primary_key=True)
+    day: Mapped[date] = mapped_column(primary_key=True)
+    amount: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
+
+    # Monthly partitions turnover_daily_YYYY_MM
+    __table_args__ = {"postgresql_partition_by": "RANGE (day)"}
+
+
+class TurnoverMonthly(Base):
+    __tablename__ = "turnover_monthly"
+
+    supplier_code: Mapped[str] = mapped_column(String(20), primary_key=True)
+    kind: Mapped[TurnoverKind] = mapped_column(turnover_kind_enum, primary_key=True)
+    month: Mapped[date] = mapped_column(primary_key=True)
+    amount: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
@@ -1,9 +1,134 @@
 import uuid
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Date, DateTime, Float, Row, Select, Uuid, any_, bindparam, cast, func, insert, select, text, tuple_, update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, DATERANGE
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.domain.enums import AgreementStatus
 from app.models.agreement import Agreement
+from app.models.reference import RefAgreementType, RefScale, RefSupplier
+from app.schemas.agreement import AgreementFilter
+
+# Columns of AgreementResponse, read straight from a join instead of ORM relationships
+FLAT_COLUMNS = (
+    Agreement.id,
+    Agreement.code,
+    Agreement.valid_from,
+    Agreement.valid_to,
+    Agreement.supplier_code,
+    RefSupplier.name.label("supplier_name"),
+    Agreement.agreement_type_code,
+    RefAgreementType.name.label("agreement_type_name"),
+    Agreement.scale_code,
+    RefScale.name.label("scale_name"),
+    RefScale.grid.label("scale_grid"),
+    Agreement.condition_value,
+    Agreement.status,
+    Agreement.version,
+    Agreement.created_at,
+    Agreement.updated_at,
+)
+
+
+# Each source is capped before merging, so a fragment matching a very common supplier or type
+# name never ranks more than `limit` agreements per matched name. Fragments hit the trigram GIN
+# indexes through LIKE/ILIKE; `<%` (word similarity) adds typo-tolerant name matches.
+_SEARCH = text("""
+    WITH by_code AS (
+        SELECT a.id, a.created_at, similarity(a.code, :q) AS score
+        FROM agreements a
+        WHERE a.code LIKE :pattern ESCAPE '\\'
+        ORDER BY score DESC, a.created_at DESC
+        LIMIT :limit
+    ),
+    suppliers AS (
+        SELECT s.code, word_similarity(:q, s.name) AS score
+        FROM ref_suppliers s
+        WHERE s.name ILIKE :pattern ESCAPE '\\' OR :q <% s.name
+        ORDER BY score DESC
+        LIMIT :names_limit
+    ),
+    by_supplier AS (
+        SELECT a.id, a.created_at, s.score
+        FROM suppliers s
+        CROSS JOIN LATERAL (
+            SELECT id, created_at FROM agreements
+            WHERE supplier_code = s.code
+            ORDER BY created_at DESC
+            LIMIT :limit
+        ) a
+    ),
+    types AS (
+        SELECT t.code, word_similarity(:q, t.name) AS score
+        FROM ref_agreement_types t
+        WHERE t.name ILIKE :pattern ESCAPE '\\' OR :q <% t.name
+        ORDER BY score DESC
+        LIMIT :names_limit
+    ),
+    by_type AS (
+        SELECT a.id, a.created_at, t.score
+        FROM types t
+        CROSS JOIN LATERAL (
+            SELECT id, created_at FROM agreements
+            WHERE agreement_type_code = t.code
+            ORDER BY created_at DESC
+            LIMIT :limit
+        ) a
+    )
+    SELECT id, MAX(score) AS score, MAX(created_at) AS created_at
+    FROM (
+        SELECT * FROM by_code
+        UNION ALL SELECT * FROM by_supplier
+        UNION ALL SELECT * FROM by_type
+    ) candidates
+    GROUP BY id
+    ORDER BY score DESC, created_at DESC
+    LIMIT :limit
+""").columns(id=Uuid, score=Float, created_at=DateTime)
+
+# Supplier and type names ranked per search
+_SEARCH_NAMES_LIMIT = 20
+
+
+def _like_pattern(fragment: str) -> str:
+    escaped = fragment.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def period_range(date_from: date | None, date_to: date | None):
+    """Inclusive `daterange` of a period for `&&` against `Agreement.validity`; a missing bound is open."""
+    return func.daterange(cast(date_from, Date), cast(date_to, Date), "[]", type_=DATERANGE)
+
+
+def flat_select() -> Select:
+    return (
+        select(*FLAT_COLUMNS)
+        .join(RefSupplier, RefSupplier.code == Agreement.supplier_code)
+        .join(RefAgreementType, RefAgreementType.code == Agreement.agreement_type_code)
+        .join(RefScale, RefScale.code == Agreement.scale_code)
+    )
+
+
+def apply_filter(query: Select, filters: AgreementFilter) -> Select:
+    if filters.status:
+        query = query.where(Agreement.status.in_(filters.status))
+    if filters.supplier_code:
+        query = query.where(Agreement.supplier_code.in_(filters.supplier_code))
+    if filters.agreement_type_code:
+        query = query.where(Agreement.agreement_type_code.in_(filters.agreement_type_code))
+    if filters.scale_code:
+        query = query.where(Agreement.scale_code.in_(filters.scale_code))
+    if filters.valid_from is not None:
+        query = query.where(Agreement.valid_from >= filters.valid_from)
+    if filters.valid_to is not None:
+        query = query.where(Agreement.valid_to <= filters.valid_to)
+    if filters.active_from is not None or filters.active_to is not None:
+        query = query.where(Agreement.validity.overlaps(period_range(filters.active_from, filters.active_to)))
+    return query
 
 
 class AgreementRepository:
@@ -16,10 +141,77 @@ class AgreementRepository:
         await self.db.refresh(agreement)
         return agreement
 
-    async def get_all(self) -> list[Agreement]:
+    async def insert_many(self, rows: Sequence[dict]) -> dict[uuid.UUID, str]:
+        """One multi-row INSERT ... RETURNING id, code; rows must carry client-generated ids."""
         result = await self.db.execute(
-            select(Agreement).order_by(Agreement.created_at.desc())
+            insert(Agreement).values(list(rows)).returning(Agreement.id, Agreement.code)
+        )
+        return dict(result.all())
+
+    async def get_page(
+        self,
+        filters: AgreementFilter,
+        after: tuple[datetime, uuid.UUID] | None,
+        limit: int,
+    ) -> Sequence[Row]:
+        """Keyset page of flat rows ordered by (created_at, id) descending, served by ix_agreements_created_at_id."""
+        query = apply_filter(flat_select(), filters)
+        if after is not None:
+            query = query.where(tuple_(Agreement.created_at, Agreement.id) < tuple_(*after))
+        query = query.order_by(Agreement.created_at.desc(), Agreement.id.desc()).limit(limit)
+        result = await self.db.execute(query)
+        return result.all()
+
+    async def count(self, filters: AgreementFilter) -> int:
+        result = await self.db.execute(apply_filter(select(func.count()).select_from(Agreement), filters))
+        return result.scalar_one()
+
+    async def stream_flat(self, filters: AgreementFilter, batch_size: int) -> AsyncIterator[Sequence[Row]]:
+        """Yield flat rows in batches from a server-side cursor, newest first."""
+        query = apply_filter(flat_select(), filters).order_by(Agreement.created_at.desc(), Agreement.id.desc())
+        result = await self.db.stream(query.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield partition
+
+    async def search(self, fragment: str, limit: int) -> Sequence[Row]:
+        """Flat rows whose code, supplier name or type name contains or resembles `fragment`, best first."""
+        ranked = _SEARCH.bindparams(
+            q=fragment, pattern=_like_pattern(fragment), limit=limit, names_limit=_SEARCH_NAMES_LIMIT
+        ).subquery("ranked")
+        query = (
+            flat_select()
+            .join(ranked, ranked.c.id == Agreement.id)
+            .order_by(ranked.c.score.desc(), ranked.c.created_at.desc(), Agreement.id)
+        )
+        result = await self.db.execute(query)
+        return result.all()
+
+    async def find_overlapping(
+        self,
+        supplier_code: str,
+        agreement_type_code: str,
+        scale_code: str,
+        valid_from: date,
+        valid_to: date,
+        exclude_id: uuid.UUID | None = None,
+    ) -> list[str]:
+        """Codes of live agreements with the same supplier, type and scale whose validity overlaps.
+
+        Takes a transaction-level advisory lock on the (supplier, type, scale) key first, so two
+        concurrent checks for the same key cannot both pass before either commits.
+        """
+        key = f"agreement-overlap:{supplier_code}:{agreement_type_code}:{scale_code}"
+        await self.db.execute(select(func.pg_advisory_xact_lock(func.hashtext(key))))
+        query = select(Agreement.code).where(
+            Agreement.supplier_code == supplier_code,
+            Agreement.validity.overlaps(period_range(valid_from, valid_to)),
+            Agreement.agreement_type_code == agreement_type_code,
+            Agreement.scale_code == scale_code,
+            Agreement.status != AgreementStatus.DELETED,
         )
+        if exclude_id is not None:
+            query = query.where(Agreement.id != exclude_id)
+        result = await self.db.execute(query.order_by(Agreement.code))
         return list(result.scalars().all())
 
     async def get_by_id(self, agreement_id: uuid.UUID) -> Agreement | None:
@@ -28,7 +220,83 @@ class AgreementRepository:
         )
         return result.scalars().first()
 
-    async def update(self, agreement: Agreement) -> Agreement:
-        await self.db.flush()
-        await self.db.refresh(agreement)
-        return agreement
+    async def update_flat(
+        self,
+        agreement_id: uuid.UUID,
+        version: int,
+        values: dict,
+        live_only: bool = False,
+        sources: Sequence[AgreementStatus] | None = None,
+    ) -> Row | None:
+        """Apply `values` if the row is still at `version`; one statement returning the flat projection.
+
+        The reference tables are joined on the codes being written, so RETURNING carries the new
+        names. None when the row is missing, at another version, (with `live_only`) deleted or
+        (with `sources`) in a status not listed.
+        """
+        # Core statement on the table: an ORM-enabled UPDATE would drop the joined RETURNING columns
+        query = (
+            update(Agreement.__table__)
+            .where(
+                Agreement.id == agreement_id,
+                Agreement.version == version,
+                RefSupplier.code == values.get("supplier_code", Agreement.supplier_code),
+                RefAgreementType.code == values.get("agreement_type_code", Agreement.agreement_type_code),
+                RefScale.code == values.get("scale_code", Agreement.scale_code),
+            )
+            .values(**values, version=Agreement.version + 1)
+            .returning(*FLAT_COLUMNS)
+        )
+        if live_only:
+            query = query.where(Agreement.status != AgreementStatus.DELETED)
+        if sources is not None:
+            query = query.where(Agreement.status.in_(sources))
+        return (await self.db.execute(query)).first()
+
+    async def transition_status(
+        self,
+        status: AgreementStatus,
+        sources: Sequence[AgreementStatus],
+        ids: Sequence[uuid.UUID] | None = None,
+        filters: AgreementFilter | None = None,
+    ) -> Sequence[Row]:
+        """Move the selected agreements whose status is one of `sources` to `status`, in one statement.
+
+        Selected rows are locked (in id order) and read again under the lock, so the source check
+        sees committed concurrent changes. Returns (status, matched, updated) per status before the
+        transition; rows in other statuses are counted as matched but left untouched.
+        """
+        if ids is not None:
+            # One array parameter instead of one bind per id
+            selected = select(Agreement.id, Agreement.status).where(
+                Agreement.id == any_(bindparam("ids", list(ids), type_=ARRAY(Uuid)))
+            )
+        else:
+            selected = apply_filter(select(Agreement.id, Agreement.status), filters)
+        matched = selected.order_by(Agreement.id).with_for_update().cte("matched")
+        table = Agreement.__table__
+        updated = (
+            update(table)
+            .where(table.c.id == matched.c.id, matched.c.status.in_(sources))
+            .values(status=status, version=table.c.version + 1)
+            .returning(table.c.id)
+            .cte("updated")
+        )
+        query = (
+            select(
+                matched.c.status,
+                func.count().label("matched"),
+                func.count(updated.c.id).label("updated"),
+            )
+            .select_from(matched.outerjoin(updated, updated.c.id == matched.c.id))
+            .group_by(matched.c.status)
+            .order_by(matched.c.status)
+        )
+        return (await self.db.execute(query)).all()
+
+    async def get_state(self, agreement_id: uuid.UUID) -> Row | None:
+        """Status and version only, to explain why a conditional update matched nothing."""
+        result = await self.db.execute(
+            select(Agreement.status, Agreement.version).where(Agreement.id == agreement_id)
+        )
+        return result.first()
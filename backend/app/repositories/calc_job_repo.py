@@ -0,0 +1,133 @@
+import uuid
+from collections.abc import Sequence
+from datetime import timedelta
+
+from sqlalchemy import and_, case, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.enums import CalcJobStatus
+from app.models.calculation import CalcJob
+
+
+def _utcnow():
+    # Database clock, so leases compare correctly across worker hosts
+    return func.timezone("UTC", func.now())
+
+
+class CalcJobRepository:
+    """Postgres-backed queue of calculation chunks, claimed with `FOR UPDATE SKIP LOCKED`."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def add_jobs(
+        self,
+        run_id: uuid.UUID,
+        boundaries: Sequence[uuid.UUID],
+        total: int,
+        chunk_size: int,
+    ) -> None:
+        """One job per planned chunk; `boundaries` are the last ids of consecutive chunks."""
+        rows = []
+        after_id = None
+        for i, until_id in enumerate(boundaries):
+            last = i == len(boundaries) - 1
+            rows.append({
+                "calc_run_id": run_id,
+                "after_id": after_id,
+                "until_id": None if last else until_id,
+                "agreements": total - chunk_size * i if last else chunk_size,
+            })
+            after_id = until_id
+        if rows:
+            await self.db.execute(insert(CalcJob), rows)
+
+    async def claim(self, worker_id: str, lease_seconds: int, run_id: uuid.UUID | None = None) -> CalcJob | None:
+        """Take the oldest pending job, or one whose lease has expired, and lease it to the worker.
+
+        With `run_id`, only jobs of that run are considered.
+        """
+        claimable = (
+            select(CalcJob.id)
+            .where(or_(
+                CalcJob.status == CalcJobStatus.PENDING,
+                and_(CalcJob.status == CalcJobStatus.RUNNING, CalcJob.lease_expires_at < _utcnow()),
+            ))
+            .order_by(CalcJob.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        if run_id is not None:
+            claimable = claimable.where(CalcJob.calc_run_id == run_id)
+        result = await self.db.execute(
+            update(CalcJob)
+            .where(CalcJob.id == claimable.scalar_subquery())
+            .values(
+                status=CalcJobStatus.RUNNING,
+                locked_by=worker_id,
+                lease_expires_at=_utcnow() + timedelta(seconds=lease_seconds),
+                attempts=CalcJob.attempts + 1,
+                started_at=_utcnow(),
+            )
+            .returning(CalcJob)
+        )
+        return result.scalar_one_or_none()
+
+    async def renew_lease(self, job_id: int, worker_id: str, lease_seconds: int) -> bool:
+        """Extend a held lease; False when the job was reclaimed by another worker."""
+        result = await self.db.execute(
+            update(CalcJob)
+            .where(CalcJob.id == job_id, CalcJob.locked_by == worker_id, CalcJob.status == CalcJobStatus.RUNNING)
+            .values(lease_expires_at=_utcnow() + timedelta(seconds=lease_seconds))
+            .returning(CalcJob.id)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def complete(self, job_id: int, worker_id: str) -> bool:
+        """Mark a job done if the worker still holds it."""
+        result = await self.db.execute(
+            update(CalcJob)
+            .where(CalcJob.id == job_id, CalcJob.locked_by == worker_id, CalcJob.status == CalcJobStatus.RUNNING)
+            .values(status=CalcJobStatus.DONE, lease_expires_at=None, finished_at=_utcnow(), error_message=None)
+            .returning(CalcJob.id)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def release(self, job_id: int, worker_id: str, error_message: str, failed: bool) -> bool:
+        """Give a held job back after an error: pending again for a retry, or failed for good."""
+        result = await self.db.execute(
+            update(CalcJob)
+            .where(CalcJob.id == job_id, CalcJob.locked_by == worker_id, CalcJob.status == CalcJobStatus.RUNNING)
+            .values(
+                status=CalcJobStatus.FAILED if failed else CalcJobStatus.PENDING,
+                lease_expires_at=None,
+                finished_at=_utcnow() if failed else None,
+                error_message=error_message,
+            )
+            .returning(CalcJob.id)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def fail_unfinished(self, run_id: uuid.UUID) -> None:
+        await self.db.execute(
+            update(CalcJob)
+            .where(CalcJob.calc_run_id == run_id, CalcJob.status.in_([CalcJobStatus.PENDING, CalcJobStatus.RUNNING]))
+            .values(status=CalcJobStatus.FAILED, lease_expires_at=None, finished_at=_utcnow())
+        )
+
+    async def count_unfinished(self, run_id: uuid.UUID) -> int:
+        result = await self.db.execute(
+            select(func.count()).where(CalcJob.calc_run_id == run_id, CalcJob.status != CalcJobStatus.DONE)
+        )
+        return result.scalar_one()
+
+    async def get_counts(self, run_id: uuid.UUID) -> tuple[int, int]:
+        """(total jobs, done jobs) of a run."""
+        result = await self.db.execute(
+            select(
+                func.count(),
+                func.count(case((CalcJob.status == CalcJobStatus.DONE, 1))),
+            ).where(CalcJob.calc_run_id == run_id)
+        )
+        total, done = result.one()
+        return total, done
@@ -0,0 +1,213 @@
+import uuid
+from collections.abc import Sequence
+from datetime import date
+
+from sqlalchemy import delete, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.calculation.base import AgreementInput
+from app.domain.enums import AgreementStatus, CalcRunStatus
+from app.models.agreement import Agreement
+from app.models.calculation import CalcBatchCheckpoint, CalcResult, CalcRun
+from app.repositories.agreement_repo import period_range
+
+# Keeps multi-row statements well under asyncpg's 32767 bind parameter limit
+_RESULT_BATCH_SIZE = 2000
+_COPIED_COLUMNS = (
+    "agreement_id",
+    "base_amount",
+    "bonus_amount",
+    "agreement_updated_at",
+    "scale_code",
+    "condition_value",
+    "input_version",
+    "fingerprint",
+)
+
+_INPUT_COLUMNS = (
+    Agreement.id,
+    Agreement.supplier_code,
+    Agreement.agreement_type_code,
+    Agreement.scale_code,
+    Agreement.condition_value,
+    Agreement.valid_from,
+    Agreement.valid_to,
+    Agreement.updated_at,
+)
+
+
+class CalculationRepository:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get_inputs_by_ids(self, agreement_ids: Sequence[uuid.UUID]) -> list[AgreementInput]:
+        result = await self.db.execute(select(*_INPUT_COLUMNS).where(Agreement.id.in_(agreement_ids)))
+        return [AgreementInput(*row) for row in result.all()]
+
+    @staticmethod
+    def _batch_conditions(
+        period_from: date,
+        period_to: date,
+        statuses: Sequence[AgreementStatus],
+        supplier_codes: Sequence[str] | None,
+        agreement_type_codes: Sequence[str] | None,
+    ) -> list:
+        """Agreements of a batch run: matching the filter and valid at any point of the period."""
+        conditions = [
+            Agreement.status.in_(statuses),
+            Agreement.validity.overlaps(period_range(period_from, period_to)),
+        ]
+        if supplier_codes is not None:
+            conditions.append(Agreement.supplier_code.in_(supplier_codes))
+        if agreement_type_codes is not None:
+            conditions.append(Agreement.agreement_type_code.in_(agreement_type_codes))
+        return conditions
+
+    async def get_batch_inputs(
+        self,
+        period_from: date,
+        period_to: date,
+        statuses: Sequence[AgreementStatus],
+        supplier_codes: Sequence[str] | None,
+        agreement_type_codes: Sequence[str] | None,
+        after_id: uuid.UUID | None,
+        limit: int | None,
+        until_id: uuid.UUID | None = None,
+    ) -> list[AgreementInput]:
+        """Next keyset page (ordered by id), optionally bounded by `until_id` inclusive."""
+        query = (
+            select(*_INPUT_COLUMNS)
+            .where(*self._batch_conditions(period_from, period_to, statuses, supplier_codes, agreement_type_codes))
+            .order_by(Agreement.id)
+            .limit(limit)
+        )
+        if after_id is not None:
+            query = query.where(Agreement.id > after_id)
+        if until_id is not None:
+            query = query.where(Agreement.id <= until_id)
+
+        result = await self.db.execute(query)
+        return [AgreementInput(*row) for row in result.all()]
+
+    async def plan_chunks(
+        self,
+        period_from: date,
+        period_to: date,
+        statuses: Sequence[AgreementStatus],
+        supplier_codes: Sequence[str] | None,
+        agreement_type_codes: Sequence[str] | None,
+        chunk_size: int,
+    ) -> tuple[int, list[uuid.UUID]]:
+        """Total matching agreements and the last id of every `chunk_size` block, in one scan."""
+        numbered = (
+            select(
+                Agreement.id,
+                func.row_number().over(order_by=Agreement.id).label("rn"),
+                func.count().over().label("total"),
+            )
+            .where(*self._batch_conditions(period_from, period_to, statuses, supplier_codes, agreement_type_codes))
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(numbered.c.id, numbered.c.total)
+            .where((numbered.c.rn % chunk_size == 0) | (numbered.c.rn == numbered.c.total))
+            .order_by(numbered.c.id)
+        )
+        rows = result.all()
+        return (rows[0].total if rows else 0), [row.id for row in rows]
+
+    async def get_checkpoint(self, run_key: str) -> CalcBatchCheckpoint | None:
+        return await self.db.get(CalcBatchCheckpoint, run_key)
+
+    async def save_checkpoint(
+        self, run_key: str, run_id: uuid.UUID, last_agreement_id: uuid.UUID | None, processed: int
+    ) -> None:
+        stmt = insert(CalcBatchCheckpoint).values(
+            run_key=run_key, calc_run_id=run_id, last_agreement_id=last_agreement_id, processed=processed
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CalcBatchCheckpoint.run_key],
+            set_={
+                "calc_run_id": stmt.excluded.calc_run_id,
+                "last_agreement_id": stmt.excluded.last_agreement_id,
+                "processed": stmt.excluded.processed,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await self.db.execute(stmt)
+
+    async def delete_checkpoint(self, run_key: str) -> None:
+        await self.db.execute(delete(CalcBatchCheckpoint).where(CalcBatchCheckpoint.run_key == run_key))
+
+    async def create_run(self, run: CalcRun) -> CalcRun:
+        self.db.add(run)
+        await self.db.flush()
+        return run
+
+    async def get_run(self, run_id: uuid.UUID) -> CalcRun | None:
+        return await self.db.get(CalcRun, run_id)
+
+    async def mark_run_started(self, run_id: uuid.UUID) -> None:
+        await self.db.execute(
+            update(CalcRun)
+            .where(CalcRun.id == run_id, CalcRun.status == CalcRunStatus.PENDING)
+            .values(status=CalcRunStatus.RUNNING, started_at=func.timezone("UTC", func.now()))
+        )
+
+    async def add_run_counts(self, run_id: uuid.UUID, calculated: int, copied: int, skipped: int) -> None:
+        """Atomic increments; the row lock also serialises workers finishing chunks of one run."""
+        await self.db.execute(
+            update(CalcRun)
+            .where(CalcRun.id == run_id)
+            .values(
+                calculated=CalcRun.calculated + calculated,
+                copied=CalcRun.copied + copied,
+                skipped=CalcRun.skipped + skipped,
+            )
+        )
+
+    async def finish_run(self, run_id: uuid.UUID, status: CalcRunStatus, error_message: str | None = None) -> None:
+        await self.db.execute(
+            update(CalcRun)
+            .where(CalcRun.id == run_id)
+            .values(status=status, completed_at=func.timezone("UTC", func.now()), error_message=error_message)
+        )
+
+    async def get_latest_completed_run(self, run_key: str) -> CalcRun | None:
+        result = await self.db.execute(
+            select(CalcRun)
+            .where(CalcRun.run_key == run_key, CalcRun.status == CalcRunStatus.COMPLETED)
+            .order_by(CalcRun.completed_at.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_result_fingerprints(
+        self, run_id: uuid.UUID, agreement_ids: Sequence[uuid.UUID]
+    ) -> dict[uuid.UUID, str]:
+        result = await self.db.execute(
+            select(CalcResult.agreement_id, CalcResult.fingerprint).where(
+                CalcResult.calc_run_id == run_id, CalcResult.agreement_id.in_(agreement_ids)
+            )
+        )
+        return dict(result.all())
+
+    async def insert_results(self, rows: Sequence[dict]) -> None:
+        for i in range(0, len(rows), _RESULT_BATCH_SIZE):
+            await self.db.execute(insert(CalcResult).values(rows[i:i + _RESULT_BATCH_SIZE]))
+
+    async def copy_results(
+        self, from_run_id: uuid.UUID, to_run_id: uuid.UUID, agreement_ids: Sequence[uuid.UUID]
+    ) -> None:
+        """Carry stored results forward into another run without reading them into Python."""
+        if not agreement_ids:
+            return
+        source = select(
+            literal(to_run_id, CalcResult.calc_run_id.type),
+            *(getattr(CalcResult, c) for c in _COPIED_COLUMNS),
+            func.now(),
+        ).where(CalcResult.calc_run_id == from_run_id, CalcResult.agreement_id.in_(agreement_ids))
+        await self.db.execute(
+            insert(CalcResult).from_select(["calc_run_id", *_COPIED_COLUMNS, "created_at"], source)
+        )
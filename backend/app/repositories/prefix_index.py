@@ -0,0 +1,61 @@
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize(text: str) -> str:
+    """Case-folded, ё→е, punctuation collapsed to single spaces: `ООО "Ёлка-2"` → `ооо елка 2`."""
+    folded = unicodedata.normalize("NFKC", text).casefold().replace("ё", "е")
+    return _NON_WORD.sub(" ", folded).strip()
+
+
+class PrefixIndex:
+    """Prefix lookups over the `code` and `name` of reference rows, in memory.
+
+    Keys are kept in sorted lists next to compact arrays of row positions, and a lookup is a
+    bisect followed by a walk over the matching run that stops after `limit` distinct rows.
+    Matches are ranked by tier: code prefix, then name prefix, then the prefix of any later word
+    of the name (so "ромашка" finds `ООО "Ромашка"`). Within a tier they come in key order.
+    """
+
+    def __init__(self, rows: Sequence) -> None:
+        self.rows = rows
+        codes: list[tuple[str, int]] = []
+        names: list[tuple[str, int]] = []
+        inner: list[tuple[str, int]] = []
+        for position, row in enumerate(rows):
+            codes.append((normalize(row.code), position))
+            name = normalize(row.name)
+            names.append((name, position))
+            # Every tail of the name starting at a word boundary, for multi-word fragments
+            for match in re.finditer(" ", name):
+                inner.append((name[match.end():], position))
+        self._tiers = [self._compile(codes), self._compile(names), self._compile(inner)]
+
+    @staticmethod
+    def _compile(pairs: list[tuple[str, int]]) -> tuple[list[str], array]:
+        pairs.sort()
+        return [key for key, _ in pairs], array("I", (position for _, position in pairs))
+
+    def search(self, query: str, limit: int) -> list:
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        found: list = []
+        seen: set[int] = set()
+        for keys, positions in self._tiers:
+            for i in range(bisect_left(keys, prefix), len(keys)):
+                if not keys[i].startswith(prefix):
+                    break
+                position = positions[i]
+                if position in seen:
+                    continue
+                seen.add(position)
+                found.append(self.rows[position])
+                if len(found) >= limit:
+                    return found
+        return found
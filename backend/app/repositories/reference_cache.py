@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from app.core.config import settings
+from app.core.metrics import Counter
+from app.models.reference import RefAgreementType, RefScale, RefSupplier
+from app.repositories.prefix_index import PrefixIndex
+
+if TYPE_CHECKING:
+    from app.repositories.reference_repo import ReferenceRepository
+
+logger = logging.getLogger(__name__)
+
+RefModel = type[RefSupplier] | type[RefAgreementType] | type[RefScale]
+
+cache_requests = Counter(
+    "reference_cache_requests",
+    "Reference cache lookups by outcome: hit (no query), revalidated (version query), miss (table reload)",
+    ("table", "result"),
+)
+
+
+@dataclass
+class CachedTable:
+    version: int
+    checked_at: float
+    # None when the table is above the size bound and must be queried directly
+    rows: list | None = field(default=None, repr=False)
+    by_code: dict = field(default_factory=dict, repr=False)
+    # Built on first search; a reload replaces the entry and with it the index
+    prefix_index: PrefixIndex | None = field(default=None, repr=False)
+
+
+class ReferenceCache:
+    """Per-process copy of the reference tables, invalidated through `table_versions`.
+
+    Within the TTL a table is served from memory without touching the database. After that a
+    single version lookup decides whether the cached rows are still current or must be reloaded.
+    Tables larger than `max_rows` are not kept; callers fall back to querying them directly.
+    """
+
+    def __init__(self, ttl_seconds: float, max_rows: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self._tables: dict[str, CachedTable] = {}
+        self._lock = asyncio.Lock()
+
+    async def get(self, repo: "ReferenceRepository", model: RefModel) -> CachedTable:
+        table = model.__tablename__
+        entry = self._tables.get(table)
+        if entry is not None and time.monotonic() - entry.checked_at < self.ttl_seconds:
+            cache_requests.inc(table=table, result="hit")
+            return entry
+
+        async with self._lock:
+            entry = self._tables.get(table)
+            now = time.monotonic()
+            if entry is not None and now - entry.checked_at < self.ttl_seconds:
+                cache_requests.inc(table=table, result="hit")
+                return entry
+
+            version = await repo.get_table_version(table)
+            if entry is not None and entry.version == version:
+                entry.checked_at = now
+                cache_requests.inc(table=table, result="revalidated")
+                return entry
+
+            cache_requests.inc(table=table, result="miss")
+            rows = await repo.load_table(model)
+            if len(rows) > self.max_rows:
+                logger.warning("%s has %d rows, above REF_CACHE_MAX_ROWS; not cached", table, len(rows))
+                entry = CachedTable(version=version, checked_at=now)
+            else:
+                entry = CachedTable(version=version, checked_at=now, rows=rows, by_code={r.code: r for r in rows})
+            self._tables[table] = entry
+            return entry
+
+    def invalidate(self, model: RefModel | None = None) -> None:
+        if model is None:
+            self._tables.clear()
+        else:
+            self._tables.pop(model.__tablename__, None)
+
+
+reference_cache = ReferenceCache(
+    ttl_seconds=settings.REF_CACHE_TTL_SECONDS,
+    max_rows=settings.REF_CACHE_MAX_ROWS,
+)
@@ -1,30 +1,116 @@
-from sqlalchemy import select
+import re
+from collections.abc import Sequence
+from decimal import Decimal
+
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.reference import RefSupplier, RefAgreementType, RefScale
+from app.models.reference import RefSupplier, RefAgreementType, RefScale, RefScaleTier
+from app.models.table_version import TableVersion
+from app.repositories.prefix_index import PrefixIndex
+from app.repositories.reference_cache import RefModel, reference_cache
+
+# A name word starts at the beginning or after any non-alphanumeric character, as in `normalize`
+_WORD_START = "(^|[^[:alnum:]])"
 
 
 class ReferenceRepository:
+    """Reference data reads, served from the per-process `reference_cache` when possible."""
+
     def __init__(self, db: AsyncSession) -> None:
         self.db = db
 
-    async def get_all_suppliers(self) -> list[RefSupplier]:
-        result = await self.db.execute(select(RefSupplier).order_by(RefSupplier.code))
+    async def get_table_version(self, table_name: str) -> int:
+        result = await self.db.execute(
+            select(TableVersion.version).where(TableVersion.table_name == table_name)
+        )
+        return result.scalar_one_or_none() or 0
+
+    async def get_table_versions(self, table_names: Sequence[str]) -> dict[str, int]:
+        """Versions of several tables in one query; sharded counters (`<table>#<n>`) are summed."""
+        result = await self.db.execute(
+            select(TableVersion.table_name, TableVersion.version)
+            .where(func.split_part(TableVersion.table_name, "#", 1).in_(table_names))
+        )
+        versions = dict.fromkeys(table_names, 0)
+        for name, version in result.tuples():
+            versions[name.partition("#")[0]] += version
+        return versions
+
+    async def get_cached_version(self, model: RefModel) -> int:
+        """Version of the table as currently held by the reference cache (no query within its TTL)."""
+        return (await reference_cache.get(self, model)).version
+
+    async def load_table(self, model: RefModel) -> list:
+        """All rows ordered by code, detached from the session so they can be shared."""
+        result = await self.db.execute(select(model).order_by(model.code))
+        rows = list(result.scalars().all())
+        for row in rows:
+            self.db.expunge(row)
+        return rows
+
+    async def _get_all(self, model: RefModel) -> list:
+        cached = await reference_cache.get(self, model)
+        if cached.rows is not None:
+            return cached.rows
+        result = await self.db.execute(select(model).order_by(model.code))
         return list(result.scalars().all())
 
+    async def _get_by_code(self, model: RefModel, code: str):
+        cached = await reference_cache.get(self, model)
+        if cached.rows is not None:
+            return cached.by_code.get(code)
+        return await self.db.get(model, code)
+
+    async def get_all_suppliers(self) -> list[RefSupplier]:
+        return await self._get_all(RefSupplier)
+
     async def get_all_agreement_types(self) -> list[RefAgreementType]:
-        result = await self.db.execute(select(RefAgreementType).order_by(RefAgreementType.code))
-        return list(result.scalars().all())
+        return await self._get_all(RefAgreementType)
 
     async def get_all_scales(self) -> list[RefScale]:
-        result = await self.db.execute(select(RefScale).order_by(RefScale.code))
-        return list(result.scalars().all())
+        return await self._get_all(RefScale)
+
+    async def get_supplier_codes(self) -> set[str]:
+        cached = await reference_cache.get(self, RefSupplier)
+        if cached.rows is not None:
+            return set(cached.by_code)
+        result = await self.db.execute(select(RefSupplier.code))
+        return set(result.scalars().all())
+
+    async def search_suppliers(self, query: str, limit: int) -> list[RefSupplier]:
+        """Typeahead over code and name prefixes, answered from the cached table's `PrefixIndex`."""
+        cached = await reference_cache.get(self, RefSupplier)
+        if cached.rows is None:
+            # Above the cache bound: the index's prefix semantics (code, or any word of the name)
+            # as a query, served by the trigram index
+            fragment = query.strip()
+            result = await self.db.execute(
+                select(RefSupplier)
+                .where(or_(RefSupplier.code.istartswith(fragment, autoescape=True),
+                           RefSupplier.name.regexp_match(_WORD_START + re.escape(fragment), flags="i")))
+                .order_by(RefSupplier.code)
+                .limit(limit)
+            )
+            return list(result.scalars().all())
+        if cached.prefix_index is None:
+            cached.prefix_index = PrefixIndex(cached.rows)
+        return cached.prefix_index.search(query, limit)
 
     async def get_supplier_by_code(self, code: str) -> RefSupplier | None:
-        return await self.db.get(RefSupplier, code)
+        return await self._get_by_code(RefSupplier, code)
 
     async def get_agreement_type_by_code(self, code: str) -> RefAgreementType | None:
-        return await self.db.get(RefAgreementType, code)
+        return await self._get_by_code(RefAgreementType, code)
 
     async def get_scale_by_code(self, code: str) -> RefScale | None:
-        return await self.db.get(RefScale, code)
+        return await self._get_by_code(RefScale, code)
+
+    async def get_scale_tiers(self, code: str) -> list[tuple[Decimal, Decimal]]:
+        """(threshold, rate) brackets of a scale, lowest first; cached compiled in `calculation.tiers`."""
+        result = await self.db.execute(
+            select(RefScaleTier.threshold, RefScaleTier.rate)
+            .where(RefScaleTier.scale_code == code)
+            .order_by(RefScaleTier.threshold)
+        )
+        return [tuple(row) for row in result.all()]
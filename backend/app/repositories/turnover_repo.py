@@ -0,0 +1,307 @@
+import uuid
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from typing import NamedTuple
+
+from sqlalchemy import func, insert, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.calculation.periods import month_start, split_period
+from app.domain.enums import TurnoverKind
+from app.domain.exceptions import ValidationError
+from app.models.turnover import TurnoverDaily, TurnoverFact, TurnoverMonthly
+
+# Keeps multi-row statements well under asyncpg's 32767 bind parameter limit
+_ROLLUP_BATCH_SIZE = 5000
+
+
+class TurnoverRecord(NamedTuple):
+    supplier_code: str
+    doc_date: date
+    kind: TurnoverKind
+    amount: Decimal
+
+
+class TurnoverPartition(NamedTuple):
+    parent: str
+    name: str
+    month: date
+
+
+class TurnoverRequest(NamedTuple):
+    """Turnover of one supplier and kind over an inclusive date range, keyed by agreement."""
+
+    agreement_id: uuid.UUID
+    supplier_code: str
+    kind: TurnoverKind
+    date_from: date
+    date_to: date
+
+
+# turnover_daily is partitioned by month. The per-row day ranges prune partitions at run time;
+# the constant :day_min/:day_max span of the whole batch also lets the planner drop every
+# partition outside it up front (visible in EXPLAIN).
+_SUM_FOR_REQUESTS = text("""
+    WITH req AS (
+        SELECT *
+        FROM unnest(
+            CAST(:agreement_ids AS uuid[]),
+            CAST(:supplier_codes AS varchar[]),
+            CAST(:kinds AS varchar[]),
+            CAST(:month_from AS date[]), CAST(:month_to AS date[]),
+            CAST(:head_from AS date[]), CAST(:head_to AS date[]),
+            CAST(:tail_from AS date[]), CAST(:tail_to AS date[])
+        ) AS r(agreement_id, supplier_code, kind, month_from, month_to, head_from, head_to, tail_from, tail_to)
+    )
+    SELECT r.agreement_id,
+        COALESCE((
+            SELECT SUM(m.amount) FROM turnover_monthly m
+            WHERE m.supplier_code = r.supplier_code AND m.kind = CAST(r.kind AS turnover_kind_enum)
+              AND m.month BETWEEN r.month_from AND r.month_to
+        ), 0)
+        + COALESCE((
+            SELECT SUM(d.amount) FROM turnover_daily d
+            WHERE d.supplier_code = r.supplier_code AND d.kind = CAST(r.kind AS turnover_kind_enum)
+              AND d.day BETWEEN r.head_from AND r.head_to
+              AND d.day BETWEEN CAST(:day_min AS date) AND CAST(:day_max AS date)
+        ), 0)
+        + COALESCE((
+            SELECT SUM(d.amount) FROM turnover_daily d
+            WHERE d.supplier_code = r.supplier_code AND d.kind = CAST(r.kind AS turnover_kind_enum)
+              AND d.day BETWEEN r.tail_from AND r.tail_to
+              AND d.day BETWEEN CAST(:day_min AS date) AND CAST(:day_max AS date)
+        ), 0) AS amount
+    FROM req r
+""")
+
+
+# Attached partitions following the <parent>_YYYY_MM naming used by ensure_turnover_partitions()
+_LIST_PARTITIONS = text("""
+    SELECT p.relname, c.relname
+    FROM pg_inherits i
+    JOIN pg_class p ON p.oid = i.inhparent
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE p.relname IN ('turnover_facts', 'turnover_daily')
+      AND c.relname ~ '_[0-9]{4}_[0-9]{2}$'
+    ORDER BY c.relname
+""")
+
+
+_OLDEST_DAILY_PARTITION = text("""
+    SELECT min(c.relname)
+    FROM pg_inherits i
+    JOIN pg_class p ON p.oid = i.inhparent
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE p.relname = 'turnover_daily' AND c.relname ~ '_[0-9]{4}_[0-9]{2}$'
+""")
+
+# First (supplier, kind, month) with a monthly total, i.e. whose daily rows existed before they were detached
+_FIRST_MONTH_WITH_TOTALS = text("""
+    SELECT min(m.month)
+    FROM unnest(
+        CAST(:supplier_codes AS varchar[]), CAST(:kinds AS varchar[]), CAST(:months AS date[])
+    ) AS r(supplier_code, kind, month)
+    JOIN turnover_monthly m
+      ON m.supplier_code = r.supplier_code AND m.kind = CAST(r.kind AS turnover_kind_enum) AND m.month = r.month
+""")
+
+
+def _partition_month(name: str) -> date:
+    return date(int(name[-7:-3]), int(name[-2:]), 1)
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+_STAGING_COLUMNS = ("supplier_code", "doc_date", "kind", "amount")
+
+_CREATE_STAGING = text("""
+    CREATE TEMP TABLE IF NOT EXISTS turnover_staging (
+        supplier_code VARCHAR(20) NOT NULL,
+        doc_date DATE NOT NULL,
+        kind VARCHAR(20) NOT NULL,
+        amount NUMERIC(18, 2) NOT NULL
+    ) ON COMMIT DROP
+""")
+
+_ENSURE_PARTITIONS = text("SELECT ensure_turnover_partitions(CAST(:dates AS date[]))")
+
+_MERGE_STAGING = (
+    # Monthly partitions must exist before rows for their month arrive
+    text("SELECT ensure_turnover_partitions(ARRAY(SELECT DISTINCT doc_date FROM turnover_staging))"),
+    text("""
+        INSERT INTO turnover_facts (supplier_code, doc_date, kind, amount)
+        SELECT supplier_code, doc_date, CAST(kind AS turnover_kind_enum), amount
+        FROM turnover_staging
+    """),
+    text("""
+        INSERT INTO turnover_daily (supplier_code, kind, day, amount)
+        SELECT supplier_code, CAST(kind AS turnover_kind_enum), doc_date, SUM(amount)
+        FROM turnover_staging
+        GROUP BY supplier_code, kind, doc_date
+        ON CONFLICT (supplier_code, kind, day) DO UPDATE
+        SET amount = turnover_daily.amount + EXCLUDED.amount, updated_at = CURRENT_TIMESTAMP
+    """),
+    text("""
+        INSERT INTO turnover_monthly (supplier_code, kind, month, amount)
+        SELECT supplier_code, CAST(kind AS turnover_kind_enum), CAST(date_trunc('month', doc_date) AS date), SUM(amount)
+        FROM turnover_staging
+        GROUP BY supplier_code, kind, date_trunc('month', doc_date)
+        ON CONFLICT (supplier_code, kind, month) DO UPDATE
+        SET amount = turnover_monthly.amount + EXCLUDED.amount, updated_at = CURRENT_TIMESTAMP
+    """),
+    text("TRUNCATE turnover_staging"),
+)
+
+
+class TurnoverRepository:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def add_facts(self, records: Sequence[TurnoverRecord]) -> None:
+        """Insert raw turnover lines and fold them into the daily and monthly rollups."""
+        if not records:
+            return
+        await self.ensure_partitions({r.doc_date for r in records})
+        await self.db.execute(insert(TurnoverFact), [r._asdict() for r in records])
+
+        daily: dict[tuple[str, TurnoverKind, date], Decimal] = defaultdict(Decimal)
+        monthly: dict[tuple[str, TurnoverKind, date], Decimal] = defaultdict(Decimal)
+        for r in records:
+            daily[(r.supplier_code, r.kind, r.doc_date)] += r.amount
+            monthly[(r.supplier_code, r.kind, month_start(r.doc_date))] += r.amount
+
+        await self._upsert_rollup(
+            TurnoverDaily,
+            [{"supplier_code": s, "kind": k, "day": d, "amount": a} for (s, k, d), a in daily.items()],
+        )
+        await self._upsert_rollup(
+            TurnoverMonthly,
+            [{"supplier_code": s, "kind": k, "month": m, "amount": a} for (s, k, m), a in monthly.items()],
+        )
+
+    async def ensure_partitions(self, dates: Iterable[date]) -> int:
+        """Create the missing monthly partitions of `turnover_facts` / `turnover_daily` for these dates' months."""
+        result = await self.db.execute(_ENSURE_PARTITIONS, {"dates": sorted(set(dates))})
+        return result.scalar_one()
+
+    async def list_partitions(self) -> list[TurnoverPartition]:
+        result = await self.db.execute(_LIST_PARTITIONS)
+        return [TurnoverPartition(parent, name, _partition_month(name)) for parent, name in result.all()]
+
+    async def detach_partition(self, partition: TurnoverPartition, schema: str) -> None:
+        """Detach a month from its parent and move it to `schema`, out of every query's reach."""
+        await self.db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {_quote(schema)}"))
+        await self.db.execute(
+            text(f"ALTER TABLE {_quote(partition.parent)} DETACH PARTITION {_quote(partition.name)}")
+        )
+        await self.db.execute(text(f"ALTER TABLE {_quote(partition.name)} SET SCHEMA {_quote(schema)}"))
+
+    async def create_staging(self) -> None:
+        """Create the session's staging table; it is dropped when the transaction commits."""
+        await self.db.execute(_CREATE_STAGING)
+
+    async def copy_to_staging(self, records: Sequence[TurnoverRecord]) -> None:
+        """Load records into the staging table with asyncpg's binary COPY."""
+        connection = await self.db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            "turnover_staging",
+            records=[(r.supplier_code, r.doc_date, r.kind.value, r.amount) for r in records],
+            columns=_STAGING_COLUMNS,
+        )
+
+    async def merge_staging(self) -> None:
+        """Move staged rows into the fact table and rollups, then empty the staging table."""
+        for stmt in _MERGE_STAGING:
+            await self.db.execute(stmt)
+
+    async def _upsert_rollup(self, model: type[TurnoverDaily] | type[TurnoverMonthly], rows: list[dict]) -> None:
+        for i in range(0, len(rows), _ROLLUP_BATCH_SIZE):
+            stmt = pg_insert(model).values(rows[i:i + _ROLLUP_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[c.name for c in model.__table__.primary_key.columns],
+                set_={"amount": model.amount + stmt.excluded.amount, "updated_at": func.now()},
+            )
+            await self.db.execute(stmt)
+
+    async def sum_for_requests(self, requests: Sequence[TurnoverRequest]) -> dict[uuid.UUID, Decimal]:
+        """Total turnover per request in one query, from whole months plus boundary days."""
+        totals = {r.agreement_id: Decimal("0") for r in requests}
+        params: dict[str, list] = defaultdict(list)
+        for r in requests:
+            if r.date_from > r.date_to:
+                continue
+            split = split_period(r.date_from, r.date_to)
+            params["agreement_ids"].append(r.agreement_id)
+            params["supplier_codes"].append(r.supplier_code)
+            params["kinds"].append(r.kind.value)
+            for name, part in (("month", split.months), ("head", split.head), ("tail", split.tail)):
+                params[f"{name}_from"].append(part[0] if part else None)
+                params[f"{name}_to"].append(part[1] if part else None)
+
+        if not params:
+            return totals
+        days = [d for name in ("head_from", "head_to", "tail_from", "tail_to") for d in params[name] if d is not None]
+        params["day_min"] = min(days, default=None)
+        params["day_max"] = max(days, default=None)
+        await self._check_days_attached(params)
+        result = await self.db.execute(_SUM_FOR_REQUESTS, params)
+        for agreement_id, amount in result.all():
+            totals[agreement_id] = amount
+        return totals
+
+    async def _check_days_attached(self, params: dict[str, list]) -> None:
+        """Refuse boundary days whose `turnover_daily` month was detached while its monthly total remains.
+
+        Summing them would silently count zero for the partial month. Months before the oldest attached
+        partition without turnover of the request's supplier and kind are fine; one catalog lookup when
+        no day precedes it.
+        """
+        oldest = (await self.db.execute(_OLDEST_DAILY_PARTITION)).scalar_one()
+        oldest_month = _partition_month(oldest) if oldest is not None else None
+        early = sorted({
+            (supplier_code, kind, month_start(day))
+            for i, (supplier_code, kind) in enumerate(zip(params["supplier_codes"], params["kinds"]))
+            for day in (params["head_from"][i], params["tail_from"][i])
+            if day is not None and (oldest_month is None or day < oldest_month)
+        })
+        if not early:
+            return
+        supplier_codes, kinds, months = (list(column) for column in zip(*early))
+        result = await self.db.execute(
+            _FIRST_MONTH_WITH_TOTALS, {"supplier_codes": supplier_codes, "kinds": kinds, "months": months}
+        )
+        month = result.scalar_one()
+        if month is not None:
+            raise ValidationError(
+                f"Daily turnover for {month:%Y-%m} is detached; periods cannot start or end in that month"
+            )
+
+    async def get_watermarks(
+        self,
+        keys: Sequence[tuple[str, TurnoverKind]],
+        period_from: date,
+        period_to: date,
+    ) -> dict[tuple[str, TurnoverKind], datetime]:
+        """Latest rollup change per (supplier_code, kind) within the months touching the period.
+
+        Any ingested line, including a one-day correction, bumps its month's `updated_at`, so a
+        key whose watermark is unchanged has the same turnover for every range inside the period.
+        Keys without turnover are absent.
+        """
+        if not keys:
+            return {}
+        result = await self.db.execute(
+            select(TurnoverMonthly.supplier_code, TurnoverMonthly.kind, func.max(TurnoverMonthly.updated_at))
+            .where(
+                tuple_(TurnoverMonthly.supplier_code, TurnoverMonthly.kind).in_(keys),
+                TurnoverMonthly.month.between(month_start(period_from), month_start(period_to)),
+            )
+            .group_by(TurnoverMonthly.supplier_code, TurnoverMonthly.kind)
+        )
+        return {(supplier_code, kind): updated_at for supplier_code, kind, updated_at in result.all()}
@@ -12,6 +12,14 @@ class UserRepository:
         result = await self.db.execute(select(User).where(User.username == username))
         return result.scalars().first()
 
+    async def set_active(self, username: str, is_active: bool) -> User | None:
+        user = await self.get_by_username(username)
+        if user is None:
+            return None
+        user.is_active = is_active
+        await self.db.flush()
+        return user
+
     async def create(self, user: User) -> User:
         self.db.add(user)
         await self.db.flush()
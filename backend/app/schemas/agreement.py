@@ -2,9 +2,12 @@ import uuid
 from datetime import date, datetime
 from decimal import Decimal
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator, model_validator
+from typing_extensions import TypedDict
 
-from app.domain.enums import AgreementStatus
+from app.core.config import settings
+from app.domain.enums import AgreementStatus, GridType
+from app.schemas.common import RowError
 
 
 class AgreementBase(BaseModel):
@@ -13,7 +16,9 @@ class AgreementBase(BaseModel):
     supplier_code: str = Field(..., min_length=1)
     agreement_type_code: str = Field(..., min_length=1)
     scale_code: str = Field(..., min_length=1)
-    condition_value: Decimal = Field(..., gt=0)
+    condition_value: Decimal = Field(
+        ..., gt=0, description="Percent or fixed sum; ignored for bracketed scales (04, 05), which use their brackets"
+    )
 
     @field_validator("valid_to")
     @classmethod
@@ -29,11 +34,80 @@ class AgreementCreate(AgreementBase):
 
 
 class AgreementUpdate(AgreementBase):
-    pass
+    # The version the client read; the update is rejected with 409 if the row has moved on since
+    version: int = Field(..., ge=1)
+
+
+class AgreementBulkCreated(BaseModel):
+    line: int
+    id: uuid.UUID
+    code: str
+
+
+class AgreementBulkResult(BaseModel):
+    created: int
+    failed: int
+    items: list[AgreementBulkCreated]
+    errors: list[RowError]
 
 
 class AgreementStatusUpdate(BaseModel):
     status: AgreementStatus
+    version: int = Field(..., ge=1)
+
+
+class AgreementFilter(BaseModel):
+    status: list[AgreementStatus] | None = None
+    supplier_code: list[str] | None = None
+    agreement_type_code: list[str] | None = None
+    scale_code: list[str] | None = None
+    valid_from: date | None = None
+    valid_to: date | None = None
+    # Valid on at least one day of [active_from, active_to]; either bound may be open
+    active_from: date | None = None
+    active_to: date | None = None
+
+
+class AgreementBulkStatusUpdate(BaseModel):
+    """Target status for the agreements listed in `ids` or matching `filter` (exactly one of them)."""
+
+    status: AgreementStatus
+    ids: list[uuid.UUID] | None = Field(None, min_length=1, max_length=settings.AGREEMENTS_BULK_STATUS_MAX_IDS)
+    filter: AgreementFilter | None = None
+
+    @model_validator(mode="after")
+    def validate_selection(self) -> "AgreementBulkStatusUpdate":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Pass exactly one of ids or filter")
+        if self.filter is not None:
+            criteria = self.filter.model_dump(exclude_none=True)
+            # An empty list would be skipped by apply_filter and match every agreement
+            empty = sorted(name for name, value in criteria.items() if value == [])
+            if empty:
+                raise ValueError(f"filter lists must not be empty: {', '.join(empty)}")
+            if not criteria:
+                raise ValueError("filter must have at least one criterion")
+            active_from, active_to = self.filter.active_from, self.filter.active_to
+            if active_from is not None and active_to is not None and active_to < active_from:
+                raise ValueError("active_to must be >= active_from")
+        return self
+
+
+class AgreementStatusCount(BaseModel):
+    status: AgreementStatus  # before the transition
+    matched: int
+    updated: int
+
+
+class AgreementBulkStatusResult(BaseModel):
+    status: AgreementStatus
+    matched: int
+    updated: int
+    # Matched but not allowed to move to `status` (or already there)
+    skipped: int
+    # Requested ids that do not exist
+    not_found: int
+    by_status: list[AgreementStatusCount]
 
 
 class AgreementResponse(BaseModel):
@@ -52,6 +126,7 @@ class AgreementResponse(BaseModel):
     scale_grid: str
     condition_value: Decimal
     status: AgreementStatus
+    version: int
     created_at: datetime
     updated_at: datetime
 
@@ -66,3 +141,29 @@ class AgreementResponse(BaseModel):
             data.scale_name = data.scale.name
             data.scale_grid = data.scale.grid.value
         return data
+
+
+class AgreementRow(TypedDict):
+    """AgreementResponse fields as read by the flat projection (`agreement_repo.FLAT_COLUMNS`)."""
+
+    id: uuid.UUID
+    code: str
+    valid_from: date
+    valid_to: date
+    supplier_code: str
+    supplier_name: str
+    agreement_type_code: str
+    agreement_type_name: str
+    scale_code: str
+    scale_name: str
+    scale_grid: GridType
+    condition_value: Decimal
+    status: AgreementStatus
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+
+# Built once; dump_json serializes trusted database rows in Rust without per-row validation
+agreement_rows_adapter = TypeAdapter(list[AgreementRow])
+agreement_row_adapter = TypeAdapter(AgreementRow)
@@ -0,0 +1,58 @@
+import uuid
+from datetime import date, datetime
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.domain.enums import AgreementStatus, CalcRunStatus
+
+
+class CalcRunCreate(BaseModel):
+    period_from: date
+    period_to: date
+    statuses: list[AgreementStatus] = Field(
+        default_factory=lambda: [AgreementStatus.READY_FOR_CALCULATION], min_length=1
+    )
+    supplier_codes: list[str] | None = None
+    agreement_type_codes: list[str] | None = None
+    # Reuse results of the latest completed run with the same period and filter
+    incremental: bool = True
+
+    @field_validator("period_to")
+    @classmethod
+    def validate_period(cls, v: date, info) -> date:
+        period_from = info.data.get("period_from")
+        if period_from and v < period_from:
+            raise ValueError("period_to must be >= period_from")
+        return v
+
+
+class CalcRunResponse(BaseModel):
+    model_config = {"from_attributes": True}
+
+    id: uuid.UUID
+    period_from: date
+    period_to: date
+    filter: dict
+    incremental: bool
+    base_run_id: uuid.UUID | None
+    status: CalcRunStatus
+    total: int
+    calculated: int
+    copied: int
+    skipped: int
+    started_at: datetime | None
+    completed_at: datetime | None
+    error_message: str | None
+    created_at: datetime
+
+
+class CalcRunProgress(BaseModel):
+    run_id: uuid.UUID
+    status: CalcRunStatus
+    done: int
+    total: int
+    jobs_done: int
+    jobs_total: int
+    elapsed_seconds: float
+    agreements_per_second: float
+    eta_seconds: float | None
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class RowError(BaseModel):
+    """Problem with one input row; `line` is the 1-based line or array position."""
+
+    line: int
+    message: str
@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 
+from app.domain.enums import TierMode
+
 
 class RefSupplierResponse(BaseModel):
     code: str
@@ -19,5 +21,6 @@ class RefScaleResponse(BaseModel):
     code: str
     name: str
     grid: str
+    tier_mode: TierMode | None = None
 
     model_config = {"from_attributes": True}
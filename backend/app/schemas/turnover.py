@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+from app.schemas.common import RowError
+
+
+class TurnoverUploadResult(BaseModel):
+    accepted: int
+    rejected: int
+    errors: list[RowError]
+    elapsed_seconds: float
+    rows_per_second: float
@@ -14,6 +14,10 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 
+class UserActiveUpdate(BaseModel):
+    is_active: bool
+
+
 class UserResponse(BaseModel):
     id: uuid.UUID
     username: str
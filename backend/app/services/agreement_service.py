@@ -1,11 +1,60 @@
+import csv
+import enum
+import io
 import uuid
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+from datetime import date, datetime
 
-from app.domain.enums import AgreementStatus, GridType
-from app.domain.exceptions import NotFoundError, ValidationError, AppError
+from pydantic import ValidationError as SchemaValidationError
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+from app.core.etag import make_etag
+from app.core.pagination import Page, decode_cursor, encode_cursor
+from app.domain.constants import AGREEMENT_STATUS_TRANSITIONS
+from app.domain.enums import AgreementStatus, FileFormat, GridType
+from app.domain.exceptions import ConflictError, NotFoundError, ValidationError, AppError
 from app.models.agreement import Agreement
-from app.repositories.agreement_repo import AgreementRepository
+from app.repositories.agreement_repo import FLAT_COLUMNS, AgreementRepository
 from app.repositories.reference_repo import ReferenceRepository
-from app.schemas.agreement import AgreementCreate, AgreementUpdate
+from app.schemas.agreement import (
+    AgreementBulkCreated,
+    AgreementBulkResult,
+    AgreementBulkStatusResult,
+    AgreementBulkStatusUpdate,
+    AgreementCreate,
+    AgreementFilter,
+    AgreementStatusCount,
+    AgreementUpdate,
+    agreement_row_adapter,
+)
+from app.schemas.common import RowError
+
+EXPORT_FIELDS = [c.key for c in FLAT_COLUMNS]
+# Tables read by list pages (the flat projection joins the reference names)
+LIST_TABLES = ("agreements", "ref_suppliers", "ref_agreement_types", "ref_scales")
+IMPORT_FIELDS = list(AgreementCreate.model_fields)
+
+
+def _export_value(value: object) -> object:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _schema_error_message(e: SchemaValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}" for err in e.errors())
+
+
+def _db_error_message(e: DBAPIError) -> str:
+    return str(e.orig).splitlines()[0] if e.orig is not None else "Database error"
+
+
+def _transition_sources(status: AgreementStatus) -> list[AgreementStatus]:
+    """Statuses an agreement may be moved to `status` from."""
+    return sorted(s for s, targets in AGREEMENT_STATUS_TRANSITIONS.items() if status in targets)
 
 
 class AgreementService:
@@ -36,21 +85,181 @@ class AgreementService:
         if not scale:
             raise ValidationError("Invalid scale_code")
 
-        if scale.grid == GridType.PERCENT and condition_value > 100:
+        # Bracketed scales take their rates from ref_scale_tiers; condition_value is not used
+        if scale.grid == GridType.PERCENT and scale.tier_mode is None and condition_value > 100:
             raise ValidationError("For PERCENT grid, condition_value must be <= 100")
 
-    async def create(self, data: AgreementCreate) -> Agreement:
+    async def _check_overlap(
+        self, data: AgreementCreate | AgreementUpdate, exclude_id: uuid.UUID | None = None
+    ) -> None:
+        codes = await self.agreement_repo.find_overlapping(
+            data.supplier_code, data.agreement_type_code, data.scale_code,
+            data.valid_from, data.valid_to, exclude_id,
+        )
+        if codes:
+            shown = ", ".join(codes[:10]) + (f" and {len(codes) - 10} more" if len(codes) > 10 else "")
+            raise ConflictError(f"Overlaps agreements with the same supplier, type and scale: {shown}")
+
+    async def create(self, data: AgreementCreate, check_overlap: bool = False) -> Agreement:
         await self._validate_refs(
             data.supplier_code, data.agreement_type_code, data.scale_code,
             float(data.condition_value),
         )
+        if check_overlap:
+            await self._check_overlap(data)
         agreement = Agreement(**data.model_dump())
         result = await self.agreement_repo.create(agreement)
         await self.agreement_repo.db.commit()
         return result
 
-    async def get_all(self) -> list[Agreement]:
-        return await self.agreement_repo.get_all()
+    async def bulk_create(self, rows: Sequence[tuple[int, object]], atomic: bool = False) -> AgreementBulkResult:
+        """Validate all rows against reference data loaded once, then insert in multi-row batches.
+
+        `rows` are (line, raw value) pairs. Without `atomic`, valid rows are inserted and invalid
+        ones reported; with `atomic`, any error means nothing is inserted.
+        """
+        supplier_codes = {s.code for s in await self.reference_repo.get_all_suppliers()}
+        type_codes = {t.code for t in await self.reference_repo.get_all_agreement_types()}
+        scales = {s.code: s for s in await self.reference_repo.get_all_scales()}
+
+        errors: list[RowError] = []
+        valid: list[tuple[int, dict]] = []
+        now = datetime.utcnow()
+        for line, raw in rows:
+            try:
+                data = AgreementCreate.model_validate(raw)
+            except SchemaValidationError as e:
+                errors.append(RowError(line=line, message=_schema_error_message(e)))
+                continue
+
+            if data.supplier_code not in supplier_codes:
+                message = "Invalid supplier_code"
+            elif data.agreement_type_code not in type_codes:
+                message = "Invalid agreement_type_code"
+            elif data.scale_code not in scales:
+                message = "Invalid scale_code"
+            elif (
+                scales[data.scale_code].grid == GridType.PERCENT
+                and scales[data.scale_code].tier_mode is None
+                and data.condition_value > 100
+            ):
+                message = "For PERCENT grid, condition_value must be <= 100"
+            else:
+                message = None
+            if message is not None:
+                errors.append(RowError(line=line, message=message))
+                continue
+
+            valid.append((line, {
+                **data.model_dump(),
+                "id": uuid.uuid4(),
+                "status": AgreementStatus.READY_FOR_CALCULATION,
+                "created_at": now,
+                "updated_at": now,
+            }))
+
+        if atomic and errors:
+            return AgreementBulkResult(created=0, failed=len(errors), items=[], errors=errors)
+
+        db = self.agreement_repo.db
+        items: list[AgreementBulkCreated] = []
+        batch_size = settings.AGREEMENTS_BULK_BATCH_SIZE
+        for i in range(0, len(valid), batch_size):
+            batch = valid[i:i + batch_size]
+            try:
+                async with db.begin_nested():
+                    codes = await self.agreement_repo.insert_many([values for _, values in batch])
+            except DBAPIError as e:
+                if atomic:
+                    await db.rollback()
+                    raise ValidationError(f"Bulk insert failed: {_db_error_message(e)}") from None
+                codes = await self._insert_rows_individually(batch, errors)
+            items.extend(
+                AgreementBulkCreated(line=line, id=values["id"], code=codes[values["id"]])
+                for line, values in batch
+                if values["id"] in codes
+            )
+
+        await db.commit()
+        errors.sort(key=lambda e: e.line)
+        return AgreementBulkResult(created=len(items), failed=len(errors), items=items, errors=errors)
+
+    async def _insert_rows_individually(
+        self,
+        batch: list[tuple[int, dict]],
+        errors: list[RowError],
+    ) -> dict[uuid.UUID, str]:
+        """Fallback for a batch the database rejected: one savepoint per row to find the culprits."""
+        codes: dict[uuid.UUID, str] = {}
+        for line, values in batch:
+            try:
+                async with self.agreement_repo.db.begin_nested():
+                    codes.update(await self.agreement_repo.insert_many([values]))
+            except DBAPIError as e:
+                errors.append(RowError(line=line, message=_db_error_message(e)))
+        return codes
+
+    async def bulk_create_csv(self, lines: AsyncIterable[str], atomic: bool = False) -> AgreementBulkResult:
+        rows: list[tuple[int, object]] = []
+        header: list[str] | None = None
+        line_no = 0
+        async for line in lines:
+            line_no += 1
+            if not line.strip():
+                continue
+            values = next(csv.reader([line]))
+            if header is None:
+                header = [c.strip() for c in values]
+                if sorted(header) != sorted(IMPORT_FIELDS):
+                    raise ValidationError(f"CSV header must contain exactly: {', '.join(IMPORT_FIELDS)}")
+                continue
+            rows.append((line_no, dict(zip(header, values)) if len(values) == len(header) else values))
+        return await self.bulk_create(rows, atomic)
+
+    async def get_page(
+        self,
+        filters: AgreementFilter,
+        cursor: str | None,
+        limit: int,
+        include_total: bool = False,
+    ) -> Page[dict]:
+        after = decode_cursor(cursor) if cursor else None
+        # One extra row tells whether another page exists without a count query
+        rows = await self.agreement_repo.get_page(filters, after, limit + 1)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+        items = [row._asdict() for row in rows]
+        total = await self.agreement_repo.count(filters) if include_total else None
+        return Page(items=items, next_cursor=next_cursor, total=total)
+
+    async def search(self, query: str, limit: int) -> list[dict]:
+        fragment = query.strip()
+        if len(fragment) < 3:
+            raise ValidationError("Search needs at least 3 characters")
+        rows = await self.agreement_repo.search(fragment, limit)
+        return [row._asdict() for row in rows]
+
+    async def get_page_etag(self, query: Sequence[tuple[str, str]]) -> str:
+        """Validator of a list page: table versions plus the sorted query parameters, one small query."""
+        versions = await self.reference_repo.get_table_versions(LIST_TABLES)
+        return make_etag("agreements", settings.AGREEMENTS_PAGE_SIZE_DEFAULT, sorted(query), sorted(versions.items()))
+
+    async def iter_export(self, filters: AgreementFilter, fmt: FileFormat) -> AsyncIterator[bytes]:
+        """Encode matching agreements batch by batch; memory is bounded by one batch."""
+        if fmt == FileFormat.CSV:
+            # BOM so that Excel opens the Cyrillic names as UTF-8
+            yield ("\ufeff" + ",".join(EXPORT_FIELDS) + "\r\n").encode()
+
+        batches = self.agreement_repo.stream_flat(filters, settings.AGREEMENTS_EXPORT_BATCH_SIZE)
+        async for rows in batches:
+            if fmt == FileFormat.CSV:
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows([_export_value(v) for v in row] for row in rows)
+                yield buffer.getvalue().encode()
+            else:
+                yield b"".join(agreement_row_adapter.dump_json(row._asdict()) + b"\n" for row in rows)
 
     async def get_by_id(self, agreement_id: uuid.UUID) -> Agreement:
         agreement = await self.agreement_repo.get_by_id(agreement_id)
@@ -58,27 +267,66 @@ class AgreementService:
             raise NotFoundError("Agreement not found")
         return agreement
 
-    async def update(self, agreement_id: uuid.UUID, data: AgreementUpdate) -> Agreement:
-        agreement = await self.get_by_id(agreement_id)
-
-        if agreement.status == AgreementStatus.DELETED:
-            raise AppError("Cannot edit a deleted agreement", status_code=400)
-
+    async def update(self, agreement_id: uuid.UUID, data: AgreementUpdate, check_overlap: bool = False) -> dict:
+        # Reference checks are served by the reference cache; the write itself is one statement
         await self._validate_refs(
             data.supplier_code, data.agreement_type_code, data.scale_code,
             float(data.condition_value),
         )
+        if check_overlap:
+            await self._check_overlap(data, exclude_id=agreement_id)
 
-        for field, value in data.model_dump().items():
-            setattr(agreement, field, value)
+        row = await self.agreement_repo.update_flat(
+            agreement_id, data.version, data.model_dump(exclude={"version"}), live_only=True
+        )
+        if row is None:
+            raise await self._update_failure(agreement_id, data.version)
+        await self.agreement_repo.db.commit()
+        return row._asdict()
 
-        result = await self.agreement_repo.update(agreement)
+    async def update_status(self, agreement_id: uuid.UUID, status: AgreementStatus, version: int) -> dict:
+        """Same transition rules as the bulk endpoint, checked in the UPDATE's WHERE clause."""
+        row = await self.agreement_repo.update_flat(
+            agreement_id, version, {"status": status}, sources=_transition_sources(status)
+        )
+        if row is None:
+            raise await self._update_failure(agreement_id, version, status)
         await self.agreement_repo.db.commit()
-        return result
+        return row._asdict()
 
-    async def update_status(self, agreement_id: uuid.UUID, status: AgreementStatus) -> Agreement:
-        agreement = await self.get_by_id(agreement_id)
-        agreement.status = status
-        result = await self.agreement_repo.update(agreement)
+    async def bulk_update_status(self, data: AgreementBulkStatusUpdate) -> AgreementBulkStatusResult:
+        """One set-based UPDATE for every selected agreement allowed to move to `data.status`."""
+        sources = _transition_sources(data.status)
+        ids = list(dict.fromkeys(data.ids)) if data.ids is not None else None
+        rows = await self.agreement_repo.transition_status(data.status, sources, ids, data.filter)
         await self.agreement_repo.db.commit()
-        return result
+
+        by_status = [AgreementStatusCount(status=r.status, matched=r.matched, updated=r.updated) for r in rows]
+        matched = sum(c.matched for c in by_status)
+        updated = sum(c.updated for c in by_status)
+        return AgreementBulkStatusResult(
+            status=data.status,
+            matched=matched,
+            updated=updated,
+            skipped=matched - updated,
+            not_found=len(ids) - matched if ids is not None else 0,
+            by_status=by_status,
+        )
+
+    async def _update_failure(
+        self, agreement_id: uuid.UUID, version: int, status: AgreementStatus | None = None
+    ) -> AppError:
+        """Why a conditional update (a change to `status`, if given) matched no row; only costs a query on that path."""
+        state = await self.agreement_repo.get_state(agreement_id)
+        if state is None:
+            return NotFoundError("Agreement not found")
+        if state.version != version:
+            return ConflictError(
+                f"Agreement was modified concurrently (version {state.version}, expected {version}); reload and retry"
+            )
+        if status is not None and status not in AGREEMENT_STATUS_TRANSITIONS[state.status]:
+            return ConflictError(f"Cannot change status from {state.status.value} to {status.value}")
+        if state.status == AgreementStatus.DELETED:
+            return AppError("Cannot edit a deleted agreement", status_code=400)
+        # A reference row removed since the cache last loaded it
+        return ValidationError("Invalid reference codes")
@@ -1,8 +1,9 @@
 import logging
 
-from app.core.security import verify_password, hash_password, create_access_token
+from app.core.principal_cache import principal_cache
+from app.core.security import verify_password_async, hash_password_async, create_access_token
 from app.domain.constants import DEFAULT_ADMIN_USERNAME, DEFAULT_ADMIN_EMAIL, DEFAULT_ADMIN_PASSWORD
-from app.domain.exceptions import AppError, ForbiddenError
+from app.domain.exceptions import AppError, ForbiddenError, NotFoundError
 from app.models.user import User
 from app.repositories.user_repo import UserRepository
 
@@ -16,7 +17,7 @@ class AuthService:
     async def authenticate(self, username: str, password: str) -> dict:
         user = await self.user_repo.get_by_username(username)
 
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await verify_password_async(password, user.hashed_password):
             raise AppError("Неверное имя пользователя или пароль", status_code=401)
 
         if not user.is_active:
@@ -25,13 +26,24 @@ class AuthService:
         access_token = create_access_token(data={"sub": user.username})
         return {"access_token": access_token, "token_type": "bearer"}
 
+    async def set_user_active(self, current_user: User, username: str, is_active: bool) -> User:
+        if not current_user.is_admin:
+            raise ForbiddenError("Only administrators can change user status")
+
+        user = await self.user_repo.set_active(username, is_active)
+        if user is None:
+            raise NotFoundError("User not found")
+        await self.user_repo.db.commit()
+        principal_cache.invalidate(username)
+        return user
+
     async def ensure_admin_exists(self) -> None:
         existing = await self.user_repo.get_by_username(DEFAULT_ADMIN_USERNAME)
         if existing is None:
             admin = User(
                 username=DEFAULT_ADMIN_USERNAME,
                 email=DEFAULT_ADMIN_EMAIL,
-                hashed_password=hash_password(DEFAULT_ADMIN_PASSWORD),
+                hashed_password=await hash_password_async(DEFAULT_ADMIN_PASSWORD),
                 is_active=True,
                 is_admin=True,
             )
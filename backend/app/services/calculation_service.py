@@ -0,0 +1,258 @@
+import logging
+import time
+import uuid
+from datetime import datetime
+
+from app.calculation.engine import BatchFilter, CalculationEngine, ChunkResult
+from app.core.config import settings
+from app.core.metrics import Counter, Histogram
+from app.domain.enums import AgreementStatus, CalcRunStatus
+from app.domain.exceptions import NotFoundError
+from app.models.calculation import CalcJob, CalcRun
+from app.repositories.calc_job_repo import CalcJobRepository
+from app.repositories.calculation_repo import CalculationRepository
+from app.schemas.calculation import CalcRunCreate, CalcRunProgress
+
+logger = logging.getLogger(__name__)
+
+calc_runs_enqueued = Counter("calc_runs_enqueued", "Calculation runs enqueued")
+calc_jobs_finished = Counter(
+    "calc_jobs_finished", "Calculation jobs by outcome: done, lost (lease reclaimed), retried, failed", ("result",)
+)
+calc_agreements = Counter(
+    "calc_agreements", "Agreements processed by calculation jobs: calculated, unchanged (copied), skipped", ("outcome",)
+)
+calc_job_duration_seconds = Histogram(
+    "calc_job_duration_seconds",
+    "Time to calculate and commit one chunk",
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+
+
+def _filters(data: CalcRunCreate) -> dict:
+    return data.model_dump(mode="json", include={"statuses", "supplier_codes", "agreement_type_codes"})
+
+
+def _batch_filter(filters: dict) -> BatchFilter:
+    return BatchFilter(
+        statuses=tuple(AgreementStatus(s) for s in filters["statuses"]),
+        supplier_codes=tuple(filters["supplier_codes"]) if filters["supplier_codes"] is not None else None,
+        agreement_type_codes=(
+            tuple(filters["agreement_type_codes"]) if filters["agreement_type_codes"] is not None else None
+        ),
+    )
+
+
+class CalculationService:
+    def __init__(
+        self,
+        engine: CalculationEngine,
+        calculation_repo: CalculationRepository,
+        calc_job_repo: CalcJobRepository,
+    ) -> None:
+        self.engine = engine
+        self.calculation_repo = calculation_repo
+        self.calc_job_repo = calc_job_repo
+
+    async def start_run(self, data: CalcRunCreate) -> CalcRun:
+        """Record a run and enqueue its chunks for workers; nothing is calculated in the request."""
+        run = await self._enqueue(data)
+        await self.calculation_repo.db.commit()
+        calc_runs_enqueued.inc()
+        return run
+
+    async def open_batch(self, data: CalcRunCreate) -> tuple[CalcRun, int]:
+        """Run for a `run_batch` driver to drain, with the agreements it had already processed.
+
+        Resumes the unfinished run the batch's checkpoint points at; otherwise enqueues a new run
+        and checkpoints it in the same transaction.
+        """
+        run_key = CalculationEngine.make_run_key(data.period_from, data.period_to, _batch_filter(_filters(data)))
+        checkpoint = await self.calculation_repo.get_checkpoint(run_key)
+        if checkpoint is not None:
+            run = await self.calculation_repo.get_run(checkpoint.calc_run_id)
+            if run is not None and run.status != CalcRunStatus.FAILED:
+                if run.status == CalcRunStatus.COMPLETED:
+                    # Finished after the driver's last checkpoint
+                    await self.calculation_repo.delete_checkpoint(run_key)
+                    await self.calculation_repo.db.commit()
+                else:
+                    logger.info("Resuming batch %s after %d agreements", run_key, checkpoint.processed)
+                return run, checkpoint.processed
+
+        run = await self._enqueue(data)
+        await self.calculation_repo.save_checkpoint(run_key, run.id, None, 0)
+        await self.calculation_repo.db.commit()
+        calc_runs_enqueued.inc()
+        return run, 0
+
+    async def checkpoint_batch(self, run_id: uuid.UUID, job: CalcJob | None) -> CalcRun:
+        """Record a driver's progress after its chunk `job`; a finished run also drops the checkpoint."""
+        run = await self.get_run(run_id)
+        if run.status in (CalcRunStatus.COMPLETED, CalcRunStatus.FAILED):
+            await self.calculation_repo.delete_checkpoint(run.run_key)
+        elif job is not None:
+            await self.calculation_repo.save_checkpoint(
+                run.run_key, run.id, job.until_id, run.calculated + run.copied + run.skipped
+            )
+        await self.calculation_repo.db.commit()
+        return run
+
+    async def _enqueue(self, data: CalcRunCreate) -> CalcRun:
+        filters = _filters(data)
+        batch_filter = _batch_filter(filters)
+        run_key = CalculationEngine.make_run_key(data.period_from, data.period_to, batch_filter)
+
+        base_run = None
+        if data.incremental:
+            base_run = await self.calculation_repo.get_latest_completed_run(run_key)
+
+        chunk_size = settings.CALC_BATCH_CHUNK_SIZE
+        total, boundaries = await self.calculation_repo.plan_chunks(
+            data.period_from,
+            data.period_to,
+            statuses=batch_filter.statuses,
+            supplier_codes=batch_filter.supplier_codes,
+            agreement_type_codes=batch_filter.agreement_type_codes,
+            chunk_size=chunk_size,
+        )
+
+        run = CalcRun(
+            run_key=run_key,
+            period_from=data.period_from,
+            period_to=data.period_to,
+            filter=filters,
+            incremental=data.incremental,
+            base_run_id=base_run.id if base_run else None,
+            status=CalcRunStatus.PENDING if boundaries else CalcRunStatus.COMPLETED,
+            total=total,
+            completed_at=None if boundaries else datetime.utcnow(),
+        )
+        await self.calculation_repo.create_run(run)
+        await self.calc_job_repo.add_jobs(run.id, boundaries, total, chunk_size)
+        return run
+
+    async def get_run(self, run_id: uuid.UUID) -> CalcRun:
+        run = await self.calculation_repo.get_run(run_id)
+        if run is None:
+            raise NotFoundError("Calculation run not found")
+        return run
+
+    async def get_progress(self, run_id: uuid.UUID) -> CalcRunProgress:
+        run = await self.get_run(run_id)
+        jobs_total, jobs_done = await self.calc_job_repo.get_counts(run_id)
+        done = run.calculated + run.copied + run.skipped
+
+        elapsed = rate = 0.0
+        eta = None
+        if run.started_at is not None:
+            elapsed = ((run.completed_at or datetime.utcnow()) - run.started_at).total_seconds()
+            rate = done / elapsed if elapsed > 0 else 0.0
+            if run.status == CalcRunStatus.COMPLETED:
+                eta = 0.0
+            elif rate > 0:
+                eta = max(run.total - done, 0) / rate
+
+        return CalcRunProgress(
+            run_id=run.id,
+            status=run.status,
+            done=done,
+            total=run.total,
+            jobs_done=jobs_done,
+            jobs_total=jobs_total,
+            elapsed_seconds=round(elapsed, 1),
+            agreements_per_second=round(rate, 1),
+            eta_seconds=round(eta, 1) if eta is not None else None,
+        )
+
+    async def claim_job(self, worker_id: str, run_id: uuid.UUID | None = None) -> CalcJob | None:
+        job = await self.calc_job_repo.claim(worker_id, settings.CALC_JOB_LEASE_SECONDS, run_id)
+        if job is not None:
+            await self.calculation_repo.mark_run_started(job.calc_run_id)
+        await self.calculation_repo.db.commit()
+        return job
+
+    async def process_job(self, job: CalcJob, worker_id: str) -> bool:
+        """Calculate a claimed chunk and commit its results together with the job's completion.
+
+        Returns False, writing nothing, when the lease was lost and another worker owns the job.
+        """
+        db = self.calculation_repo.db
+        job_id = job.id
+        started = time.perf_counter()
+        run = await self.get_run(job.calc_run_id)
+        batch_filter = _batch_filter(run.filter)
+
+        chunk = await self.calculation_repo.get_batch_inputs(
+            run.period_from,
+            run.period_to,
+            statuses=batch_filter.statuses,
+            supplier_codes=batch_filter.supplier_codes,
+            agreement_type_codes=batch_filter.agreement_type_codes,
+            after_id=job.after_id,
+            limit=None,
+            until_id=job.until_id,
+        )
+        outcome = await self.engine.calculate_chunk(chunk, run.period_from, run.period_to, run.base_run_id)
+        await self._save_outcome(run.id, run.base_run_id, outcome)
+
+        if not await self.calc_job_repo.complete(job_id, worker_id):
+            await db.rollback()
+            logger.warning("Lease on job %d lost, discarding its results", job_id)
+            calc_jobs_finished.inc(result="lost")
+            return False
+
+        await self.calculation_repo.add_run_counts(
+            run.id, len(outcome.results), len(outcome.unchanged), outcome.skipped
+        )
+        if await self.calc_job_repo.count_unfinished(run.id) == 0:
+            await self.calculation_repo.finish_run(run.id, CalcRunStatus.COMPLETED)
+        await db.commit()
+
+        calc_jobs_finished.inc(result="done")
+        calc_agreements.inc(len(outcome.results), outcome="calculated")
+        calc_agreements.inc(len(outcome.unchanged), outcome="unchanged")
+        calc_agreements.inc(outcome.skipped, outcome="skipped")
+        calc_job_duration_seconds.observe(time.perf_counter() - started)
+        return True
+
+    async def fail_job(self, job: CalcJob, worker_id: str, error_message: str) -> None:
+        """Put a failed job back for another attempt, or fail it and its run after the last attempt."""
+        db = self.calculation_repo.db
+        # Read before the rollback expires the instance
+        job_id, run_id, attempts = job.id, job.calc_run_id, job.attempts
+        await db.rollback()
+
+        final = attempts >= settings.CALC_JOB_MAX_ATTEMPTS
+        if not await self.calc_job_repo.release(job_id, worker_id, error_message, failed=final):
+            # The lease was reclaimed; the job and its run belong to another worker now
+            await db.rollback()
+            logger.warning("Lease on job %d lost, not recording its failure", job_id)
+            calc_jobs_finished.inc(result="lost")
+            return
+        if final:
+            await self.calc_job_repo.fail_unfinished(run_id)
+            await self.calculation_repo.finish_run(
+                run_id, CalcRunStatus.FAILED, f"Job {job_id} failed: {error_message}"
+            )
+        await db.commit()
+        calc_jobs_finished.inc(result="failed" if final else "retried")
+
+    async def _save_outcome(self, run_id: uuid.UUID, base_run_id: uuid.UUID | None, outcome: ChunkResult) -> None:
+        rows = []
+        for agreement_id, amount in outcome.results.items():
+            fingerprint = outcome.fingerprints[agreement_id]
+            rows.append({
+                "calc_run_id": run_id,
+                "agreement_id": agreement_id,
+                "base_amount": amount.base_amount,
+                "bonus_amount": amount.bonus_amount,
+                "agreement_updated_at": fingerprint.agreement_updated_at,
+                "scale_code": fingerprint.scale_code,
+                "condition_value": fingerprint.condition_value,
+                "input_version": fingerprint.input_version,
+                "fingerprint": fingerprint.digest,
+            })
+        await self.calculation_repo.insert_results(rows)
+        if base_run_id is not None:
+            await self.calculation_repo.copy_results(base_run_id, run_id, outcome.unchanged)
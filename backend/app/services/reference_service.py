@@ -1,3 +1,4 @@
+from app.core.etag import make_etag
 from app.models.reference import RefSupplier, RefAgreementType, RefScale
 from app.repositories.reference_repo import ReferenceRepository
 
@@ -9,8 +10,21 @@ class ReferenceService:
     async def get_all_suppliers(self) -> list[RefSupplier]:
         return await self.reference_repo.get_all_suppliers()
 
+    async def search_suppliers(self, query: str, limit: int) -> list[RefSupplier]:
+        return await self.reference_repo.search_suppliers(query, limit)
+
     async def get_all_agreement_types(self) -> list[RefAgreementType]:
         return await self.reference_repo.get_all_agreement_types()
 
     async def get_all_scales(self) -> list[RefScale]:
         return await self.reference_repo.get_all_scales()
+
+    # Validators come from the same cache entry that serves the body, so they always agree
+    async def get_suppliers_etag(self) -> str:
+        return make_etag("ref_suppliers", await self.reference_repo.get_cached_version(RefSupplier))
+
+    async def get_agreement_types_etag(self) -> str:
+        return make_etag("ref_agreement_types", await self.reference_repo.get_cached_version(RefAgreementType))
+
+    async def get_scales_etag(self) -> str:
+        return make_etag("ref_scales", await self.reference_repo.get_cached_version(RefScale))
@@ -0,0 +1,136 @@
+import csv
+import json
+import time
+from collections.abc import AsyncIterable, Callable
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from app.core.config import settings
+from app.domain.enums import FileFormat, TurnoverKind
+from app.domain.exceptions import ValidationError
+from app.repositories.reference_repo import ReferenceRepository
+from app.repositories.turnover_repo import TurnoverRecord, TurnoverRepository
+from app.schemas.common import RowError
+from app.schemas.turnover import TurnoverUploadResult
+
+TURNOVER_COLUMNS = ("supplier_code", "doc_date", "kind", "amount")
+MAX_REPORTED_ERRORS = 100
+MAX_AMOUNT = Decimal("1e16")
+
+
+def _field(values: dict, name: str) -> str:
+    value = values.get(name)
+    return "" if value is None else str(value).strip()
+
+
+def _parse_record(values: dict, supplier_codes: set[str]) -> TurnoverRecord:
+    supplier_code = _field(values, "supplier_code")
+    if supplier_code not in supplier_codes:
+        raise ValueError(f"Unknown supplier_code {supplier_code!r}")
+
+    try:
+        doc_date = date.fromisoformat(_field(values, "doc_date"))
+    except ValueError:
+        raise ValueError("doc_date must be an ISO date (YYYY-MM-DD)") from None
+
+    try:
+        kind = TurnoverKind(_field(values, "kind").upper())
+    except ValueError:
+        raise ValueError(f"kind must be one of {', '.join(k.value for k in TurnoverKind)}") from None
+
+    try:
+        amount = Decimal(_field(values, "amount"))
+    except InvalidOperation:
+        raise ValueError("amount must be a number") from None
+    if not amount.is_finite() or abs(amount) >= MAX_AMOUNT or amount.as_tuple().exponent < -2:
+        raise ValueError("amount must be finite with at most 2 decimal places")
+
+    return TurnoverRecord(supplier_code, doc_date, kind, amount)
+
+
+def _csv_values(header: list[str]) -> Callable[[str], dict]:
+    def parse(line: str) -> dict:
+        row = next(csv.reader([line]))
+        if len(row) != len(header):
+            raise ValueError(f"Expected {len(header)} columns, got {len(row)}")
+        return dict(zip(header, row))
+
+    return parse
+
+
+def _ndjson_values(line: str) -> dict:
+    try:
+        values = json.loads(line, parse_float=Decimal)
+    except json.JSONDecodeError:
+        raise ValueError("Invalid JSON") from None
+    if not isinstance(values, dict):
+        raise ValueError("Expected a JSON object")
+    return values
+
+
+class TurnoverService:
+    def __init__(
+        self,
+        turnover_repo: TurnoverRepository,
+        reference_repo: ReferenceRepository,
+    ) -> None:
+        self.turnover_repo = turnover_repo
+        self.reference_repo = reference_repo
+
+    async def ingest(self, lines: AsyncIterable[str], fmt: FileFormat) -> TurnoverUploadResult:
+        """Validate rows as they arrive and load them through staging in fixed-size COPY batches.
+
+        Invalid rows are rejected individually; valid rows of the upload are committed together.
+        """
+        started = time.perf_counter()
+        supplier_codes = await self.reference_repo.get_supplier_codes()
+        await self.turnover_repo.create_staging()
+
+        parse_values = _ndjson_values if fmt == FileFormat.NDJSON else None
+        batch: list[TurnoverRecord] = []
+        accepted = rejected = 0
+        errors: list[RowError] = []
+
+        line_no = 0
+        async for line in lines:
+            line_no += 1
+            if not line.strip():
+                continue
+            if parse_values is None:
+                header = [c.strip() for c in next(csv.reader([line]))]
+                if sorted(header) != sorted(TURNOVER_COLUMNS):
+                    raise ValidationError(f"CSV header must contain exactly: {', '.join(TURNOVER_COLUMNS)}")
+                parse_values = _csv_values(header)
+                continue
+
+            try:
+                batch.append(_parse_record(parse_values(line), supplier_codes))
+            except (ValueError, csv.Error) as e:
+                rejected += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append(RowError(line=line_no, message=str(e)))
+                continue
+
+            if len(batch) >= settings.TURNOVER_COPY_BATCH_SIZE:
+                accepted += await self._load(batch)
+
+        accepted += await self._load(batch)
+        await self.turnover_repo.db.commit()
+
+        elapsed = time.perf_counter() - started
+        return TurnoverUploadResult(
+            accepted=accepted,
+            rejected=rejected,
+            errors=errors,
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round(accepted / elapsed, 1) if elapsed > 0 else 0.0,
+        )
+
+    async def _load(self, batch: list[TurnoverRecord]) -> int:
+        if not batch:
+            return 0
+        await self.turnover_repo.copy_to_staging(batch)
+        await self.turnover_repo.merge_staging()
+        loaded = len(batch)
+        batch.clear()
+        return loaded
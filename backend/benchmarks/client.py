@@ -0,0 +1,113 @@
+"""Minimal in-process HTTP client that drives the ASGI app directly.
+
+Requests go through the full middleware stack (metrics, query accounting, CORS) without a
+socket or server, so measured latency is the app's own plus the database.
+"""
+import asyncio
+import json
+import re
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from urllib.parse import urlencode
+
+from starlette.types import ASGIApp, Message
+
+_SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+@dataclass
+class Response:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+    def json(self):
+        return json.loads(self.body)
+
+    @property
+    def queries(self) -> int | None:
+        """Statement count reported by `QueryStatsMiddleware` in `Server-Timing`."""
+        match = _SERVER_TIMING_QUERIES.search(self.headers.get("server-timing", ""))
+        return int(match.group(1)) if match else None
+
+
+class AsgiClient:
+    def __init__(self, app: ASGIApp, headers: dict[str, str] | None = None) -> None:
+        self.app = app
+        self.headers = dict(headers or {})
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: dict | list[tuple[str, str]] | None = None,
+        json_body: object = None,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        body = b"" if json_body is None else json.dumps(json_body, default=str).encode()
+        all_headers = {**self.headers, **(headers or {})}
+        if json_body is not None:
+            all_headers["content-type"] = "application/json"
+        all_headers["content-length"] = str(len(body))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": urlencode(params or {}, doseq=True).encode(),
+            "headers": [(k.lower().encode(), v.encode()) for k, v in all_headers.items()],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+
+        request_sent = False
+        response_done = asyncio.Event()
+        status = 500
+        response_headers: dict[str, str] = {}
+        chunks: list[bytes] = []
+
+        async def receive() -> Message:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Streaming responses listen for a disconnect while sending; only report it at the end
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers.update((k.decode(), v.decode()) for k, v in message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_done.set()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            response_done.set()
+        return Response(status=status, headers=response_headers, body=b"".join(chunks))
+
+    async def get(self, path: str, **kwargs) -> Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> Response:
+        return await self.request("POST", path, **kwargs)
+
+    async def put(self, path: str, **kwargs) -> Response:
+        return await self.request("PUT", path, **kwargs)
+
+
+@asynccontextmanager
+async def running(app) -> AsyncIterator[None]:
+    """Run the FastAPI lifespan (logging setup, admin seeding, shutdown hooks) around the block."""
+    async with app.router.lifespan_context(app):
+        yield
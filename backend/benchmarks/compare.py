@@ -0,0 +1,62 @@
+"""Compare a benchmark result file with a stored baseline.
+
+Latency and throughput get a relative tolerance, since they vary between machines and runs.
+Query counts are compared by the median per request: cache revalidations after a TTL add a few
+queries to some requests depending on run length, but do not move the median, so any increase
+of it is reported.
+
+    python -m benchmarks.compare results.json baseline.json --tolerance 0.2
+
+Exits with status 1 when a scenario regressed.
+"""
+import argparse
+import json
+import sys
+
+# (metric, higher is better)
+LATENCY_METRICS = (("p50_ms", False), ("p95_ms", False), ("p99_ms", False), ("throughput_rps", True))
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Human-readable regressions of `current` against `baseline`; empty when none."""
+    regressions = []
+    for name, base in baseline["scenarios"].items():
+        result = current["scenarios"].get(name)
+        if result is None:
+            continue
+        for metric, higher_is_better in LATENCY_METRICS:
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{name}.{metric}: {old} -> {new} ({change:+.0%})")
+        old_q, new_q = base.get("median_queries"), result.get("median_queries")
+        if old_q is not None and new_q is not None and new_q > old_q:
+            regressions.append(f"{name}.median_queries: {old_q} -> {new_q}")
+        if result.get("errors", 0) > base.get("errors", 0):
+            regressions.append(f"{name}.errors: {base.get('errors', 0)} -> {result['errors']}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare benchmark results with a baseline.")
+    parser.add_argument("results")
+    parser.add_argument("baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative latency/throughput change")
+    args = parser.parse_args()
+
+    with open(args.results) as f:
+        current = json.load(f)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(current, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if regressions:
+        sys.exit(1)
+    print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Run load scenarios in-process against the configured database and write results as JSON.
+
+The app is driven through its ASGI interface (full middleware stack, no server), so results
+measure the application and Postgres. Seed first with `python -m benchmarks.seed`.
+
+    python -m benchmarks.run --scenario all --concurrency 8 --requests 500 \\
+        --output results.json --baseline baseline.json
+
+Per scenario: request count, errors, wall time, throughput, p50/p95/p99 latency and queries per
+request (mean, median and max, from the `Server-Timing` header). With `--baseline`, the run fails on regressions
+(see `benchmarks.compare`).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timezone
+
+from app.domain.constants import DEFAULT_ADMIN_PASSWORD, DEFAULT_ADMIN_USERNAME
+from app.main import app
+from benchmarks.client import AsgiClient, running
+from benchmarks.compare import compare
+from benchmarks.scenarios import SCENARIOS, SEQUENTIAL, Context, Recorder, Sample, load_context
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    rank = math.ceil(q / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def summarize(samples: list[Sample], wall_seconds: float) -> dict:
+    latencies = sorted(s.latency * 1000 for s in samples)
+    queries = [s.queries for s in samples if s.queries is not None]
+    return {
+        "requests": len(samples),
+        "errors": sum(not s.ok for s in samples),
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_rps": round(len(samples) / wall_seconds, 1) if wall_seconds > 0 else 0.0,
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else None,
+        "p50_ms": round(percentile(latencies, 50), 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95), 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99), 2) if latencies else None,
+        "queries_per_request": round(statistics.fmean(queries), 2) if queries else None,
+        "median_queries": statistics.median_low(queries) if queries else None,
+        "max_queries": max(queries) if queries else None,
+    }
+
+
+async def run_scenario(ctx: Context, name: str, operations: int, concurrency: int, warmup: int, seed: int) -> dict:
+    """`operations` calls of the scenario spread over `concurrency` tasks, after unrecorded warm-up calls.
+
+    Each task gets a fixed share of the operations, so the request mix does not depend on scheduling.
+    """
+    scenario = SCENARIOS[name]
+    warmup_rng = random.Random(seed)
+    for _ in range(warmup):
+        await scenario(ctx, Recorder(), warmup_rng)
+
+    recorder = Recorder()
+
+    async def task(index: int) -> None:
+        rng = random.Random(f"{seed}:{name}:{index}")
+        for _ in range(operations // concurrency + (index < operations % concurrency)):
+            await scenario(ctx, recorder, rng)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(task(i) for i in range(concurrency)))
+    return summarize(recorder.samples, time.perf_counter() - started)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> dict:
+    names = list(SCENARIOS) if args.scenario == ["all"] else args.scenario
+    # One line per request on app.request would dominate the run
+    logging.getLogger("app.request").setLevel(logging.WARNING)
+
+    results: dict[str, dict] = {}
+    async with running(app):
+        client = AsgiClient(app)
+        ctx = await load_context(
+            client, args.username, args.password,
+            date.fromisoformat(args.period_from), date.fromisoformat(args.period_to), args.calc_workers,
+        )
+        for name in names:
+            if name in SEQUENTIAL:
+                result = await run_scenario(ctx, name, args.calc_runs, 1, 0, args.seed)
+            else:
+                result = await run_scenario(ctx, name, args.requests, args.concurrency, args.warmup, args.seed)
+            results[name] = result
+            print(
+                f"{name:<20} {result['requests']:>6} req  {result['throughput_rps']:>8} rps  "
+                f"p50 {result['p50_ms']} ms  p95 {result['p95_ms']} ms  p99 {result['p99_ms']} ms  "
+                f"q/req {result['queries_per_request']}  errors {result['errors']}",
+                file=sys.stderr,
+            )
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "seed": args.seed,
+        },
+        "scenarios": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run in-process load scenarios.")
+    parser.add_argument(
+        "--scenario", nargs="+", default=["all"], choices=["all", *SCENARIOS], help="scenarios to run (default: all)"
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500, help="operations per scenario")
+    parser.add_argument("--warmup", type=int, default=10, help="unrecorded operations before measuring")
+    parser.add_argument("--calc-runs", type=int, default=1, help="calculation runs for calculation_batch")
+    parser.add_argument("--calc-workers", type=int, default=2, help="in-process workers draining each run")
+    parser.add_argument("--period-from", default="2026-01-01")
+    parser.add_argument("--period-to", default="2026-12-31")
+    parser.add_argument("--username", default=DEFAULT_ADMIN_USERNAME)
+    parser.add_argument("--password", default=DEFAULT_ADMIN_PASSWORD)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="compare with this results file and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative latency/throughput change")
+    args = parser.parse_args()
+
+    report = asyncio.run(main(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,186 @@
+"""Load scenarios run by `benchmarks.run`.
+
+A scenario is one async operation, called repeatedly by concurrent tasks, that issues one or
+more requests through `Recorder`. Random choices come from a per-task generator seeded from the
+run seed, so a given seed and concurrency replays the same request mix.
+"""
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.calculation.worker import work
+from app.core.query_stats import count_queries
+from app.db.session import AsyncSessionLocal
+from app.models.agreement import Agreement
+from app.models.reference import RefAgreementType, RefScale
+from benchmarks.client import AsgiClient, Response
+from benchmarks.seed import SUPPLIER_PREFIX
+
+
+@dataclass
+class Sample:
+    latency: float
+    ok: bool
+    queries: int | None
+
+
+@dataclass
+class Recorder:
+    """Collects one sample per request (or per calculation run) of a scenario."""
+
+    samples: list[Sample] = field(default_factory=list)
+
+    async def call(self, request: Awaitable[Response], expect: int = 200) -> Response:
+        started = time.perf_counter()
+        response = await request
+        self.samples.append(Sample(time.perf_counter() - started, response.status == expect, response.queries))
+        return response
+
+
+@dataclass
+class Context:
+    client: AsgiClient
+    username: str
+    password: str
+    suppliers: list[str]
+    agreement_type_codes: list[str]
+    scale_codes: list[str]
+    agreement_ids: list[str]
+    period_from: date
+    period_to: date
+    calc_workers: int
+
+
+async def load_context(
+    client: AsgiClient, username: str, password: str, period_from: date, period_to: date, calc_workers: int
+) -> Context:
+    """Log in and read the seeded data the scenarios pick from."""
+    response = await client.post("/api/auth/login", json_body={"username": username, "password": password})
+    if response.status != 200:
+        raise SystemExit(f"Login as {username!r} failed with {response.status}: {response.body[:200]!r}")
+    client.headers["authorization"] = f"Bearer {response.json()['access_token']}"
+
+    async with AsyncSessionLocal() as session:
+        bench = f"{SUPPLIER_PREFIX}%"
+        suppliers = list((await session.execute(
+            select(Agreement.supplier_code).where(Agreement.supplier_code.like(bench)).distinct()
+        )).scalars())
+        agreement_ids = [str(i) for i in (await session.execute(
+            select(Agreement.id).where(Agreement.supplier_code.like(bench)).order_by(Agreement.id).limit(5000)
+        )).scalars()]
+        type_codes = list((await session.execute(select(RefAgreementType.code))).scalars())
+        scale_codes = list((await session.execute(select(RefScale.code))).scalars())
+    if not suppliers:
+        raise SystemExit("No benchmark data found: run `python -m benchmarks.seed` first")
+    return Context(
+        client=client, username=username, password=password, suppliers=sorted(suppliers),
+        agreement_type_codes=sorted(type_codes), scale_codes=sorted(scale_codes), agreement_ids=agreement_ids,
+        period_from=period_from, period_to=period_to, calc_workers=calc_workers,
+    )
+
+
+async def list_pages(ctx: Context, rec: Recorder, rng: random.Random) -> None:
+    """Walk up to five keyset pages, unfiltered or filtered by a supplier."""
+    params: dict = {"limit": 50}
+    if rng.random() < 0.5:
+        params["supplier_code"] = rng.choice(ctx.suppliers)
+    for _ in range(5):
+        response = await rec.call(ctx.client.get("/api/agreements", params=params))
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            return
+        params["cursor"] = cursor
+
+
+def _agreement_body(ctx: Context, rng: random.Random) -> dict:
+    start = ctx.period_from.replace(day=1)
+    return {
+        "valid_from": start.isoformat(),
+        "valid_to": ctx.period_to.isoformat(),
+        "supplier_code": rng.choice(ctx.suppliers),
+        "agreement_type_code": rng.choice(ctx.agreement_type_codes),
+        "scale_code": rng.choice(ctx.scale_codes),
+        "condition_value": str(Decimal(rng.randrange(50, 1000)) / 100),
+    }
+
+
+async def create_update_mix(ctx: Context, rec: Recorder, rng: random.Random) -> None:
+    """Create an agreement, read it back and update it; every third pass also updates a seeded one."""
+    created = await rec.call(ctx.client.post("/api/agreements", json_body=_agreement_body(ctx, rng)), expect=201)
+    if created.status != 201:
+        return
+    agreement_id = created.json()["id"]
+    await _read_and_update(ctx, rec, rng, agreement_id)
+    if ctx.agreement_ids and rng.random() < 1 / 3:
+        await _read_and_update(ctx, rec, rng, rng.choice(ctx.agreement_ids))
+
+
+async def _read_and_update(ctx: Context, rec: Recorder, rng: random.Random, agreement_id: str) -> None:
+    read = await rec.call(ctx.client.get(f"/api/agreements/{agreement_id}"))
+    if read.status != 200:
+        return
+    body = {**_agreement_body(ctx, rng), "version": read.json()["version"]}
+    await rec.call(ctx.client.put(f"/api/agreements/{agreement_id}", json_body=body))
+
+
+async def search(ctx: Context, rec: Recorder, rng: random.Random) -> None:
+    """Fragments of agreement codes or of seeded supplier names."""
+    if rng.random() < 0.5:
+        fragment = f"{rng.randrange(1000):03d}"
+    else:
+        fragment = f"Бенч {rng.choice(ctx.suppliers)[len(SUPPLIER_PREFIX):][:4]}"
+    await rec.call(ctx.client.get("/api/agreements/search", params={"q": fragment, "limit": 20}))
+
+
+async def login_burst(ctx: Context, rec: Recorder, rng: random.Random) -> None:
+    """Password logins; dominated by the bcrypt cost, so watch throughput against the hashing pool."""
+    anonymous = AsgiClient(ctx.client.app)
+    await rec.call(anonymous.post("/api/auth/login", json_body={"username": ctx.username, "password": ctx.password}))
+
+
+async def reference_reads(ctx: Context, rec: Recorder, rng: random.Random) -> None:
+    path = rng.choice(("/api/ref/suppliers", "/api/ref/agreement-types", "/api/ref/scales"))
+    await rec.call(ctx.client.get(path))
+
+
+async def calculation_batch(ctx: Context, rec: Recorder, rng: random.Random) -> None:
+    """One full, non-incremental run over the seeded period, drained by in-process workers.
+
+    The sample covers enqueueing through the last job; its query count is the whole run's.
+    Jobs left in the queue by other runs are drained too, so start from an idle queue.
+    """
+    started = time.perf_counter()
+    with count_queries() as stats:
+        response = await ctx.client.post("/api/calculation/runs", json_body={
+            "period_from": ctx.period_from.isoformat(),
+            "period_to": ctx.period_to.isoformat(),
+            "incremental": False,
+        })
+        if response.status == 202:
+            await asyncio.gather(*(work(f"benchmark:{i}", once=True) for i in range(ctx.calc_workers)))
+            run = (await ctx.client.get(f"/api/calculation/runs/{response.json()['id']}")).json()
+            ok = run["status"] == "COMPLETED"
+        else:
+            ok = False
+    # The request's own statements are counted by the middleware, not by the outer block
+    rec.samples.append(Sample(time.perf_counter() - started, ok, stats.count + (response.queries or 0)))
+
+
+Scenario = Callable[[Context, Recorder, random.Random], Awaitable[None]]
+
+SCENARIOS: dict[str, Scenario] = {
+    "list_pages": list_pages,
+    "create_update_mix": create_update_mix,
+    "search": search,
+    "login_burst": login_burst,
+    "reference_reads": reference_reads,
+    "calculation_batch": calculation_batch,
+}
+# Whole calculation runs are long; they run sequentially and a few times at most
+SEQUENTIAL = {"calculation_batch"}
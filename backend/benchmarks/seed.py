@@ -0,0 +1,167 @@
+"""Synthetic data for benchmarks: suppliers, agreements over every scale and turnover.
+
+All generated suppliers get the `BENCH` code prefix, so seeding never touches real reference
+data and `--reset` removes exactly what an earlier seed (and the scenarios) created. The
+generator is seeded, so the same arguments produce the same data set.
+
+    python -m benchmarks.seed --suppliers 500 --agreements 20000 --months 12 --reset
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.calculation.periods import month_start
+from app.db.session import AsyncSessionLocal
+from app.domain.enums import AgreementStatus, GridType, TurnoverKind
+from app.models.agreement import Agreement
+from app.models.calculation import CalcResult
+from app.models.reference import RefAgreementType, RefScale, RefSupplier
+from app.models.turnover import TurnoverDaily, TurnoverFact, TurnoverMonthly
+from app.repositories.turnover_repo import TurnoverRecord, TurnoverRepository
+
+SUPPLIER_PREFIX = "BENCH"
+# 7 columns per agreement row, well under asyncpg's bind parameter limit
+_INSERT_BATCH_SIZE = 2000
+_TURNOVER_BATCH_SIZE = 50_000
+
+
+def supplier_code(i: int) -> str:
+    return f"{SUPPLIER_PREFIX}{i:06d}"
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+async def reset(session: AsyncSession) -> None:
+    """Delete everything tied to `BENCH` suppliers."""
+    bench = f"{SUPPLIER_PREFIX}%"
+    bench_agreements = select(Agreement.id).where(Agreement.supplier_code.like(bench))
+    await session.execute(delete(CalcResult).where(CalcResult.agreement_id.in_(bench_agreements)))
+    await session.execute(delete(Agreement).where(Agreement.supplier_code.like(bench)))
+    for model in (TurnoverFact, TurnoverDaily, TurnoverMonthly):
+        await session.execute(delete(model).where(model.supplier_code.like(bench)))
+    await session.execute(delete(RefSupplier).where(RefSupplier.code.like(bench)))
+    await session.commit()
+
+
+async def seed_suppliers(session: AsyncSession, count: int) -> list[str]:
+    codes = [supplier_code(i) for i in range(count)]
+    for i in range(0, count, _INSERT_BATCH_SIZE):
+        await session.execute(
+            insert(RefSupplier),
+            [{"code": c, "name": f'ООО "Бенч {c[len(SUPPLIER_PREFIX):]}"'} for c in codes[i:i + _INSERT_BATCH_SIZE]],
+        )
+    await session.commit()
+    return codes
+
+
+async def seed_agreements(
+    session: AsyncSession, rng: random.Random, suppliers: list[str], count: int, first_month: date, months: int
+) -> None:
+    """Agreements spread evenly over every scale and agreement type, valid for 1–12 month windows."""
+    scales = (await session.execute(select(RefScale.code, RefScale.grid).order_by(RefScale.code))).all()
+    type_codes = list((await session.execute(select(RefAgreementType.code).order_by(RefAgreementType.code))).scalars())
+    if not scales or not type_codes:
+        raise SystemExit("Reference data is missing: run `alembic upgrade head` first")
+
+    rows = []
+    for i in range(count):
+        scale_code, grid = scales[i % len(scales)]
+        start = _add_months(first_month, rng.randrange(months))
+        end = _add_months(start, rng.randint(1, 12))
+        rows.append({
+            "valid_from": start,
+            "valid_to": date.fromordinal(end.toordinal() - 1),
+            "supplier_code": rng.choice(suppliers),
+            "agreement_type_code": type_codes[i % len(type_codes)],
+            "scale_code": scale_code,
+            "condition_value": (
+                Decimal(rng.randrange(1000, 500_000)) if grid == GridType.FIX
+                else Decimal(rng.randrange(50, 1000)) / 100
+            ),
+            "status": AgreementStatus.READY_FOR_CALCULATION if rng.random() < 0.8 else AgreementStatus.CALCULATED,
+        })
+        if len(rows) >= _INSERT_BATCH_SIZE:
+            await session.execute(insert(Agreement), rows)
+            rows = []
+    if rows:
+        await session.execute(insert(Agreement), rows)
+    await session.commit()
+
+
+async def seed_turnover(
+    session: AsyncSession,
+    rng: random.Random,
+    suppliers: list[str],
+    rows_per_supplier: int,
+    first_month: date,
+    months: int,
+) -> int:
+    """Turnover lines loaded through the same staging COPY and merge as `POST /api/turnover/upload`."""
+    repo = TurnoverRepository(session)
+    first_day = first_month.toordinal()
+    days = _add_months(first_month, months).toordinal() - first_day
+    kinds = list(TurnoverKind)
+
+    await repo.create_staging()
+    batch: list[TurnoverRecord] = []
+    total = 0
+    for code in suppliers:
+        for _ in range(rows_per_supplier):
+            batch.append(TurnoverRecord(
+                supplier_code=code,
+                doc_date=date.fromordinal(first_day + rng.randrange(days)),
+                kind=rng.choice(kinds),
+                amount=Decimal(rng.randrange(100, 10_000_000)) / 100,
+            ))
+            if len(batch) >= _TURNOVER_BATCH_SIZE:
+                await repo.copy_to_staging(batch)
+                await repo.merge_staging()
+                total += len(batch)
+                batch.clear()
+    if batch:
+        await repo.copy_to_staging(batch)
+        await repo.merge_staging()
+        total += len(batch)
+    await session.commit()
+    return total
+
+
+async def main(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    first_month = month_start(date.fromisoformat(args.start))
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        if args.reset:
+            await reset(session)
+        elif await session.scalar(
+            select(RefSupplier.code).where(RefSupplier.code.like(f"{SUPPLIER_PREFIX}%")).limit(1)
+        ):
+            raise SystemExit("Benchmark data already exists; pass --reset to replace it")
+        suppliers = await seed_suppliers(session, args.suppliers)
+        await seed_agreements(session, rng, suppliers, args.agreements, first_month, args.months)
+        turnover = await seed_turnover(session, rng, suppliers, args.turnover_per_supplier, first_month, args.months)
+    print(
+        f"Seeded {len(suppliers)} suppliers, {args.agreements} agreements, {turnover} turnover rows "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate benchmark data (suppliers with the BENCH prefix).")
+    parser.add_argument("--suppliers", type=int, default=500)
+    parser.add_argument("--agreements", type=int, default=20_000)
+    parser.add_argument("--turnover-per-supplier", type=int, default=200)
+    parser.add_argument("--months", type=int, default=12, help="length of the data period")
+    parser.add_argument("--start", default="2026-01-01", help="first month of the data period")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="delete earlier BENCH data first")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,109 @@
+"""Agreement list serialization: ORM + AgreementResponse vs flat rows + precompiled TypeAdapter.
+
+Runs without a database on synthetic rows, so it isolates the Python side of the two read paths
+(the flat path also saves ORM identity-map hydration on the database side, not measured here).
+
+    python -m benchmarks.serialization --rows 10000 --repeat 5
+"""
+import argparse
+import json
+import statistics
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from pydantic import TypeAdapter
+
+from app.domain.enums import AgreementStatus, GridType
+from app.models.agreement import Agreement
+from app.models.reference import RefAgreementType, RefScale, RefSupplier
+from app.schemas.agreement import AgreementResponse, agreement_rows_adapter
+
+response_list_adapter = TypeAdapter(list[AgreementResponse])
+
+
+def make_rows(n: int) -> list[dict]:
+    now = datetime(2026, 1, 1)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "code": f"{i + 1:08d}",
+            "valid_from": date(2026, 1, 1),
+            "valid_to": date(2026, 12, 31),
+            "supplier_code": f"K{i % 500:07d}",
+            "supplier_name": f'ООО "Поставщик {i % 500}"',
+            "agreement_type_code": "T001",
+            "agreement_type_name": "Оборотный бонус",
+            "scale_code": "02",
+            "scale_name": "% от закупок",
+            "scale_grid": GridType.PERCENT,
+            "condition_value": Decimal("2.50"),
+            "status": AgreementStatus.READY_FOR_CALCULATION,
+            "version": 1,
+            "created_at": now - timedelta(seconds=i),
+            "updated_at": now - timedelta(seconds=i),
+        }
+        for i in range(n)
+    ]
+
+
+def make_orm_objects(rows: list[dict]) -> list[Agreement]:
+    agreement_type = RefAgreementType(code="T001", name="Оборотный бонус")
+    scale = RefScale(code="02", name="% от закупок", grid=GridType.PERCENT)
+    suppliers: dict[str, RefSupplier] = {}
+    objects = []
+    for row in rows:
+        supplier = suppliers.setdefault(
+            row["supplier_code"], RefSupplier(code=row["supplier_code"], name=row["supplier_name"])
+        )
+        objects.append(Agreement(
+            id=row["id"], code=row["code"], valid_from=row["valid_from"], valid_to=row["valid_to"],
+            supplier_code=row["supplier_code"], agreement_type_code="T001", scale_code="02",
+            condition_value=row["condition_value"], status=row["status"], version=row["version"],
+            created_at=row["created_at"], updated_at=row["updated_at"],
+            supplier=supplier, agreement_type=agreement_type, scale=scale,
+        ))
+    return objects
+
+
+def orm_path(objects: list[Agreement]) -> bytes:
+    return response_list_adapter.dump_json([AgreementResponse.model_validate(a) for a in objects])
+
+
+def flat_path(rows: list[dict]) -> bytes:
+    return agreement_rows_adapter.dump_json(rows)
+
+
+def measure(fn, arg, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    objects = make_orm_objects(rows)
+    assert json.loads(orm_path(objects[:10])) == json.loads(flat_path(rows[:10])), "paths disagree"
+
+    orm = measure(orm_path, objects, args.repeat)
+    flat = measure(flat_path, rows, args.repeat)
+    result = {
+        "rows": args.rows,
+        "orm_median_ms": round(statistics.median(orm) * 1000, 2),
+        "flat_median_ms": round(statistics.median(flat) * 1000, 2),
+        "speedup": round(statistics.median(orm) / statistics.median(flat), 1),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
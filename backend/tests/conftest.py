@@ -0,0 +1,67 @@
+"""Shared fixtures. Database-backed ones run against the migrated database in `DATABASE_URL`
+and skip the test when it is unreachable; they clean up the rows they create.
+"""
+import uuid
+from collections.abc import AsyncIterator
+
+import pytest
+from sqlalchemy import delete, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal
+from app.domain.constants import DEFAULT_ADMIN_PASSWORD, DEFAULT_ADMIN_USERNAME
+from app.main import app
+from app.models.agreement import Agreement
+from benchmarks.client import AsgiClient, running
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+AGREEMENT = {
+    "valid_from": "2026-01-01",
+    "valid_to": "2026-12-31",
+    "supplier_code": "K0000001",
+    "agreement_type_code": "T001",
+    "scale_code": "01",
+    "condition_value": "2.5",
+}
+
+
+@pytest.fixture
+async def client() -> AsyncIterator[AsgiClient]:
+    try:
+        async with running(app):
+            anonymous = AsgiClient(app)
+            login = await anonymous.post(
+                "/api/auth/login", json_body={"username": DEFAULT_ADMIN_USERNAME, "password": DEFAULT_ADMIN_PASSWORD}
+            )
+            assert login.status == 200, login.body
+            yield AsgiClient(app, headers={"Authorization": f"Bearer {login.json()['access_token']}"})
+    except (OSError, DBAPIError) as e:
+        pytest.skip(f"database unavailable: {e}")
+
+
+@pytest.fixture
+async def agreement(client: AsgiClient) -> AsyncIterator[dict]:
+    created = await client.post("/api/agreements", json_body=AGREEMENT)
+    assert created.status == 201, created.body
+    yield created.json()
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(Agreement).where(Agreement.id == uuid.UUID(created.json()["id"])))
+        await session.commit()
+
+
+@pytest.fixture
+async def db() -> AsyncIterator[AsyncSession]:
+    """A primary session; whatever the test leaves uncommitted is rolled back."""
+    async with AsyncSessionLocal() as session:
+        try:
+            await session.execute(text("SELECT 1"))
+        except (OSError, DBAPIError) as e:
+            pytest.skip(f"database unavailable: {e}")
+        yield session
+        await session.rollback()
@@ -0,0 +1,70 @@
+"""Optimistic concurrency of agreement updates, against the migrated database (`DATABASE_URL`)."""
+import asyncio
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from benchmarks.client import AsgiClient
+from tests.conftest import AGREEMENT
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_update_bumps_the_version(client: AsgiClient, agreement: dict):
+    path = f"/api/agreements/{agreement['id']}"
+    response = await client.put(path, json_body={**AGREEMENT, "condition_value": "3", "version": agreement["version"]})
+    assert response.status == 200, response.body
+    assert response.json()["version"] == agreement["version"] + 1
+    assert Decimal(response.json()["condition_value"]) == 3
+
+
+async def test_concurrent_updates_of_one_version_let_one_through(client: AsgiClient, agreement: dict):
+    path = f"/api/agreements/{agreement['id']}"
+    body = {**AGREEMENT, "version": agreement["version"]}
+    responses = await asyncio.gather(client.put(path, json_body=body), client.put(path, json_body=body))
+    assert sorted(r.status for r in responses) == [200, 409]
+
+
+async def test_stale_status_change_is_rejected(client: AsgiClient, agreement: dict):
+    path = f"/api/agreements/{agreement['id']}"
+    await client.put(path, json_body={**AGREEMENT, "version": agreement["version"]})
+    response = await client.request(
+        "PATCH", f"{path}/status", json_body={"status": "CALCULATED", "version": agreement["version"]}
+    )
+    assert response.status == 409
+    assert "modified concurrently" in response.json()["detail"]
+
+
+async def test_missing_agreement_is_not_found(client: AsgiClient):
+    response = await client.put(f"/api/agreements/{uuid.uuid4()}", json_body={**AGREEMENT, "version": 1})
+    assert response.status == 404
+
+
+async def test_deleted_agreement_cannot_be_edited(client: AsgiClient, agreement: dict):
+    path = f"/api/agreements/{agreement['id']}"
+    deleted = await client.request(
+        "PATCH", f"{path}/status", json_body={"status": "DELETED", "version": agreement["version"]}
+    )
+    assert deleted.status == 200, deleted.body
+    response = await client.put(path, json_body={**AGREEMENT, "version": deleted.json()["version"]})
+    assert response.status == 400
+
+
+async def test_status_change_follows_the_transitions(client: AsgiClient, agreement: dict):
+    path = f"/api/agreements/{agreement['id']}/status"
+    version = agreement["version"]
+
+    same = await client.request("PATCH", path, json_body={"status": "READY_FOR_CALCULATION", "version": version})
+    assert same.status == 409
+    assert "Cannot change status" in same.json()["detail"]
+
+    deleted = await client.request("PATCH", path, json_body={"status": "DELETED", "version": version})
+    assert deleted.status == 200, deleted.body
+    version = deleted.json()["version"]
+    calculated = await client.request("PATCH", path, json_body={"status": "CALCULATED", "version": version})
+    assert calculated.status == 409
+
+    restored = await client.request("PATCH", path, json_body={"status": "READY_FOR_CALCULATION", "version": version})
+    assert restored.status == 200, restored.body
+    assert restored.json()["status"] == "READY_FOR_CALCULATION"
@@ -0,0 +1,36 @@
+import uuid
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.agreement import AgreementBulkStatusUpdate
+
+
+def test_filter_with_a_criterion_is_accepted():
+    body = AgreementBulkStatusUpdate.model_validate({"status": "DELETED", "filter": {"supplier_code": ["S1"]}})
+    assert body.filter.supplier_code == ["S1"]
+
+
+def test_ids_are_accepted():
+    body = AgreementBulkStatusUpdate.model_validate({"status": "DELETED", "ids": [str(uuid.uuid4())]})
+    assert len(body.ids) == 1
+
+
+@pytest.mark.parametrize("selection", [
+    {},
+    {"ids": [str(uuid.uuid4())], "filter": {"supplier_code": ["S1"]}},
+    {"ids": []},
+    {"filter": {}},
+    {"filter": {"status": []}},
+    {"filter": {"status": [], "supplier_code": ["S1"]}},
+])
+def test_selection_must_narrow(selection):
+    with pytest.raises(ValidationError):
+        AgreementBulkStatusUpdate.model_validate({"status": "DELETED", **selection})
+
+
+def test_active_range_must_be_ordered():
+    with pytest.raises(ValidationError):
+        AgreementBulkStatusUpdate.model_validate(
+            {"status": "DELETED", "filter": {"active_from": "2026-02-01", "active_to": "2026-01-01"}}
+        )
@@ -0,0 +1,127 @@
+"""Leases of the `calc_jobs` queue and resumable batches, against the migrated database."""
+import uuid
+from collections.abc import AsyncIterator
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.calculation.engine import CalculationEngine
+from app.db.session import AsyncSessionLocal
+from app.domain.enums import CalcJobStatus, CalcRunStatus
+from app.models.calculation import CalcJob, CalcRun
+from app.repositories.calc_job_repo import CalcJobRepository
+from app.repositories.calculation_repo import CalculationRepository
+from app.schemas.calculation import CalcRunCreate
+from app.services.calculation_service import CalculationService
+
+pytestmark = pytest.mark.anyio
+
+LEASE_SECONDS = 60
+
+
+@pytest.fixture
+async def run_id(db: AsyncSession) -> AsyncIterator[uuid.UUID]:
+    """A run with two queued jobs; deleting the run removes them."""
+    run = CalcRun(
+        run_key=uuid.uuid4().hex, period_from=date(2026, 1, 1), period_to=date(2026, 1, 31), filter={}, total=2
+    )
+    db.add(run)
+    await db.flush()
+    await CalcJobRepository(db).add_jobs(run.id, sorted([uuid.uuid4(), uuid.uuid4()]), total=2, chunk_size=1)
+    await db.commit()
+    yield run.id
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(CalcRun).where(CalcRun.id == run.id))
+        await session.commit()
+
+
+async def expire_leases(run_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(CalcJob).where(CalcJob.calc_run_id == run_id).values(lease_expires_at=datetime(2000, 1, 1))
+        )
+        await session.commit()
+
+
+async def test_concurrent_claims_skip_each_others_jobs(run_id: uuid.UUID):
+    async with AsyncSessionLocal() as first, AsyncSessionLocal() as second:
+        # The first claim's row lock is held until it commits
+        a = await CalcJobRepository(first).claim("worker-a", LEASE_SECONDS, run_id)
+        b = await CalcJobRepository(second).claim("worker-b", LEASE_SECONDS, run_id)
+        assert a is not None and b is not None
+        assert a.id != b.id
+        await first.commit()
+        await second.commit()
+
+        assert await CalcJobRepository(first).claim("worker-c", LEASE_SECONDS, run_id) is None
+
+
+async def test_live_lease_is_not_reclaimed(run_id: uuid.UUID, db: AsyncSession):
+    repo = CalcJobRepository(db)
+    for _ in range(2):
+        await repo.claim("worker-a", LEASE_SECONDS, run_id)
+    await db.commit()
+    assert await repo.claim("worker-b", LEASE_SECONDS, run_id) is None
+
+
+async def test_expired_lease_is_reclaimed_and_the_old_holder_is_fenced_off(run_id: uuid.UUID, db: AsyncSession):
+    async with AsyncSessionLocal() as session:
+        old = CalcJobRepository(session)
+        job = await old.claim("worker-a", LEASE_SECONDS, run_id)
+        await session.commit()
+        await expire_leases(run_id)
+
+        new = CalcJobRepository(db)
+        reclaimed = await new.claim("worker-b", LEASE_SECONDS, run_id)
+        await db.commit()
+        assert reclaimed.id == job.id
+        assert reclaimed.locked_by == "worker-b"
+        assert reclaimed.attempts == 2
+
+        assert not await old.renew_lease(job.id, "worker-a", LEASE_SECONDS)
+        assert not await old.complete(job.id, "worker-a")
+        assert not await old.release(job.id, "worker-a", "boom", failed=True)
+        await session.commit()
+    assert await new.renew_lease(job.id, "worker-b", LEASE_SECONDS)
+    assert await new.complete(job.id, "worker-b")
+    await db.commit()
+
+
+async def test_released_job_is_claimed_again(run_id: uuid.UUID, db: AsyncSession):
+    repo = CalcJobRepository(db)
+    job = await repo.claim("worker-a", LEASE_SECONDS, run_id)
+    assert await repo.release(job.id, "worker-a", "boom", failed=False)
+    await db.commit()
+
+    again = await repo.claim("worker-b", LEASE_SECONDS, run_id)
+    assert again.id == job.id
+    assert again.status == CalcJobStatus.RUNNING
+    await db.commit()
+
+
+async def test_batch_checkpoint_resumes_its_run(db: AsyncSession):
+    # Matches no agreement, so the run is planned as already completed
+    data = CalcRunCreate(period_from=date(2026, 1, 1), period_to=date(2026, 1, 31), supplier_codes=[uuid.uuid4().hex])
+    service = CalculationService(CalculationEngine(db), CalculationRepository(db), CalcJobRepository(db))
+    runs = []
+    try:
+        run, resumed_from = await service.open_batch(data)
+        runs.append(run.id)
+        assert resumed_from == 0
+        assert run.status == CalcRunStatus.COMPLETED
+        assert await service.calculation_repo.get_checkpoint(run.run_key) is not None
+
+        # Started again before the checkpoint was cleared: the same run, and the checkpoint goes
+        resumed, _ = await service.open_batch(data)
+        assert resumed.id == run.id
+        assert await service.calculation_repo.get_checkpoint(run.run_key) is None
+
+        fresh, _ = await service.open_batch(data)
+        runs.append(fresh.id)
+        assert fresh.id != run.id
+    finally:
+        await db.rollback()
+        await db.execute(delete(CalcRun).where(CalcRun.id.in_(runs)))
+        await db.commit()
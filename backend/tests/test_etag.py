@@ -0,0 +1,26 @@
+from app.core.etag import etag_matches, make_etag
+
+
+def test_make_etag_is_weak_and_deterministic():
+    tag = make_etag("agreements", 3)
+    assert tag.startswith('W/"') and tag == make_etag("agreements", 3)
+    assert tag != make_etag("agreements", 4)
+
+
+def test_weak_comparison_ignores_prefix():
+    tag = make_etag("x")
+    assert etag_matches(tag, tag)
+    assert etag_matches(tag[2:], tag)
+
+
+def test_any_tag_of_a_list_matches():
+    tag = make_etag("x")
+    assert etag_matches(f'"other", {tag}', tag)
+
+
+def test_star_and_missing_header():
+    tag = make_etag("x")
+    assert etag_matches("*", tag)
+    assert not etag_matches(None, tag)
+    assert not etag_matches("", tag)
+    assert not etag_matches('W/"other"', tag)
@@ -0,0 +1,20 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.domain.exceptions import ValidationError
+
+
+def test_cursor_round_trip():
+    created_at, item_id = datetime(2026, 10, 17, 12, 30, 45, 123456), uuid.uuid4()
+    cursor = encode_cursor(created_at, item_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, item_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "Zm9vfGJhcg"])
+def test_invalid_cursor(cursor: str):
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor)
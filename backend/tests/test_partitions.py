@@ -0,0 +1,62 @@
+"""Monthly turnover partitions, against the migrated database. Each test runs in one transaction
+that is rolled back, DDL included.
+"""
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.partitions import detach_before
+from app.domain.enums import TurnoverKind
+from app.domain.exceptions import ValidationError
+from app.models.turnover import TurnoverMonthly
+from app.repositories.turnover_repo import TurnoverRepository, TurnoverRequest
+
+pytestmark = pytest.mark.anyio
+
+ARCHIVE_SCHEMA = "turnover_test_archive"
+
+
+async def test_missing_month_partitions_are_created_once(db: AsyncSession):
+    repo = TurnoverRepository(db)
+    assert await repo.ensure_partitions([date(2099, 1, 15), date(2099, 1, 31)]) == 2
+    names = {p.name for p in await repo.list_partitions() if p.month == date(2099, 1, 1)}
+    assert names == {"turnover_facts_2099_01", "turnover_daily_2099_01"}
+    assert await repo.ensure_partitions([date(2099, 1, 1)]) == 0
+
+
+async def test_detached_partition_leaves_the_list(db: AsyncSession):
+    repo = TurnoverRepository(db)
+    await repo.ensure_partitions([date(2099, 1, 1)])
+    daily = next(p for p in await repo.list_partitions() if p.name == "turnover_daily_2099_01")
+    await repo.detach_partition(daily, ARCHIVE_SCHEMA)
+    names = {p.name for p in await repo.list_partitions()}
+    assert "turnover_daily_2099_01" not in names
+    assert "turnover_facts_2099_01" in names
+
+
+async def test_dry_run_detaches_nothing(db: AsyncSession):
+    repo = TurnoverRepository(db)
+    await repo.ensure_partitions([date(2099, 1, 1)])
+    before = await repo.list_partitions()
+    listed = await detach_before(db, date(2099, 2, 1), dry_run=True)
+    assert {p.name for p in listed} >= {"turnover_facts_2099_01", "turnover_daily_2099_01"}
+    assert await repo.list_partitions() == before
+
+
+async def test_period_in_a_detached_month_with_totals_is_refused(db: AsyncSession):
+    repo = TurnoverRepository(db)
+    supplier_code = uuid.uuid4().hex[:20]
+    await db.execute(insert(TurnoverMonthly).values(
+        supplier_code=supplier_code, kind=TurnoverKind.SALES, month=date(1999, 1, 1), amount=Decimal("100")
+    ))
+    request = TurnoverRequest(uuid.uuid4(), supplier_code, TurnoverKind.SALES, date(1999, 1, 15), date(1999, 3, 31))
+    with pytest.raises(ValidationError):
+        await repo.sum_for_requests([request])
+
+    # Another kind had no turnover in that month, so nothing is missing
+    other = request._replace(kind=TurnoverKind.PURCHASES)
+    assert await repo.sum_for_requests([other]) == {other.agreement_id: Decimal("0")}
@@ -0,0 +1,38 @@
+import threading
+
+import pytest
+
+from app.core import security
+from app.core.config import settings
+from app.domain.exceptions import ServiceUnavailableError
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_hash_and_verify_round_trip():
+    hashed = await security.hash_password_async("s3cret")
+    assert await security.verify_password_async("s3cret", hashed)
+    assert not await security.verify_password_async("wrong", hashed)
+
+
+async def test_hashing_runs_off_the_event_loop():
+    loop_thread = threading.current_thread().name
+    worker_thread = await security._run_in_hash_pool("hash", lambda: threading.current_thread().name)
+    assert worker_thread != loop_thread
+    assert worker_thread.startswith("bcrypt")
+
+
+async def test_full_queue_fails_fast(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_QUEUE", 0)
+    with pytest.raises(ServiceUnavailableError) as error:
+        await security.verify_password_async("s3cret", "hash")
+    assert error.value.status_code == 503
+
+
+async def test_pending_count_is_released_after_errors():
+    def fail() -> None:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await security._run_in_hash_pool("verify", fail)
+    assert security._hash_pending == 0
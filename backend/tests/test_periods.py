@@ -0,0 +1,35 @@
+from datetime import date
+
+from app.calculation.periods import PeriodSplit, split_period
+
+
+def test_whole_months_only():
+    assert split_period(date(2026, 1, 1), date(2026, 3, 31)) == PeriodSplit(
+        head=None, months=(date(2026, 1, 1), date(2026, 3, 1)), tail=None
+    )
+
+
+def test_head_and_tail_around_whole_months():
+    assert split_period(date(2026, 1, 15), date(2026, 4, 10)) == PeriodSplit(
+        head=(date(2026, 1, 15), date(2026, 1, 31)),
+        months=(date(2026, 2, 1), date(2026, 3, 1)),
+        tail=(date(2026, 4, 1), date(2026, 4, 10)),
+    )
+
+
+def test_inside_one_month_is_all_head():
+    assert split_period(date(2026, 2, 3), date(2026, 2, 20)) == PeriodSplit(
+        head=(date(2026, 2, 3), date(2026, 2, 20)), months=None, tail=None
+    )
+
+
+def test_partial_months_on_both_sides_of_a_boundary():
+    assert split_period(date(2026, 1, 20), date(2026, 2, 10)) == PeriodSplit(
+        head=(date(2026, 1, 20), date(2026, 2, 10)), months=None, tail=None
+    )
+
+
+def test_leap_february_end():
+    split = split_period(date(2028, 2, 1), date(2028, 2, 29))
+    assert split.months == (date(2028, 2, 1), date(2028, 2, 1))
+    assert split.head is None and split.tail is None
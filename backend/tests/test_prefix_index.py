@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+from app.repositories.prefix_index import PrefixIndex, normalize
+
+ROWS = [
+    SimpleNamespace(code="K0000001", name='ООО "Альфа Трейд"'),
+    SimpleNamespace(code="K0000002", name='ООО "Ёлка-Маркет"'),
+    SimpleNamespace(code="K0000010", name="ИП Трейдов"),
+    SimpleNamespace(code="A0000003", name="Альфа-Снаб"),
+    SimpleNamespace(code="TRADE01", name="Омега"),
+    SimpleNamespace(code="B0000004", name="Trade House"),
+]
+
+
+def codes(rows) -> list[str]:
+    return [r.code for r in rows]
+
+
+def test_normalize():
+    assert normalize('ООО "Ёлка-2" _x') == "ооо елка 2 x"
+
+
+def test_code_prefix_is_case_insensitive():
+    assert codes(PrefixIndex(ROWS).search("k000000", 10)) == ["K0000001", "K0000002"]
+
+
+def test_code_matches_rank_before_name_matches():
+    assert codes(PrefixIndex(ROWS).search("trade", 10)) == ["TRADE01", "B0000004"]
+
+
+def test_leading_word_ranks_before_inner_word():
+    assert codes(PrefixIndex(ROWS).search("альфа", 10)) == ["A0000003", "K0000001"]
+
+
+def test_any_word_of_the_name_matches():
+    assert codes(PrefixIndex(ROWS).search("трейд", 10)) == ["K0000001", "K0000010"]
+
+
+def test_yo_and_punctuation_are_folded():
+    assert codes(PrefixIndex(ROWS).search("елка маркет", 10)) == ["K0000002"]
+
+
+def test_limit_and_empty_query():
+    index = PrefixIndex(ROWS)
+    assert len(index.search("K", 2)) == 2
+    assert index.search("  !! ", 10) == []
+    assert index.search("zzz", 10) == []
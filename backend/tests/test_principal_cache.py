@@ -0,0 +1,96 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from jose import jwt
+
+from app.api import deps
+from app.core.config import settings
+from app.core.principal_cache import PrincipalCache
+from app.core.security import create_access_token
+from app.services.auth_service import AuthService
+
+
+def far_expiry() -> int:
+    return int(time.time()) + 3600
+
+
+def test_hit_after_put():
+    cache = PrincipalCache(ttl_seconds=60, max_size=10)
+    expires = far_expiry()
+    assert cache.get("alice", expires) is None
+    cache.put("alice", expires, "principal", lookup_seconds=0.01)
+    assert cache.get("alice", expires) == "principal"
+    # Another token of the same user is another entry
+    assert cache.get("alice", expires + 1) is None
+
+
+def test_entry_expires_after_ttl(monkeypatch: pytest.MonkeyPatch):
+    cache = PrincipalCache(ttl_seconds=60, max_size=10)
+    expires = far_expiry()
+    cache.put("alice", expires, "principal", lookup_seconds=0.01)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+    assert cache.get("alice", expires) is None
+
+
+def test_expired_token_is_not_cached():
+    cache = PrincipalCache(ttl_seconds=60, max_size=10)
+    expires = int(time.time()) - 1
+    cache.put("alice", expires, "principal", lookup_seconds=0.01)
+    assert cache.get("alice", expires) is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PrincipalCache(ttl_seconds=60, max_size=2)
+    expires = far_expiry()
+    cache.put("alice", expires, "a", lookup_seconds=0.01)
+    cache.put("bob", expires, "b", lookup_seconds=0.01)
+    cache.get("alice", expires)
+    cache.put("carol", expires, "c", lookup_seconds=0.01)
+    assert cache.get("bob", expires) is None
+    assert cache.get("alice", expires) == "a"
+    assert cache.get("carol", expires) == "c"
+
+
+def test_invalidate_drops_every_token_of_the_subject():
+    cache = PrincipalCache(ttl_seconds=60, max_size=10)
+    expires = far_expiry()
+    cache.put("alice", expires, "a1", lookup_seconds=0.01)
+    cache.put("alice", expires + 1, "a2", lookup_seconds=0.01)
+    cache.put("bob", expires, "b", lookup_seconds=0.01)
+    cache.invalidate("alice")
+    assert cache.get("alice", expires) is None
+    assert cache.get("alice", expires + 1) is None
+    assert cache.get("bob", expires) == "b"
+
+
+@pytest.mark.anyio
+async def test_cached_principal_skips_the_users_query(monkeypatch: pytest.MonkeyPatch):
+    cache = PrincipalCache(ttl_seconds=60, max_size=10)
+    monkeypatch.setattr(deps, "principal_cache", cache)
+    token = create_access_token({"sub": "alice"})
+    expires = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])["exp"]
+    principal = SimpleNamespace(username="alice")
+    cache.put("alice", expires, principal, lookup_seconds=0.01)
+    # No session: a cache miss would fail on the lookup
+    assert await deps.get_current_user(token=token, db=None) is principal
+
+
+@pytest.mark.anyio
+async def test_deactivation_invalidates_the_principal(monkeypatch: pytest.MonkeyPatch):
+    cache = PrincipalCache(ttl_seconds=60, max_size=10)
+    monkeypatch.setattr("app.services.auth_service.principal_cache", cache)
+    expires = far_expiry()
+    cache.put("bob", expires, "principal", lookup_seconds=0.01)
+
+    async def commit() -> None:
+        pass
+
+    async def set_active(username: str, is_active: bool):
+        return SimpleNamespace(username=username, is_active=is_active)
+
+    user_repo = SimpleNamespace(db=SimpleNamespace(commit=commit), set_active=set_active)
+    admin = SimpleNamespace(is_admin=True)
+    await AuthService(user_repo).set_user_active(admin, "bob", False)
+    assert cache.get("bob", expires) is None
@@ -0,0 +1,58 @@
+"""Statement budgets of hot endpoints, against a migrated database (`DATABASE_URL`).
+
+Skipped when the database is unreachable. Caches are warmed by a first request, so the
+budgets hold within the cache TTLs; raise one only together with the change that needs it.
+"""
+import pytest
+
+from app.core.query_stats import assert_max_queries
+from benchmarks.client import AsgiClient
+from tests.conftest import AGREEMENT
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_update_is_one_statement(client: AsgiClient, agreement: dict):
+    path = f"/api/agreements/{agreement['id']}"
+    with assert_max_queries(1):
+        response = await client.put(path, json_body={**AGREEMENT, "version": agreement["version"]})
+    assert response.status == 200, response.body
+    assert response.json()["version"] == agreement["version"] + 1
+
+
+async def test_stale_update_is_rejected(client: AsgiClient, agreement: dict):
+    path = f"/api/agreements/{agreement['id']}"
+    await client.put(path, json_body={**AGREEMENT, "version": agreement["version"]})
+    with assert_max_queries(2):
+        response = await client.put(path, json_body={**AGREEMENT, "version": agreement["version"]})
+    assert response.status == 409
+
+
+async def test_status_update_is_one_statement(client: AsgiClient, agreement: dict):
+    path = f"/api/agreements/{agreement['id']}/status"
+    body = {"status": "CALCULATED", "version": agreement["version"]}
+    with assert_max_queries(1):
+        response = await client.request("PATCH", path, json_body=body)
+    assert response.status == 200, response.body
+
+
+async def test_list_page(client: AsgiClient, agreement: dict):
+    await client.get("/api/agreements")
+    # Table versions for the ETag, then the page itself
+    with assert_max_queries(2):
+        response = await client.get("/api/agreements", params={"limit": 20})
+    assert response.status == 200, response.body
+
+
+async def test_list_page_not_modified(client: AsgiClient, agreement: dict):
+    first = await client.get("/api/agreements")
+    with assert_max_queries(1):
+        response = await client.get("/api/agreements", headers={"If-None-Match": first.headers["etag"]})
+    assert response.status == 304
+
+
+async def test_supplier_typeahead_skips_the_database(client: AsgiClient):
+    await client.get("/api/ref/suppliers/search", params={"q": "альфа"})
+    with assert_max_queries(0):
+        response = await client.get("/api/ref/suppliers/search", params={"q": "альфа"})
+    assert response.status == 200, response.body
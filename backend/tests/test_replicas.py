@@ -0,0 +1,114 @@
+from contextlib import asynccontextmanager
+
+import pytest
+from starlette.requests import Request
+
+from app.api import deps
+from app.db.replicas import Replica, ReplicaRouter
+
+
+def session_factory(name: str):
+    @asynccontextmanager
+    async def factory():
+        yield name
+
+    return factory
+
+
+def router(replicas: int, pin_seconds: float = 5.0) -> ReplicaRouter:
+    result = ReplicaRouter(urls=[], eject_seconds=30.0, pin_seconds=pin_seconds)
+    result.replicas = [
+        Replica(name=f"replica-{i}", engine=None, sessionmaker=session_factory(f"replica-{i}"))
+        for i in range(replicas)
+    ]
+    return result
+
+
+def request(method: str, token: str = "Bearer alice") -> Request:
+    return Request({
+        "type": "http",
+        "method": method,
+        "path": "/",
+        "headers": [(b"authorization", token.encode())],
+        "client": ("127.0.0.1", 50000),
+    })
+
+
+async def session_for(req: Request) -> str:
+    generator = deps.get_db(req)
+    session = await anext(generator)
+    with pytest.raises(StopAsyncIteration):
+        await anext(generator)
+    return session
+
+
+def test_replicas_are_used_round_robin():
+    r = router(2)
+    assert [r.pick("alice").name for _ in range(4)] == ["replica-0", "replica-1", "replica-0", "replica-1"]
+
+
+def test_ejected_replica_is_skipped_until_its_time_is_up():
+    r = router(2)
+    r.eject(r.replicas[0], OSError("connection refused"))
+    assert {r.pick("alice").name for _ in range(4)} == {"replica-1"}
+    r.replicas[0].ejected_until = 0.0
+    assert {r.pick("alice").name for _ in range(4)} == {"replica-0", "replica-1"}
+
+
+def test_all_replicas_ejected_falls_back_to_primary():
+    r = router(1)
+    r.eject(r.replicas[0], OSError("connection refused"))
+    assert r.pick("alice") is None
+
+
+def test_pinned_client_reads_from_primary():
+    r = router(1)
+    r.pin("alice")
+    assert r.pick("alice") is None
+    assert r.pick("bob") is not None
+
+
+def test_pin_expires():
+    r = router(1, pin_seconds=0.0)
+    r.pin("alice")
+    assert r.pick("alice") is not None
+
+
+@pytest.fixture
+def routed(monkeypatch: pytest.MonkeyPatch) -> ReplicaRouter:
+    r = router(1)
+    monkeypatch.setattr(deps, "replica_router", r)
+    monkeypatch.setattr(deps, "AsyncSessionLocal", session_factory("primary"))
+    return r
+
+
+@pytest.mark.anyio
+async def test_get_db_routes_reads_to_replicas_and_writes_to_primary(routed: ReplicaRouter):
+    assert await session_for(request("GET")) == "replica-0"
+    assert await session_for(request("POST")) == "primary"
+
+
+@pytest.mark.anyio
+async def test_get_db_pins_the_writer_to_primary(routed: ReplicaRouter):
+    await session_for(request("PUT"))
+    assert await session_for(request("GET")) == "primary"
+    assert await session_for(request("GET", token="Bearer bob")) == "replica-0"
+
+
+@pytest.mark.anyio
+async def test_get_db_ejects_an_unreachable_replica(routed: ReplicaRouter):
+    generator = deps.get_db(request("GET"))
+    assert await anext(generator) == "replica-0"
+    with pytest.raises(OSError):
+        await generator.athrow(OSError("connection reset"))
+    assert routed.replicas[0].ejected_until > 0
+    assert await session_for(request("GET")) == "primary"
+
+
+@pytest.mark.anyio
+async def test_get_db_keeps_a_replica_after_a_failing_statement(routed: ReplicaRouter):
+    generator = deps.get_db(request("GET"))
+    await anext(generator)
+    with pytest.raises(ValueError):
+        await generator.athrow(ValueError("bad query"))
+    assert routed.replicas[0].ejected_until == 0.0
@@ -0,0 +1,32 @@
+from decimal import Decimal
+
+from app.calculation.tiers import compile_tiers
+from app.domain.enums import TierMode
+
+BRACKETS = [(Decimal("1000"), Decimal("2")), (Decimal("0"), Decimal("1")), (Decimal("5000"), Decimal("3"))]
+
+
+def test_brackets_are_sorted_and_marginal_base_accumulated():
+    tiers = compile_tiers(TierMode.MARGINAL, BRACKETS, version=7)
+    assert tiers.thresholds == (Decimal("0"), Decimal("1000"), Decimal("5000"))
+    assert tiers.rates == (Decimal("1"), Decimal("2"), Decimal("3"))
+    assert tiers.base == (Decimal("0"), Decimal("10"), Decimal("90"))
+    assert tiers.version == 7
+
+
+def test_marginal_evaluation():
+    tiers = compile_tiers(TierMode.MARGINAL, BRACKETS, version=1)
+    assert tiers.evaluate(Decimal("500")) == Decimal("5")
+    assert tiers.evaluate(Decimal("1000")) == Decimal("10")
+    assert tiers.evaluate(Decimal("6000")) == Decimal("120")
+
+
+def test_whole_evaluation_uses_highest_bracket_reached():
+    tiers = compile_tiers(TierMode.WHOLE, BRACKETS, version=1)
+    assert tiers.evaluate(Decimal("999")) == Decimal("9.99")
+    assert tiers.evaluate(Decimal("6000")) == Decimal("180")
+
+
+def test_below_first_threshold_earns_nothing():
+    tiers = compile_tiers(TierMode.WHOLE, [(Decimal("100"), Decimal("5"))], version=1)
+    assert tiers.evaluate(Decimal("99.99")) == Decimal("0")
@@ -1,4 +1,4 @@
-import { Agreement, AgreementCreate, AgreementStatus, RefSupplier, RefAgreementType, RefScale } from "../types/agreement";
+import { Agreement, AgreementCreate, AgreementPage, AgreementStatus, RefSupplier, RefAgreementType, RefScale } from "../types/agreement";
 import { LoginRequest, Token, User } from "../types/auth";
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || "http://localhost:8000/api";
@@ -72,8 +72,9 @@ export const createAgreement = async (data: AgreementCreate): Promise<Agreement>
   return response.json();
 };
 
-export const getAgreements = async (): Promise<Agreement[]> => {
-  const response = await fetch(`${API_BASE_URL}/agreements`, {
+export const getAgreements = async (cursor?: string): Promise<AgreementPage> => {
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+  const response = await fetch(`${API_BASE_URL}/agreements${query}`, {
     headers: getAuthHeaders(),
   });
 
@@ -81,7 +82,10 @@ export const getAgreements = async (): Promise<Agreement[]> => {
     throw new Error("Failed to fetch agreements");
   }
 
-  return response.json();
+  return {
+    items: await response.json(),
+    nextCursor: response.headers.get("X-Next-Cursor"),
+  };
 };
 
 export const getAgreement = async (id: string): Promise<Agreement> => {
@@ -97,11 +101,15 @@ export const getAgreement = async (id: string): Promise<Agreement> => {
   return response.json();
 };
 
-export const updateAgreement = async (id: string, data: AgreementCreate): Promise<Agreement> => {
+export const updateAgreement = async (
+  id: string,
+  data: AgreementCreate,
+  version: number
+): Promise<Agreement> => {
   const response = await fetch(`${API_BASE_URL}/agreements/${id}`, {
     method: "PUT",
     headers: getAuthHeaders(),
-    body: JSON.stringify(data),
+    body: JSON.stringify({ ...data, version }),
   });
 
   if (!response.ok) {
@@ -114,12 +122,13 @@ export const updateAgreement = async (id: string, data: AgreementCreate): Promis
 
 export const updateAgreementStatus = async (
   id: string,
-  status: AgreementStatus
+  status: AgreementStatus,
+  version: number
 ): Promise<Agreement> => {
   const response = await fetch(`${API_BASE_URL}/agreements/${id}/status`, {
     method: "PATCH",
     headers: getAuthHeaders(),
-    body: JSON.stringify({ status }),
+    body: JSON.stringify({ status, version }),
   });
 
   if (!response.ok) {
@@ -134,7 +134,7 @@ export const AgreementDetail: React.FC = () => {
   };
 
   const handleSave = async () => {
-    if (!id) return;
+    if (!id || !agreement) return;
     const { validFrom, validTo, supplierCode, agreementTypeCode, scaleCode, conditionValue } = editForm;
 
     if (!validFrom || !validTo || !supplierCode || !agreementTypeCode || !scaleCode || !conditionValue) {
@@ -169,7 +169,7 @@ export const AgreementDetail: React.FC = () => {
         agreement_type_code: agreementTypeCode,
         scale_code: scaleCode,
         condition_value: value,
-      });
+      }, agreement.version);
       setAgreement(updated);
       setIsEditing(false);
     } catch (err) {
@@ -180,10 +180,10 @@ export const AgreementDetail: React.FC = () => {
   };
 
   const handleDelete = async () => {
-    if (!id) return;
+    if (!id || !agreement) return;
     setDeleting(true);
     try {
-      const updated = await updateAgreementStatus(id, AgreementStatus.DELETED);
+      const updated = await updateAgreementStatus(id, AgreementStatus.DELETED, agreement.version);
       setAgreement(updated);
       setDeleteDialogOpen(false);
     } catch (err) {
@@ -194,9 +194,9 @@ export const AgreementDetail: React.FC = () => {
   };
 
   const handleRestore = async () => {
-    if (!id) return;
+    if (!id || !agreement) return;
     try {
-      const updated = await updateAgreementStatus(id, AgreementStatus.READY_FOR_CALCULATION);
+      const updated = await updateAgreementStatus(id, AgreementStatus.READY_FOR_CALCULATION, agreement.version);
       setAgreement(updated);
     } catch (err) {
       setError(err instanceof Error ? err.message : "Не удалось восстановить соглашение");
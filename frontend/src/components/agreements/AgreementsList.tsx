@@ -13,6 +13,7 @@ import {
   Typography,
   Fab,
   Tooltip,
+  Button,
 } from "@mui/material";
 import AddIcon from "@mui/icons-material/Add";
 import CheckCircleOutlineIcon from "@mui/icons-material/CheckCircleOutline";
@@ -52,12 +53,15 @@ export const AgreementsList: React.FC = () => {
   const [agreements, setAgreements] = useState<Agreement[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     const fetchAgreements = async () => {
       try {
-        const data = await getAgreements();
-        setAgreements(data);
+        const page = await getAgreements();
+        setAgreements(page.items);
+        setNextCursor(page.nextCursor);
       } catch (err) {
         setError(err instanceof Error ? err.message : "Failed to fetch agreements");
       } finally {
@@ -68,6 +72,20 @@ export const AgreementsList: React.FC = () => {
     fetchAgreements();
   }, []);
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await getAgreements(nextCursor);
+      setAgreements((prev) => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : "Failed to fetch agreements");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   if (loading) {
     return <LoadingSpinner />;
   }
@@ -168,6 +186,14 @@ export const AgreementsList: React.FC = () => {
           </Table>
         </TableContainer>
 
+        {nextCursor && (
+          <Box sx={{ display: "flex", justifyContent: "center", mt: 3 }}>
+            <Button variant="outlined" onClick={loadMore} disabled={loadingMore}>
+              {loadingMore ? "Загрузка..." : "Показать ещё"}
+            </Button>
+          </Box>
+        )}
+
         <Tooltip title="Создать новое соглашение" placement="left">
           <Fab
             color="primary"
@@ -43,6 +43,13 @@ export interface Agreement {
   scale_grid: "PERCENT" | "FIX";
   condition_value: number;
   status: AgreementStatus;
+  version: number;
   created_at: string;
   updated_at: string;
 }
+
+export interface AgreementPage {
+  items: Agreement[];
+  // Cursor of the next page; null on the last one
+  nextCursor: string | null;
+}